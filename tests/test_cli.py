@@ -0,0 +1,83 @@
+"""Checks that the command line's engine options reach the GameManager."""
+
+import asyncio
+
+import pytest
+
+from textual_games import parse_engine_options, parse_options
+from textual_games.enums import Replacement
+
+
+def test_no_options_keeps_the_defaults():
+    assert parse_engine_options([]) == {}
+
+
+def test_engine_options():
+    options = parse_engine_options([
+        "--show-stats", "--stats-file", "stats.jsonl", "--ponder", "--think-delay", "0",
+        "--parallel-workers", "2", "--tt-replacement", "lru", "--no-move-ordering",
+    ])
+    assert options == {
+        "show_stats": True,
+        "stats_file": "stats.jsonl",
+        "ponder": True,
+        "think_delay": 0.0,
+        "parallel_workers": 2,
+        "tt_replacement": Replacement.LRU,
+        "move_ordering": False,
+    }
+
+
+def test_negative_think_delay_is_rejected():
+    with pytest.raises(SystemExit):
+        parse_engine_options(["--think-delay", "-1"])
+
+
+def test_app_passes_options_to_the_game_manager():
+    from textual_games.menu import TextualGames, GameEntry
+
+    async def run():
+        app = TextualGames(engine_options=parse_engine_options(["--show-stats", "--ponder", "--think-delay", "0"]))
+        async with app.run_test() as pilot:
+            for _ in range(1000):           # let the games menu finish loading before the app exits
+                if app.query(GameEntry):
+                    break
+                await pilot.pause(0.01)
+            return app.game_manager.show_stats, app.game_manager.ponder, app.game_manager.think_delay
+
+    assert asyncio.run(run()) == (True, True, 0.0)
+
+
+def test_display_options_are_kept_apart():
+    assert parse_options(["--line-grid", "--ponder"]) == ({"ponder": True}, {"line_grid": True})
+    assert parse_options([]) == ({}, {})
+    assert parse_engine_options(["--line-grid"]) == {}
+
+
+@pytest.mark.parametrize("line_grid", [False, True], ids=["grid", "line-grid"])
+@pytest.mark.parametrize("game_name", ["Tic-Tac-Toe", "Connect Four"])
+def test_line_grid_option_reaches_the_game(game_name, line_grid):
+    from textual_games.menu import TextualGames, GameEntry
+    from textual_games.grid import Grid, LineGrid
+
+    async def run():
+        _, display_options = parse_options(["--line-grid"] if line_grid else [])
+        app = TextualGames(engine_options={"think_delay": 0}, **display_options)
+        async with app.run_test() as pilot:
+            for _ in range(1000):
+                if app.query(GameEntry):
+                    break
+                await pilot.pause(0.01)
+            entry = next(entry for entry in app.query(GameEntry) if entry.game_name == game_name)
+            app.post_message(GameEntry.GameSelected(entry.game_info))
+            for _ in range(1000):           # the game starts when it is mounted
+                if app.game_manager.game_running:
+                    break
+                await pilot.pause(0.01)
+            await pilot.pause()
+            grid = app.current_game.grid
+            return type(grid), app.query_one(Grid) is grid
+
+    grid_class, mounted = asyncio.run(run())
+    assert grid_class is (LineGrid if line_grid else Grid)
+    assert mounted
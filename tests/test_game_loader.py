@@ -0,0 +1,97 @@
+"""Imports game scripts with the GameLoader: package games and user game directories."""
+
+import asyncio
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+
+from textual.app import App
+
+import textual_games.games as games
+from textual_games.discovery import GameInfo
+from textual_games.menu import GameLoader
+from textual_games.games.tictactoe import TicTacToe
+
+PACKAGE_DIRECTORY = games.__path__[0]
+
+
+def user_directory(path, name: str):
+    "A user game directory holding a copy of the Tic-Tac-Toe script."
+    directory = path / name
+    directory.mkdir()
+    shutil.copy(os.path.join(PACKAGE_DIRECTORY, "tictactoe.py"), directory / "tictactoe.py")
+    return str(directory)
+
+
+def load(loader: GameLoader, directory: str, scriptname: str):
+    path = os.path.abspath(os.path.join(directory, f"{scriptname}.py"))
+    info = GameInfo("Tic Tac Toe", "TicTacToe", loader.module_name(directory, scriptname), path)
+    return loader.load_game(info)
+
+
+def test_package_games_keep_their_names():
+    assert GameLoader.module_name(PACKAGE_DIRECTORY, "tictactoe") == "textual_games.games.tictactoe"
+
+
+def test_user_directories_get_their_own_namespace(tmp_path):
+    first = user_directory(tmp_path, "first")
+    second = user_directory(tmp_path, "second")
+
+    names = {GameLoader.module_name(first, "tictactoe"), GameLoader.module_name(second, "tictactoe")}
+    assert len(names) == 2
+    assert all(name.startswith("textual_games.user_games.") for name in names)
+    assert GameLoader.module_name(first, "tictactoe") == GameLoader.module_name(first + os.sep, "tictactoe")
+
+
+def test_user_game_does_not_replace_the_package_game(tmp_path):
+    package_module = sys.modules["textual_games.games.tictactoe"]
+    loader = GameLoader(PACKAGE_DIRECTORY, user_directory(tmp_path, "user"))
+
+    package_class = load(loader, PACKAGE_DIRECTORY, "tictactoe")
+    user_class = load(loader, loader.game_directories[1], "tictactoe")
+
+    assert package_class is TicTacToe                   # imported already, so not run again
+    assert sys.modules["textual_games.games.tictactoe"] is package_module
+    assert user_class is not TicTacToe
+    assert sys.modules[user_class.__module__].__file__ == os.path.join(loader.game_directories[1], "tictactoe.py")
+
+
+def test_module_name_taken_by_another_file_is_not_replaced(tmp_path):
+    directory = user_directory(tmp_path, "user")
+    loader = GameLoader(directory)
+    path = os.path.join(directory, "tictactoe.py")
+
+    info = GameInfo("Tic Tac Toe", "TicTacToe", "textual_games.games.tictactoe", path)
+
+    async def run():
+        async with App().run_test():        # the loader logs the error to the app
+            return loader.load_game(info)
+
+    assert asyncio.run(run()) is None
+    assert sys.modules["textual_games.games.tictactoe"].TicTacToe is TicTacToe
+
+
+def test_user_game_rules_unpickle_in_a_fresh_process(tmp_path):
+    directory = user_directory(tmp_path, "user")
+    game_class = load(GameLoader(directory), directory, "tictactoe")
+    rules = game_class.rules_class(3, 3)
+    module = sys.modules[type(rules).__module__]
+
+    (tmp_path / "rules.pickle").write_bytes(pickle.dumps(rules))
+    script = (                          # what a parallel search worker does with a new game
+        "import pickle, sys\n"
+        "from textual_games.parallel import _load_module\n"
+        "_load_module(sys.argv[1], sys.argv[2])\n"
+        "rules = pickle.loads(open(sys.argv[3], 'rb').read())\n"
+        "print(type(rules).__module__, rules.rows, rules.columns)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script, module.__name__, module.__file__, str(tmp_path / "rules.pickle")],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": os.getcwd()},
+    )
+    assert result.stdout.split() == [module.__name__, "3", "3"]
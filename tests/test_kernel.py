@@ -0,0 +1,67 @@
+"""Checks the NumPy line kernel against the pure Python Connect Four evaluator."""
+
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from textual_games.games.connectfour import ConnectFourRules
+from textual_games.rules import GameRules
+
+
+def random_positions(rules: ConnectFourRules, count: int, seed: int):
+    "Yields boards from random games, stopping each game at a random move or a win."
+
+    rng = random.Random(seed)
+    for _ in range(count):
+        board = rules.new_board()
+        player = 1
+        for _ in range(rng.randrange(rules.rows * rules.columns)):
+            moves = rules.get_possible_moves(board)
+            if not moves:
+                break
+            move = rng.choice(moves)
+            rules.apply_move(board, move, player)
+            if rules.check_move(board, *move, player):
+                break
+            player = 3 - player
+        yield board
+
+
+@pytest.mark.parametrize("rows, columns", [(6, 7), (5, 6), (7, 9)])
+def test_connectfour_evaluate_moves_matches_evaluate(rows, columns):
+    rules = ConnectFourRules(rows, columns)
+    assert rules.kernel is not None
+
+    for board in random_positions(rules, 200, seed=rows * columns):
+        moves = rules.get_possible_moves(board)
+        for player in (1, 2):
+            expected = GameRules.evaluate_moves(rules, board, moves, player)    # evaluate() after each move
+            assert rules.evaluate_moves(board, moves, player) == expected
+
+
+def test_kernel_threats_match_bitboard():
+    rules = ConnectFourRules(6, 7)
+    kernel = rules.kernel
+
+    for board in random_positions(rules, 200, seed=1):
+        for player in (1, 2):
+            threats = kernel.threats(board, player)[0].reshape(rules.rows, rules.columns)
+            expected = [[False] * rules.columns for _ in range(rules.rows)]
+            cells = board.to_list()
+            for row in range(rules.rows):
+                for col in range(rules.columns):
+                    if cells[row][col] == 0:
+                        cells[row][col] = player
+                        expected[row][col] = GameRules.streak_through(cells, row, col, player, rules.streak)
+                        cells[row][col] = 0
+            assert threats.tolist() == expected
+
+
+def test_kernel_winner_matches_bitboard():
+    rules = ConnectFourRules(6, 7)
+    kernel = rules.kernel
+
+    for board in random_positions(rules, 200, seed=2):
+        assert kernel.winner(board) == rules.calculate_winner(board)
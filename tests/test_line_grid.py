@@ -0,0 +1,99 @@
+"""Mounts a LineGrid in an app and drives it like a game would."""
+
+import asyncio
+
+from textual.app import App
+
+from textual_games.grid import Grid, LineGrid, LineCell
+from textual_games.enums import PlayerState
+
+
+class GridApp(App):
+
+    def __init__(self):
+        super().__init__()
+        self.chosen: list[tuple[int, int]] = []
+
+    def compose(self):
+        self.grid = LineGrid(
+            rows=3,
+            columns=3,
+            grid_width=0,
+            grid_height=0,
+            cell_size=3,
+            grid_gutter=1,
+            player1_token="X",
+            player2_token="O",
+            player1_color="red",
+            player2_color="yellow",
+        )
+        yield self.grid
+
+    def on_grid_cell_chosen(self, event: Grid.CellChosen):
+        self.chosen.append((event.row, event.column))
+
+
+def run(test):
+    "Runs `test(app, pilot)` in a headless GridApp."
+
+    async def main():
+        app = GridApp()
+        async with app.run_test(size=(40, 15)) as pilot:
+            app.grid.restart_grid()
+            await pilot.pause()
+            await test(app, pilot)
+
+    asyncio.run(main())
+
+
+def test_mounts_as_one_widget():
+
+    async def test(app, pilot):
+        grid = app.grid
+        assert app.query_one(Grid) is grid
+        assert len(grid.children) == 0
+        assert (grid.size.width, grid.size.height) == (3 * 7 + 2, 3 * 3 + 2)
+        assert grid.focused_coordinates() == (0, 0)
+
+    run(test)
+
+
+def test_sync_and_cell():
+
+    async def test(app, pilot):
+        grid = app.grid
+        assert grid.sync([[1, 0, 0], [0, 2, 0], [0, 0, 0]]) == 2
+        assert grid.sync([[1, 0, 0], [0, 2, 0], [0, 0, 0]]) == 0
+
+        cell = grid.cell(1, 1)
+        assert isinstance(cell, LineCell)
+        assert (cell.row, cell.column, cell.state) == (1, 1, PlayerState.PLAYER2)
+
+        grid.cell(2, 0).state = PlayerState.PLAYER1
+        assert grid.state(2, 0) == PlayerState.PLAYER1
+        await pilot.pause()
+        assert "X" in grid.render_line(2 * grid.pitch_y + 1).text
+
+        assert grid.sync(None) == 3
+        assert grid.cell(0, 0).state == PlayerState.EMPTY
+
+    run(test)
+
+
+def test_keyboard_and_mouse_choose_cells():
+
+    async def test(app, pilot):
+        grid = app.grid
+        await pilot.press("right", "down", "enter")
+        await pilot.pause()
+        assert app.chosen == [(1, 1)]
+
+        await pilot.click(grid, offset=(2 * grid.pitch_x + 1, 2 * grid.pitch_y + 1))
+        await pilot.pause()
+        assert app.chosen == [(1, 1), (2, 2)]
+
+        await pilot.click(grid, offset=(grid.cell_width, 0))     # the gutter between two cells
+        await pilot.pause()
+        assert app.chosen == [(1, 1), (2, 2)]
+
+    run(test)
@@ -0,0 +1,52 @@
+"""Opening the Tic-Tac-Toe table: off the UI thread, and without a usable cache."""
+
+import asyncio
+
+from textual.app import App
+
+from textual_games.games.tictactoe import TicTacToeRules, TicTacToeTable
+from textual_games.manager import GameManager
+
+
+def test_unusable_cache_directory_means_no_table(tmp_path, monkeypatch):
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    monkeypatch.setenv("TEXTUAL_GAMES_CACHE", str(blocker / "cache"))
+
+    assert TicTacToeRules(3, 3).load_opening_book() is None
+
+
+def test_table_is_built_once_then_read_from_the_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEXTUAL_GAMES_CACHE", str(tmp_path))
+    rules = TicTacToeRules(3, 3)
+
+    built = rules.load_opening_book()
+    assert (tmp_path / rules.opening_book).exists()
+    read = TicTacToeTable.read(tmp_path / rules.opening_book)
+    assert read.table == built.table
+    assert read.lookup([[1, 1, 0], [2, 2, 0], [0, 0, 0]]) == (0, 2)     # X wins at once
+
+
+def test_manager_opens_the_table_in_a_thread(tmp_path, monkeypatch):
+    monkeypatch.setenv("TEXTUAL_GAMES_CACHE", str(tmp_path))      # cold cache
+
+    class ManagerApp(App):
+        def compose(self):
+            self.manager = GameManager()
+            yield self.manager
+
+    async def run():
+        app = ManagerApp()
+        async with app.run_test() as pilot:
+            manager = app.manager
+            manager.rules = TicTacToeRules(3, 3)
+            manager.game_running = True
+            assert manager.get_opening_book() is None           # returns before the table is built
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            return manager.opening_book, manager.get_opening_book(), manager.loading_books
+
+    book, again, loading = asyncio.run(run())
+    assert isinstance(book, TicTacToeTable)
+    assert again is book
+    assert loading == set()
@@ -0,0 +1,84 @@
+"""Runs the root-parallel search on a small pool and compares it with the serial search.
+
+The pool uses spawn, so its worker processes import this module again. Everything
+that starts processes is inside the tests (pytest's entry point is the __main__ guard)."""
+
+import pytest
+
+from textual_games.benchmarks.search import POSITIONS, setup_position
+from textual_games.enums import Replacement, SearchAlgorithm
+from textual_games.move_ordering import MoveOrderer
+from textual_games.parallel import ParallelSearch
+from textual_games.search import SearchEngine
+from textual_games.transposition import TranspositionTable
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = ParallelSearch(workers=2)
+    yield pool
+    pool.shutdown()
+
+
+def snapshot(board) -> list[list[int]]:
+    "A 2D integer copy of a board (Connect Four's BitBoard or Tic-Tac-Toe's list)."
+    return board.to_list() if hasattr(board, "to_list") else [list(row) for row in board]
+
+
+def serial_engine(rules, zobrist, algorithm) -> SearchEngine:
+    return SearchEngine(rules, zobrist, TranspositionTable(16), MoveOrderer(rules.move_priority), algorithm)
+
+
+CASES = [
+    ("ttt-corner", None),
+    ("ttt-must-block", None),
+    ("c4-opening", 5),
+    ("c4-early", 6),
+    ("c4-midgame", 6),
+]
+
+
+@pytest.mark.parametrize("algorithm", list(SearchAlgorithm), ids=lambda algorithm: algorithm.name.lower())
+@pytest.mark.parametrize("name, depth", CASES, ids=[name for name, _ in CASES])
+def test_parallel_matches_serial(pool, name, depth, algorithm):
+    position = next(p for p in POSITIONS if p["name"] == name)
+    depth = depth or position["depth"]
+
+    rules, board, zobrist, key, move_count = setup_position(position)
+    serial = serial_engine(rules, zobrist, algorithm)
+    root_moves = serial.order_root_moves(board, key)         # as GameManager passes them
+    serial_move = serial.search(board, key, move_count, depth)
+    serial_score = serial.iterations[-1][1]
+
+    pool.new_game(rules, zobrist, 16, Replacement.DEPTH, True, algorithm)
+    before = snapshot(board)
+    move = pool.search(board, key, move_count, depth, root_moves)
+
+    assert (move, pool.iterations[-1][1]) == (serial_move, serial_score)
+    assert pool.iterations[-1][0] == serial.iterations[-1][0]
+    assert snapshot(board) == before
+    assert sum(pool.stats.worker_nodes.values()) == pool.stats.nodes
+
+
+def test_pool_shuts_down_cleanly():
+    pool = ParallelSearch(workers=2)
+    processes = list(pool.executor._processes.values())
+    assert len(processes) == 2
+
+    pool.shutdown()
+    for process in processes:
+        process.join(timeout=10)
+        assert not process.is_alive()
+    with pytest.raises(RuntimeError):
+        pool.executor.submit(print)
+
+
+def test_upper_bounds_are_not_taken_for_exact_scores():
+    inf = float("inf")
+    results = [                         # move, score, alpha it was searched with, ...
+        ((0, 0), -5, -inf),
+        ((0, 1), 10, 10),               # searched after (0, 2) raised alpha: at most 10
+        ((0, 2), 10, -5),               # exact
+        ((0, 3), 3, 10),                # at most 3
+    ]
+    assert ParallelSearch.best_result(results) == ((0, 2), 10)
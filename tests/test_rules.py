@@ -0,0 +1,42 @@
+"""Checks the last-move game-over test against a scan of the whole board."""
+
+import random
+
+import pytest
+
+from textual_games.enums import PlayerState
+from textual_games.games.connectfour import ConnectFourRules
+from textual_games.games.tictactoe import TicTacToeRules
+from textual_games.rules import GameRules
+
+
+def random_games(rules: GameRules, games: int, seed: int):
+    "Yields (board, row, col, player, move_count) after every move of random games."
+
+    rng = random.Random(seed)
+    for _ in range(games):
+        board = rules.new_board()
+        for move_count in range(1, rules.rows * rules.columns + 1):
+            player = 1 if move_count % 2 == 1 else 2
+            row, col = rng.choice(rules.get_possible_moves(board))
+            rules.apply_move(board, (row, col), player)
+            yield board, row, col, player, move_count
+            if rules.calculate_winner(board) is not None:
+                break
+
+
+@pytest.mark.parametrize("rules", [TicTacToeRules(3, 3), ConnectFourRules(6, 7)], ids=["tictactoe", "connectfour"])
+def test_last_move_check_matches_a_board_scan(rules):
+    results = set()
+    for board, row, col, player, move_count in random_games(rules, 300, seed=11):
+        result = rules.check_result(board, row, col, player, move_count)
+        assert result == rules.calculate_winner(board)
+        results.add(result)
+
+    assert {None, PlayerState.PLAYER1, PlayerState.PLAYER2} <= results     # random Connect Four games rarely draw
+
+
+def test_streak_through_matches_the_bitboard():
+    rules = ConnectFourRules(6, 7)
+    for board, row, col, player, _ in random_games(rules, 100, seed=12):
+        assert GameRules.streak_through(board.to_list(), row, col, player, 4) == board.is_win(player)
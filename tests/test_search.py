@@ -0,0 +1,102 @@
+"""Unit tests of the AI search engine."""
+
+from time import monotonic
+
+import pytest
+
+from textual_games.benchmarks.search import POSITIONS, setup_position
+from textual_games.enums import SearchAlgorithm
+from textual_games.move_ordering import MoveOrderer
+from textual_games.search import SearchEngine
+from textual_games.transposition import TranspositionTable
+
+
+def position(name: str) -> dict:
+    return next(p for p in POSITIONS if p["name"] == name)
+
+
+def new_engine(rules, zobrist, algorithm=SearchAlgorithm.MINIMAX, move_ordering=True) -> SearchEngine:
+    return SearchEngine(
+        rules,
+        zobrist,
+        TranspositionTable(16),
+        MoveOrderer(rules.move_priority) if move_ordering else None,
+        algorithm,
+    )
+
+
+@pytest.mark.parametrize("algorithm", list(SearchAlgorithm), ids=lambda algorithm: algorithm.name.lower())
+def test_interrupted_search_leaves_the_board_intact(algorithm):
+    rules, board, zobrist, key, move_count = setup_position(position("c4-early"))
+    before = board.to_list()
+    engine = new_engine(rules, zobrist, algorithm)
+
+    move = engine.search(board, key, move_count, max_depth=20, node_budget=5000)
+
+    assert engine.search_depth > len(engine.iterations)         # the last iteration was cut short
+    assert move in rules.get_possible_moves(board)
+    assert board.to_list() == before
+    assert board.move_count == move_count
+
+
+@pytest.mark.parametrize("algorithm", list(SearchAlgorithm), ids=lambda algorithm: algorithm.name.lower())
+def test_budgeted_search_reports_the_full_principal_variation(algorithm):
+    rules, board, zobrist, key, move_count = setup_position(position("c4-early"))
+    before = board.to_list()
+    engine = new_engine(rules, zobrist, algorithm)
+
+    move = engine.search(board, key, move_count, max_depth=20, node_budget=5000)
+
+    variation = engine.stats.principal_variation
+    completed = engine.iterations[-1][0]
+    assert variation[0] == move
+    assert len(variation) >= completed
+    assert board.to_list() == before
+
+
+@pytest.mark.parametrize("algorithm", list(SearchAlgorithm), ids=lambda algorithm: algorithm.name.lower())
+def test_node_budget_returns_the_deepest_completed_move(algorithm):
+    rules, board, zobrist, key, move_count = setup_position(position("c4-opening"))
+    engine = new_engine(rules, zobrist, algorithm)
+
+    move = engine.search(board, key, move_count, max_depth=20, node_budget=20000)
+    depth, score, iteration_move = engine.iterations[-1][:3]
+
+    assert move == iteration_move
+    assert engine.search_depth == depth + 1                     # stopped in the next iteration
+    assert engine.minimax_counter < 20000 + 1024                # the budget is checked every 1024 nodes
+
+    fixed = new_engine(rules, zobrist, algorithm)              # the same search, without a budget
+    assert fixed.search(board, key, move_count, max_depth=depth) == move
+    assert fixed.iterations[-1][1] == score
+
+
+@pytest.mark.parametrize("algorithm", list(SearchAlgorithm), ids=lambda algorithm: algorithm.name.lower())
+def test_time_budget_stops_the_search(algorithm):
+    rules, board, zobrist, key, move_count = setup_position(position("c4-opening"))
+    engine = new_engine(rules, zobrist, algorithm)
+
+    start = monotonic()
+    move = engine.search(board, key, move_count, max_depth=40, time_budget=0.1)
+
+    assert monotonic() - start < 2
+    assert engine.search_depth > len(engine.iterations)
+    assert move == engine.iterations[-1][2]
+
+
+ORDERING_CASES = [(p["name"], p["depth"] if p["name"].startswith("ttt") else 6) for p in POSITIONS]
+
+
+@pytest.mark.parametrize("algorithm", list(SearchAlgorithm), ids=lambda algorithm: algorithm.name.lower())
+@pytest.mark.parametrize("name, depth", ORDERING_CASES, ids=[name for name, _ in ORDERING_CASES])
+def test_move_ordering_keeps_the_score(name, depth, algorithm):
+    results = []
+    for move_ordering in (True, False):
+        rules, board, zobrist, key, move_count = setup_position(position(name))
+        engine = new_engine(rules, zobrist, algorithm, move_ordering)
+        engine.search(board, key, move_count, max_depth=depth)
+        results.append((engine.iterations[-1][1], engine.minimax_counter))
+
+    (ordered_score, ordered_nodes), (unordered_score, unordered_nodes) = results
+    assert ordered_score == unordered_score
+    assert ordered_nodes <= unordered_nodes
@@ -0,0 +1,48 @@
+"""Runs the search benchmark corpus and checks its results. \n
+
+The benchmark seeds its Zobrist keys and searches to a fixed depth, so the node
+counts are the same on every run. A change to the search that alters them shows
+up here. If the change is intended, update EXPECTED from a benchmark report
+(`just bench-search`)."""
+
+import pytest
+
+from textual_games.benchmarks.search import POSITIONS, run_benchmark
+from textual_games.enums import SearchAlgorithm
+
+
+# position name: (best move, score, nodes by algorithm)
+EXPECTED = {
+    "ttt-center":           ((0, 0), 0,    {"minimax": 2534,  "negamax": 2375}),
+    "ttt-corner":           ((1, 1), 0,    {"minimax": 2113,  "negamax": 2068}),
+    "ttt-edge":             ((1, 1), 0,    {"minimax": 2151,  "negamax": 2145}),
+    "ttt-opposite-corners": ((0, 1), 0,    {"minimax": 377,   "negamax": 368}),
+    "ttt-must-block":       ((0, 2), 0,    {"minimax": 152,   "negamax": 154}),
+    "c4-opening":           ((5, 2), -33,  {"minimax": 18954, "negamax": 17110}),
+    "c4-edge-opening":      ((5, 3), -6,   {"minimax": 14719, "negamax": 13356}),
+    "c4-early":             ((3, 3), -12,  {"minimax": 18774, "negamax": 19528}),
+    "c4-must-block":        ((2, 3), -98,  {"minimax": 12803, "negamax": 12024}),
+    "c4-midgame":           ((2, 4), -207, {"minimax": 10282, "negamax": 9725}),
+}
+
+
+def test_every_position_has_expectations():
+    assert sorted(EXPECTED) == sorted(position["name"] for position in POSITIONS)
+
+
+@pytest.mark.parametrize("algorithm", list(SearchAlgorithm), ids=lambda algorithm: algorithm.name.lower())
+@pytest.mark.parametrize("position", POSITIONS, ids=lambda position: position["name"])
+def test_benchmark_position(position, algorithm):
+    best_move, score, nodes = EXPECTED[position["name"]]
+    result = run_benchmark(position, algorithm=algorithm)
+
+    assert tuple(result["best_move"]) == best_move
+    assert result["score"] == score
+    assert result["nodes"] == nodes[algorithm.name.lower()]
+
+
+@pytest.mark.parametrize("position", POSITIONS[:1], ids=lambda position: position["name"])
+def test_benchmark_is_reproducible(position):
+    first = run_benchmark(position)
+    second = run_benchmark(position)
+    assert (first["best_move"], first["score"], first["nodes"]) == (second["best_move"], second["score"], second["nodes"])
@@ -0,0 +1,102 @@
+"""Checks the Sudoku solver and generator on known puzzles."""
+
+import pytest
+
+from textual_games.enums import SudokuDifficulty
+from textual_games.games.sudoku import SudokuSolver, SudokuGenerator
+
+
+def parse(rows: str) -> list[list[int]]:
+    "A board from 9 lines of digits, '.' for an empty cell."
+    return [[0 if char == "." else int(char) for char in line] for line in rows.split()]
+
+
+# Arto Inkala's "hardest Sudoku". Singles alone don't get far, so it needs guessing.
+HARD_PUZZLE = parse("""
+    8........
+    ..36.....
+    .7..9.2..
+    .5...7...
+    ....457..
+    ...1...3.
+    ..1....68
+    ..85...1.
+    .9....4..
+""")
+HARD_SOLUTION = parse("""
+    812753649
+    943682175
+    675491283
+    154237896
+    369845721
+    287169534
+    521974368
+    438526917
+    796318452
+""")
+
+
+def is_valid_solution(board: list[list[int]]) -> bool:
+    digits = set(range(1, 10))
+    rows = [set(row) for row in board]
+    columns = [{board[row][col] for row in range(9)} for col in range(9)]
+    boxes = [
+        {board[row][col] for row in range(top, top + 3) for col in range(left, left + 3)}
+        for top in range(0, 9, 3)
+        for left in range(0, 9, 3)
+    ]
+    return all(unit == digits for unit in rows + columns + boxes)
+
+
+def keeps_clues(puzzle: list[list[int]], solution: list[list[int]]) -> bool:
+    return all(
+        clue in (0, answer)
+        for puzzle_row, solution_row in zip(puzzle, solution)
+        for clue, answer in zip(puzzle_row, solution_row)
+    )
+
+
+def test_solves_a_hard_puzzle():
+    solver = SudokuSolver()
+    solutions = solver.solve(HARD_PUZZLE, limit=2)
+
+    assert solutions == [HARD_SOLUTION]
+    assert is_valid_solution(HARD_SOLUTION)
+    assert solver.guesses > 0
+    assert solver.solve_by_singles(HARD_PUZZLE) is None
+
+
+def test_count_solutions_stops_at_the_limit():
+    solver = SudokuSolver()
+    puzzle = [row.copy() for row in HARD_SOLUTION]
+    for row, col in [(0, 2), (0, 5), (1, 2), (1, 5)]:       # 2 and 3 can swap in these corners
+        puzzle[row][col] = 0
+
+    assert solver.count_solutions(puzzle) == 2
+    assert not solver.is_unique(puzzle)
+    assert solver.count_solutions([[0] * 9 for _ in range(9)]) == 2
+    assert solver.count_solutions([[0] * 9 for _ in range(9)], limit=5) == 5
+
+
+def test_unsolvable_board_has_no_solutions():
+    puzzle = [row.copy() for row in HARD_PUZZLE]
+    puzzle[0][1] = 8                                        # a second 8 in the first row
+    assert SudokuSolver().count_solutions(puzzle) == 0
+
+
+@pytest.mark.parametrize("difficulty", list(SudokuDifficulty), ids=lambda difficulty: difficulty.name.lower())
+def test_generated_puzzle_has_its_solution_only(difficulty):
+    generator = SudokuGenerator(seed=7)
+    puzzle, solution = generator.generate(difficulty)
+
+    assert is_valid_solution(solution)
+    assert keeps_clues(puzzle, solution)
+    assert SudokuSolver().solve(puzzle, limit=2) == [solution]
+    if difficulty != SudokuDifficulty.HARD:
+        assert SudokuSolver().solve_by_singles(puzzle) == solution
+
+
+def test_generator_is_reproducible():
+    first = SudokuGenerator(seed=3).generate(SudokuDifficulty.HARD)
+    second = SudokuGenerator(seed=3).generate(SudokuDifficulty.HARD)
+    assert first == second
@@ -0,0 +1,116 @@
+"""Unit tests of the Zobrist keys and the transposition table's replacement schemes."""
+
+import random
+
+import pytest
+
+from textual_games.enums import Bound, Replacement
+from textual_games.games.connectfour import ConnectFourRules
+from textual_games.games.tictactoe import TicTacToeRules
+from textual_games.transposition import TranspositionTable, ZobristKeys
+
+
+def small_table(entries: int, replacement: Replacement) -> TranspositionTable:
+    table = TranspositionTable(entries * TranspositionTable.ENTRY_BYTES / (1024 * 1024), replacement)
+    assert table.capacity == entries
+    return table
+
+
+def snapshot(board) -> list[list[int]]:
+    return board.to_list() if hasattr(board, "to_list") else [list(row) for row in board]
+
+
+@pytest.mark.parametrize("replacement", list(Replacement), ids=lambda replacement: replacement.name.lower())
+def test_store_and_probe(replacement):
+    table = small_table(8, replacement)
+    table.store(42, 3, 17, Bound.EXACT, (1, 2))
+
+    entry = table.probe(42)
+    assert (entry.key, entry.depth, entry.score, entry.bound, entry.best_move) == (42, 3, 17, Bound.EXACT, (1, 2))
+    assert table.probe(43) is None
+    assert table.hits == 1
+    assert len(table) == 1
+
+    table.store(42, 1, -5, Bound.UPPER, None)               # the same position is always replaced
+    assert (table.probe(42).depth, table.probe(42).score) == (1, -5)
+    assert len(table) == 1
+
+    table.clear()
+    assert table.probe(42) is None
+    assert len(table) == 0
+
+
+def test_depth_replacement_keeps_the_deeper_entry_of_a_search():
+    table = small_table(4, Replacement.DEPTH)
+    deep, shallow = 1, 1 + 4                                # same slot, different positions
+
+    table.store(deep, 5, 10, Bound.EXACT, (0, 0))
+    table.store(shallow, 2, 20, Bound.EXACT, (0, 1))
+    assert table.probe(deep).depth == 5
+    assert table.probe(shallow) is None
+
+    table.store(shallow, 6, 30, Bound.LOWER, (0, 2))        # deeper wins the slot
+    assert table.probe(shallow).depth == 6
+    assert table.probe(deep) is None
+    assert len(table) == 1
+
+
+def test_depth_replacement_prefers_the_new_search():
+    table = small_table(4, Replacement.DEPTH)
+    old, new = 2, 2 + 4
+
+    table.store(old, 8, 10, Bound.EXACT, (0, 0))
+    table.new_search()
+    table.store(new, 1, 20, Bound.EXACT, (0, 1))            # shallower, but the old entry is stale
+
+    assert table.probe(new).depth == 1
+    assert table.probe(old) is None
+
+
+def test_lru_replacement_evicts_the_least_recently_used():
+    table = small_table(2, Replacement.LRU)
+    table.store(1, 1, 0, Bound.EXACT, None)
+    table.store(2, 9, 0, Bound.EXACT, None)
+    table.probe(1)                                          # 2 is now the least recently used
+
+    table.store(3, 1, 0, Bound.EXACT, None)
+    assert table.probe(2) is None
+    assert table.probe(1) is not None and table.probe(3) is not None
+    assert len(table) == 2
+
+    table.store(1, 2, 0, Bound.EXACT, None)                 # updating an entry doesn't evict
+    table.store(4, 1, 0, Bound.EXACT, None)                 # evicts 3, used before 1 was updated
+    assert table.probe(3) is None
+    assert table.probe(1).depth == 2
+    assert len(table) == 2
+
+
+@pytest.mark.parametrize("rules", [TicTacToeRules(3, 3), ConnectFourRules(6, 7)], ids=["tictactoe", "connectfour"])
+def test_incremental_key_matches_the_board(rules):
+    zobrist = ZobristKeys(rules.rows, rules.columns, seed=1)
+    rng = random.Random(5)
+    board = rules.new_board()
+    empty = snapshot(board)
+    key = 0
+    played = []
+
+    for ply in range(rules.rows * rules.columns):
+        player = 1 if ply % 2 == 0 else 2
+        move = rng.choice(rules.get_possible_moves(board))
+        rules.apply_move(board, move, player)
+        key ^= zobrist.pieces[player][move[0]][move[1]]
+        played.append((move, player))
+        assert key == zobrist.hash_board(snapshot(board))
+
+    for move, player in reversed(played):
+        rules.undo_move(board, move, player)
+        key ^= zobrist.pieces[player][move[0]][move[1]]
+        assert key == zobrist.hash_board(snapshot(board))
+
+    assert key == 0
+    assert snapshot(board) == empty
+
+
+def test_seeded_keys_are_reproducible():
+    assert ZobristKeys(6, 7, seed=3).pieces == ZobristKeys(6, 7, seed=3).pieces
+    assert ZobristKeys(6, 7, seed=3).pieces != ZobristKeys(6, 7, seed=4).pieces
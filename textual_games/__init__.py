@@ -1,4 +1,69 @@
-from textual_games.menu import TextualGames
+"""TextualGames. The app is imported on first use, so importing the package
+(e.g. in the parallel search's worker processes) doesn't load Textual."""
 
-def main():
-    TextualGames().run()
\ No newline at end of file
+from __future__ import annotations
+from typing import Any
+import argparse
+
+
+#* Called by: main
+def parse_options(argv: list[str] | None = None) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Parses the command line into the AI engine's options (for the GameManager) and
+    the display options (for TextualGames). Only the options that were given are
+    returned, so the defaults of GameManager and TextualGames apply to the rest."""
+
+    from textual_games.enums import Replacement
+
+    parser = argparse.ArgumentParser(prog="textual-games", description="Play games against the computer in the terminal.")
+    engine = parser.add_argument_group("AI engine", "Settings of the computer player's search.")
+    engine.add_argument("--show-stats", action="store_true", default=argparse.SUPPRESS,
+                        help="show a summary of the last AI move's search in the turn header")
+    engine.add_argument("--stats-file", metavar="PATH", default=argparse.SUPPRESS,
+                        help="append the statistics of every AI move to this JSON-lines file")
+    engine.add_argument("--ponder", action="store_true", default=argparse.SUPPRESS,
+                        help="search replies to your most likely moves while it is your turn")
+    engine.add_argument("--think-delay", type=float, metavar="SECONDS", default=argparse.SUPPRESS,
+                        help="seconds the AI pretends to think before each move (default: 0.5, 0 for none)")
+    engine.add_argument("--parallel-workers", type=int, metavar="N", default=argparse.SUPPRESS,
+                        help="split the root moves across this many worker processes (default: 0, a single thread)")
+    engine.add_argument("--tt-megabytes", type=float, metavar="MB", default=argparse.SUPPRESS,
+                        help="memory cap of the transposition table (default: 16)")
+    engine.add_argument("--tt-replacement", choices=[r.name.lower() for r in Replacement], default=argparse.SUPPRESS,
+                        help="replacement scheme of the transposition table (default: depth)")
+    engine.add_argument("--no-move-ordering", dest="move_ordering", action="store_false", default=argparse.SUPPRESS,
+                        help="search moves in generation order")
+    engine.add_argument("--no-opening-book", dest="use_opening_book", action="store_false", default=argparse.SUPPRESS,
+                        help="always search, even where the game has an opening book")
+    display = parser.add_argument_group("display")
+    display_actions = [
+        display.add_argument("--line-grid", action="store_true", default=argparse.SUPPRESS,
+                             help="draw the board in a single widget (faster to mount on big boards)"),
+    ]
+    options = vars(parser.parse_args(argv))
+    display_options = {action.dest: options.pop(action.dest) for action in display_actions if action.dest in options}
+
+    if "tt_replacement" in options:
+        options["tt_replacement"] = Replacement[options["tt_replacement"].upper()]
+    if options.get("think_delay", 0) < 0:
+        parser.error("--think-delay can't be negative")
+    if options.get("parallel_workers", 0) < 0:
+        parser.error("--parallel-workers can't be negative")
+    return options, display_options
+
+
+def parse_engine_options(argv: list[str] | None = None) -> dict[str, Any]:
+    "Parses the command line like parse_options, and returns the AI engine's options only."
+    return parse_options(argv)[0]
+
+
+def main(argv: list[str] | None = None):
+    engine_options, display_options = parse_options(argv)      # before importing Textual, so --help is quick
+    from textual_games.menu import TextualGames
+    TextualGames(engine_options=engine_options, **display_options).run()
+
+
+def __getattr__(name: str):
+    if name == "TextualGames":          # for `textual run textual_games:TextualGames`
+        from textual_games.menu import TextualGames
+        return TextualGames
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
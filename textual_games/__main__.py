@@ -1,2 +1,4 @@
-from textual_games.menu import TextualGames
-TextualGames().run()
\ No newline at end of file
+from textual_games import main
+
+if __name__ == "__main__":      # guard needed by the parallel search's spawned worker processes
+    main()
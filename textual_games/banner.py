@@ -0,0 +1,93 @@
+"""Figlet banner with an on-disk render cache. \n
+
+The title banner never changes, but rendering it with a FigletWidget imports
+textual-pyfiglet (and its color animation library) and parses the font file on
+every launch. Banner renders the figlet text once per font, text and width, and
+keeps the result in the cache directory. Later launches just read the text file,
+so pyfiglet is only imported when the terminal width changes to a new value."""
+
+from __future__ import annotations
+from pathlib import Path
+import hashlib
+
+from textual.widget import Widget
+from textual.widgets import Static
+
+from textual_games.cache import cache_dir
+
+
+class Banner(Static):
+
+    DEFAULT_CSS = "Banner {width: auto; height: auto;}"
+
+    def __init__(self, text: str, *args, font: str = "standard", **kwargs):
+        """ | Arg  | Description
+            |------|-------------
+            | text | - Text to render as a figlet banner
+            | font | - Figlet font name """
+
+        super().__init__(*args, markup=False, **kwargs)
+        self.text = text
+        self.font = font
+        self.rendered_width = 0         # width of the current render, 0 before the first
+
+    def on_mount(self):
+        self.render_banner(self.app.size.width)
+
+    def on_resize(self):
+        # The banner is as wide as its text, so the render target is the parent's width.
+        # (Not the container size of the event: in a Horizontal that depends on the banner.)
+        if isinstance(self.parent, Widget):
+            self.render_banner(self.parent.size.width)
+
+    #* Called by: self.on_mount, self.on_resize
+    def render_banner(self, width: int):
+
+        if width <= 0 or width == self.rendered_width:
+            return
+        self.rendered_width = width
+        self.update(self.cached_render(width))
+
+    def cached_render(self, width: int) -> str:
+        """Returns the banner rendered at `width`, from the cache if it is there."""
+
+        digest = hashlib.sha1(self.text.encode("utf-8")).hexdigest()[:16]
+        try:
+            path: Path | None = cache_dir() / "banners" / f"{self.font}-{width}-{digest}.txt"
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            pass
+        except OSError:
+            path = None         # no usable cache directory. Render every time.
+
+        banner = render_figlet(self.text, self.font, width)
+        if path is not None:
+            try:
+                path.parent.mkdir(exist_ok=True)
+                temporary = path.with_suffix(".tmp")
+                temporary.write_text(banner, encoding="utf-8")
+                temporary.replace(path)     # never leave a half-written banner
+            except OSError:
+                pass
+        return banner
+
+
+#* Called by: Banner.cached_render
+def render_figlet(text: str, font: str, width: int) -> str:
+    """Renders `text` with pyfiglet, trimmed like an auto-width FigletWidget:
+    no blank first or last lines, no common indent and no trailing spaces."""
+
+    try:
+        from pyfiglet import Figlet                         # textual-pyfiglet >= 1.0 depends on pyfiglet
+    except ImportError:
+        from textual_pyfiglet.pyfiglet import Figlet        # older versions bundle it
+
+    lines = Figlet(font=font, width=width).renderText(text).splitlines()
+    while lines and not lines[0].strip():
+        del lines[0]
+    while lines and not lines[-1].strip():
+        del lines[-1]
+    if not lines:
+        return ""
+    indent = min(len(line) - len(line.lstrip(" ")) for line in lines if line.strip())
+    return "\n".join(line[indent:].rstrip() for line in lines)
@@ -0,0 +1 @@
+"""Benchmarks for TextualGames. Each module is a CLI entry point that prints JSON. \n"""
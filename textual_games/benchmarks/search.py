@@ -0,0 +1,237 @@
+"""Search benchmark: runs the AI search on a fixed corpus of positions. \n
+
+Every position is searched to a fixed depth with no time budget and seeded
+Zobrist keys, so node counts are reproducible across runs and machines. Only the
+timings change. The report is printed as JSON, so results from two engine
+versions can be diffed or checked by a build machine.
+
+By default every position is searched with each SearchAlgorithm, and the report
+compares their node counts at equal depth against the first one (MINIMAX).
+
+Run with `textual-games-bench-search` (or `python -m textual_games.benchmarks.search`)."""
+
+from __future__ import annotations
+from time import perf_counter
+from typing import Any
+import argparse
+import json
+import platform
+import sys
+
+from textual_games.enums import Replacement, SearchAlgorithm
+from textual_games.rules import GameRules
+from textual_games.search import SearchEngine
+from textual_games.transposition import ZobristKeys, TranspositionTable
+from textual_games.move_ordering import MoveOrderer
+from textual_games.games.connectfour import ConnectFourRules
+from textual_games.games.tictactoe import TicTacToeRules
+
+
+GAMES: dict[str, tuple[type[GameRules], int, int]] = {
+    "tictactoe": (TicTacToeRules, 3, 3),
+    "connectfour": (ConnectFourRules, 6, 7),
+}
+
+# Moves alternate starting with player 1 (the human). Every position has an odd
+# number of moves, so the AI (player 2) is to move, as it is in the app.
+# Tic-Tac-Toe moves are (row, col). Connect Four moves are columns.
+POSITIONS: list[dict[str, Any]] = [
+    {"name": "ttt-center",         "game": "tictactoe",   "depth": 9,  "moves": [(1, 1)]},
+    {"name": "ttt-corner",         "game": "tictactoe",   "depth": 9,  "moves": [(0, 0)]},
+    {"name": "ttt-edge",           "game": "tictactoe",   "depth": 9,  "moves": [(0, 1)]},
+    {"name": "ttt-opposite-corners", "game": "tictactoe", "depth": 9,  "moves": [(0, 0), (1, 1), (2, 2)]},
+    {"name": "ttt-must-block",     "game": "tictactoe",   "depth": 9,  "moves": [(0, 0), (1, 1), (0, 1)]},
+    {"name": "c4-opening",         "game": "connectfour", "depth": 8,  "moves": [3]},
+    {"name": "c4-edge-opening",    "game": "connectfour", "depth": 8,  "moves": [0]},
+    {"name": "c4-early",           "game": "connectfour", "depth": 8,  "moves": [3, 3, 2, 4, 4]},
+    {"name": "c4-must-block",      "game": "connectfour", "depth": 8,  "moves": [3, 0, 3, 0, 3]},
+    {"name": "c4-midgame",         "game": "connectfour", "depth": 10, "moves": [3, 3, 3, 2, 4, 4, 2, 5, 1, 1, 4, 2, 5]},
+]
+
+
+#* Called by: run_benchmark
+def setup_position(position: dict[str, Any]) -> tuple[GameRules, Any, ZobristKeys, int, int]:
+    """Plays the position's moves on a new board.
+
+        Returns:
+            tuple: rules, board, zobrist keys, Zobrist key of the board, move count"""
+
+    rules_class, rows, columns = GAMES[position["game"]]
+    rules = rules_class(rows, columns)
+    zobrist = ZobristKeys(rows, columns, seed=0)
+    board = rules.new_board()
+    key = 0
+    player = 1
+    for move in position["moves"]:
+        if isinstance(move, int):       # Connect Four column, gravity decides the row
+            move = next(m for m in rules.get_possible_moves(board) if m[1] == move)
+        rules.apply_move(board, move, player)
+        key ^= zobrist.pieces[player][move[0]][move[1]]
+        player = 3 - player
+    return rules, board, zobrist, key, len(position["moves"])
+
+
+def run_benchmark(
+        position: dict[str, Any],
+        depth: int | None = None,
+        tt_megabytes: float = 16,
+        tt_replacement: Replacement = Replacement.DEPTH,
+        move_ordering: bool = True,
+        algorithm: SearchAlgorithm = SearchAlgorithm.MINIMAX,
+    ) -> dict[str, Any]:
+    """Searches one position with a fresh engine and returns its results.
+
+        | Arg            | Description
+        |----------------|-------------
+        | position       | - An entry of POSITIONS
+        | depth          | - Overrides the position's search depth
+        | tt_megabytes   | - Memory cap of the transposition table
+        | tt_replacement | - Replacement scheme of the transposition table
+        | move_ordering  | - Sort moves before searching
+        | algorithm      | - MINIMAX or NEGAMAX """
+
+    rules, board, zobrist, key, move_count = setup_position(position)
+    engine = SearchEngine(
+        rules,
+        zobrist,
+        TranspositionTable(tt_megabytes, tt_replacement),
+        MoveOrderer(rules.move_priority) if move_ordering else None,
+        algorithm,
+    )
+    max_depth = depth if depth is not None else position["depth"]
+
+    start_time = perf_counter()
+    best_move = engine.search(board, key, move_count, max_depth)
+    elapsed = perf_counter() - start_time
+
+    nodes = engine.minimax_counter
+    stats = engine.stats.to_dict()
+    return {
+        "name": position["name"],
+        "game": position["game"],
+        "algorithm": algorithm.name.lower(),
+        "depth": engine.iterations[-1][0],
+        "best_move": list(best_move),
+        "score": engine.iterations[-1][1],
+        "nodes": nodes,
+        "seconds": round(elapsed, 6),
+        "nodes_per_second": round(nodes / elapsed) if elapsed else None,
+        "prune_ratio": round(engine.pruning_counter / nodes, 4) if nodes else 0,
+        "first_move_cutoffs": round(engine.first_move_cutoffs / engine.pruning_counter, 4)
+                              if engine.pruning_counter else 0,
+        "tt_hits": engine.transposition_table.hits,
+        "pvs_researches": engine.research_counter,
+        "aspiration_failures": engine.aspiration_failures,
+        "nodes_per_depth": stats["nodes_per_depth"],
+        "cutoffs_per_depth": stats["cutoffs_per_depth"],
+        "principal_variation": stats["principal_variation"],
+        "time_to_depth": [
+            {"depth": d, "score": score, "move": list(move), "nodes": n, "seconds": round(t, 6)}
+            for d, score, move, n, t in engine.iterations
+        ],
+    }
+
+
+#* Called by: main
+def compare(results: list[dict[str, Any]], algorithms: list[SearchAlgorithm]) -> list[dict[str, Any]]:
+    """Node counts of every algorithm per position, relative to the first algorithm.
+    Positions are searched to the same depth by each, so the scores must match."""
+
+    if len(algorithms) < 2:
+        return []
+
+    by_position: dict[str, dict[str, dict[str, Any]]] = {}
+    for result in results:
+        by_position.setdefault(result["name"], {})[result["algorithm"]] = result
+
+    baseline = algorithms[0].name.lower()
+    comparison = []
+    for name, runs in by_position.items():
+        base = runs[baseline]
+        comparison.append({
+            "name": name,
+            "baseline": baseline,
+            "nodes": {algorithm: run["nodes"] for algorithm, run in runs.items()},
+            "node_reduction": {
+                algorithm: round(1 - run["nodes"] / base["nodes"], 4)
+                for algorithm, run in runs.items() if algorithm != baseline
+            },
+            "same_score": len({run["score"] for run in runs.values()}) == 1,
+        })
+    return comparison
+
+
+def main(argv: list[str] | None = None):
+
+    parser = argparse.ArgumentParser(description="Benchmark the TextualGames AI search.")
+    parser.add_argument("--game", choices=sorted(GAMES), help="only run positions of this game")
+    parser.add_argument("--position", action="append", help="only run this position (repeatable)")
+    parser.add_argument("--depth", type=int, help="override the search depth of every position")
+    parser.add_argument("--tt-megabytes", type=float, default=16)
+    parser.add_argument("--tt-replacement", choices=[r.name.lower() for r in Replacement], default="depth")
+    parser.add_argument("--no-move-ordering", action="store_true")
+    parser.add_argument(
+        "--algorithm", action="append", choices=[a.name.lower() for a in SearchAlgorithm],
+        help="search with this algorithm (repeatable, default: all of them)",
+    )
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--list", action="store_true", help="list the positions and exit")
+    args = parser.parse_args(argv)
+
+    positions = [
+        p for p in POSITIONS
+        if (args.game is None or p["game"] == args.game)
+        and (args.position is None or p["name"] in args.position)
+    ]
+    if args.list:
+        for p in positions:
+            print(f"{p['name']:<24} {p['game']:<12} depth {p['depth']}")
+        return
+    if not positions:
+        parser.error("no positions match")
+
+    algorithms = [SearchAlgorithm[a.upper()] for a in args.algorithm] if args.algorithm else list(SearchAlgorithm)
+    results = [
+        run_benchmark(
+            p,
+            depth=args.depth,
+            tt_megabytes=args.tt_megabytes,
+            tt_replacement=Replacement[args.tt_replacement.upper()],
+            move_ordering=not args.no_move_ordering,
+            algorithm=algorithm,
+        )
+        for p in positions
+        for algorithm in algorithms
+    ]
+    total_nodes = sum(r["nodes"] for r in results)
+    total_seconds = sum(r["seconds"] for r in results)
+    report = {
+        "benchmark": "search",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "depth": args.depth,
+            "tt_megabytes": args.tt_megabytes,
+            "tt_replacement": args.tt_replacement,
+            "move_ordering": not args.no_move_ordering,
+            "algorithms": [a.name.lower() for a in algorithms],
+        },
+        "positions": results,
+        "comparison": compare(results, algorithms),
+        "total": {
+            "nodes": total_nodes,
+            "seconds": round(total_seconds, 6),
+            "nodes_per_second": round(total_nodes / total_seconds) if total_seconds else None,
+        },
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Startup benchmark: how long the app takes to become interactive. \n
+
+Every run starts a new Python process, so imports are measured cold. The process
+runs the app headless with Textual's run_test pilot and times each phase:
+
+- import:           importing textual_games.menu (Textual, the widgets, the manager)
+- construct:        TextualGames()
+- discover_games:   GameLoader.discover_games
+- mount_games_menu: TextualGames.mount_games_menu
+- load_games:       TextualGames.load_games (discovery and mounting the menu)
+- menu_painted:     start of the benchmark script to the first refresh that shows the menu
+- game_ready:       GameSelected to the first refresh of a playable Grid
+
+All times are in milliseconds. The report is JSON with a fixed layout, so reports
+of two versions can be diffed. By default the cache directory is used as is
+(after the first run it is warm). With --cold every run gets an empty one, so the
+games manifest, the title banner and any game tables are rebuilt.
+
+Run with `textual-games-bench-startup` (or `python -m textual_games.benchmarks.startup`)."""
+
+# NOTE: Nothing heavy may be imported at module level. The child process
+# measures the import of the app itself.
+from __future__ import annotations
+from time import perf_counter
+START_TIME = perf_counter()
+
+from statistics import median
+from typing import Callable
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+
+
+PHASES = [
+    "import",
+    "construct",
+    "discover_games",
+    "mount_games_menu",
+    "load_games",
+    "menu_painted",
+    "game_ready",
+]
+
+
+###~ Child process side ~###
+
+#* Called by: measure
+def timed(owner: type, name: str, timings: dict[str, float], phase: str):
+    """Replaces a method of `owner` with one that records its duration in timings[phase].
+    Works for both plain and async methods."""
+
+    method = getattr(owner, name)
+
+    # inspect.iscoroutinefunction would import inspect before the app does, and skew "import".
+    if method.__code__.co_flags & 0x80:         # CO_COROUTINE
+        async def wrapper(self, *args, **kwargs):
+            start = perf_counter()
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                timings[phase] = perf_counter() - start
+    else:
+        def wrapper(self, *args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                timings[phase] = perf_counter() - start
+
+    setattr(owner, name, wrapper)
+
+
+#* Called by: main (in the child process)
+async def measure(game_name: str, size: tuple[int, int], timeout: float) -> dict[str, float]:
+    """Runs the app once and returns the duration of every phase, in seconds."""
+
+    import asyncio
+
+    timings: dict[str, float] = {}
+    start = perf_counter()
+    from textual_games.menu import TextualGames, GameEntry, GameLoader
+    from textual_games.grid import Grid
+    timings["import"] = perf_counter() - start
+
+    timed(GameLoader, "discover_games", timings, "discover_games")
+    timed(TextualGames, "mount_games_menu", timings, "mount_games_menu")
+    timed(TextualGames, "load_games", timings, "load_games")
+
+    start = perf_counter()
+    app = TextualGames()
+    timings["construct"] = perf_counter() - start
+
+    async def wait_for(condition: Callable[[], bool], what: str):
+        deadline = perf_counter() + timeout
+        while not condition():
+            if perf_counter() > deadline:
+                raise TimeoutError(f"Timed out waiting for {what}")
+            await asyncio.sleep(0.001)
+
+    async with app.run_test(size=size):
+        await wait_for(lambda: "mount_games_menu" in timings, "the games menu")
+        app.call_after_refresh(lambda: timings.setdefault("menu_painted", perf_counter() - START_TIME))
+        await wait_for(lambda: "menu_painted" in timings, "the menu to be painted")
+
+        entries = [entry for entry in app.query(GameEntry) if entry.game_name == game_name]
+        if not entries:
+            raise ValueError(f"No game called {game_name!r}")
+        selected = perf_counter()
+        entries[0].post_message(GameEntry.GameSelected(entries[0].game_info))
+        await wait_for(
+            lambda: app.game_manager.game_running and bool(app.query(Grid)),
+            "the game to start",
+        )
+        app.call_after_refresh(lambda: timings.setdefault("game_ready", perf_counter() - selected))
+        await wait_for(lambda: "game_ready" in timings, "the game to be painted")
+
+    return timings
+
+
+###~ Parent process side ~###
+
+#* Called by: main
+def run_once(game_name: str, size: tuple[int, int], timeout: float, cache: str | None) -> dict[str, float]:
+    """Runs one measurement in a new process. Returns milliseconds per phase."""
+
+    env = dict(os.environ)
+    if cache is not None:
+        env["TEXTUAL_GAMES_CACHE"] = cache
+    command = [
+        sys.executable, "-m", "textual_games.benchmarks.startup", "--child",
+        "--game", game_name, "--size", f"{size[0]}x{size[1]}", "--timeout", str(timeout),
+    ]
+    result = subprocess.run(command, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Benchmark process failed:\n{result.stderr}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    return {phase: round(timings[phase] * 1000, 3) for phase in PHASES}
+
+
+#* Called by: main
+def summarize(runs: list[dict[str, float]]) -> dict[str, dict[str, float]]:
+    return {
+        phase: {
+            "min": min(run[phase] for run in runs),
+            "median": round(median(run[phase] for run in runs), 3),
+            "max": max(run[phase] for run in runs),
+        }
+        for phase in PHASES
+    }
+
+
+def parse_size(text: str) -> tuple[int, int]:
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+
+def main(argv: list[str] | None = None):
+
+    parser = argparse.ArgumentParser(description="Benchmark how fast TextualGames starts.")
+    parser.add_argument("--runs", type=int, default=5, help="number of app launches (default: 5)")
+    parser.add_argument("--game", default="Connect Four", help="game to open (default: Connect Four)")
+    parser.add_argument("--size", type=parse_size, default=(120, 50), help="terminal size (default: 120x50)")
+    parser.add_argument("--cold", action="store_true", help="start every run with an empty cache directory")
+    parser.add_argument("--timeout", type=float, default=30, help="seconds to wait for each phase")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        import asyncio
+        timings = asyncio.run(measure(args.game, args.size, args.timeout))
+        sys.stdout.write(json.dumps(timings) + "\n")
+        return
+
+    runs = []
+    for _ in range(args.runs):
+        if args.cold:
+            with tempfile.TemporaryDirectory(prefix="textual-games-bench-") as cache:
+                runs.append(run_once(args.game, args.size, args.timeout, cache))
+        else:
+            runs.append(run_once(args.game, args.size, args.timeout, None))
+
+    report = {
+        "benchmark": "startup",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "runs": args.runs,
+            "game": args.game,
+            "size": list(args.size),
+            "cache": "cold" if args.cold else "warm",
+        },
+        "units": "ms",
+        "phases": summarize(runs),
+        "runs": runs,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        sys.stdout.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""Bitboard board representation for gravity games such as Connect Four. \n
+
+The board is stored as one integer per player. Bits are laid out column-major,
+bottom to top, with one extra sentinel bit on top of every column so that
+shifting a line of pieces never wraps into the neighbouring column:
+
+```
+  6 13 20 27 34 41 48   <- sentinel row (always empty)
+  5 12 19 26 33 40 47
+  4 11 18 25 32 39 46
+  3 10 17 24 31 38 45
+  2  9 16 23 30 37 44
+  1  8 15 22 29 36 43
+  0  7 14 21 28 35 42   <- bottom row
+```
+
+Rows and columns exposed by the public methods use the same coordinates as the
+integer board in GameManager (row 0 is the top row)."""
+
+from __future__ import annotations
+from functools import lru_cache
+
+from textual_games.enums import PlayerState
+
+
+class BitBoard:
+
+    __slots__ = ("rows", "columns", "height", "boards", "heights", "move_count")
+
+    def __init__(self, rows: int = 6, columns: int = 7):
+        """ | Arg     | Description
+            |---------|-------------
+            | rows    | - The number of rows on the board
+            | columns | - The number of columns on the board """
+
+        self.rows = rows
+        self.columns = columns
+        self.height = rows + 1          # +1 for the sentinel row
+        self.boards = [0, 0, 0]         # indexed by player number. Index 0 is unused.
+        self.heights = [col * self.height for col in range(columns)]    # next free bit per column
+        self.move_count = 0
+
+    @classmethod
+    def from_list(cls, board: list[list[int]]) -> BitBoard:
+        """Builds a bitboard from a 2D integer board (0 = empty, 1 = player 1, 2 = player 2)."""
+
+        rows = len(board)
+        bitboard = cls(rows, len(board[0]))
+        for col in range(bitboard.columns):
+            for row in range(rows - 1, -1, -1):        # bottom to top
+                player = board[row][col]
+                if player == 0:
+                    break
+                bitboard.play(col, player)
+        return bitboard
+
+    def to_list(self) -> list[list[int]]:
+        """Returns the board as a 2D integer board."""
+
+        board = [[0 for _ in range(self.columns)] for _ in range(self.rows)]
+        for col in range(self.columns):
+            base = col * self.height
+            for bit in range(base, self.heights[col]):
+                row = self.rows - 1 - (bit - base)
+                board[row][col] = 1 if self.boards[1] >> bit & 1 else 2
+        return board
+
+    def copy(self) -> BitBoard:
+
+        bitboard = BitBoard.__new__(BitBoard)
+        bitboard.rows = self.rows
+        bitboard.columns = self.columns
+        bitboard.height = self.height
+        bitboard.boards = self.boards.copy()
+        bitboard.heights = self.heights.copy()
+        bitboard.move_count = self.move_count
+        return bitboard
+
+    def can_play(self, col: int) -> bool:
+        return self.heights[col] < col * self.height + self.rows
+
+    def landing_row(self, col: int) -> int | None:
+        """Returns the row a piece dropped in `col` would land on, or None if the column is full."""
+
+        if not self.can_play(col):
+            return None
+        return self.rows - 1 - (self.heights[col] - col * self.height)
+
+    def play(self, col: int, player: int) -> int:
+        """Drops a piece for `player` in `col`. Returns the row it landed on."""
+
+        bit = self.heights[col]
+        self.boards[player] |= 1 << bit
+        self.heights[col] = bit + 1
+        self.move_count += 1
+        return self.rows - 1 - (bit - col * self.height)
+
+    def undo(self, col: int, player: int) -> None:
+        """Removes the top piece of `col`, which must belong to `player`."""
+
+        self.heights[col] -= 1
+        self.boards[player] ^= 1 << self.heights[col]
+        self.move_count -= 1
+
+    def possible_moves(self) -> list[tuple[int, int]]:
+        """Returns the landing cell of every column that is not full."""
+
+        moves = []
+        for col in range(self.columns):
+            row = self.landing_row(col)
+            if row is not None:
+                moves.append((row, col))
+        return moves
+
+    def position_key(self) -> int:
+        """Returns a key that is unique for every position on this board size.
+        Player 1's pieces, plus a marker bit on the first empty cell of each column.
+        Unlike a Zobrist key it is the same in every process and every run."""
+
+        key = self.boards[1]
+        for bit in self.heights:
+            key |= 1 << bit
+        return key
+
+    def mirrored(self) -> BitBoard:
+        """Returns a copy of the board flipped left to right."""
+
+        bitboard = self.copy()
+        column_mask = (1 << self.height) - 1
+        for player in (1, 2):
+            bits = 0
+            for col in range(self.columns):
+                column = self.boards[player] >> (col * self.height) & column_mask
+                bits |= column << ((self.columns - 1 - col) * self.height)
+            bitboard.boards[player] = bits
+        bitboard.heights = [
+            col * self.height + (self.heights[self.columns - 1 - col] - (self.columns - 1 - col) * self.height)
+            for col in range(self.columns)
+        ]
+        return bitboard
+
+    def is_win(self, player: int, streak: int = 4) -> bool:
+        """Returns True if `player` has `streak` pieces in a row anywhere on the board."""
+
+        bits = self.boards[player]
+        for shift in (1, self.height, self.height + 1, self.height - 1):  # vertical, horizontal, both diagonals
+            if streak == 4:
+                pairs = bits & (bits >> shift)
+                if pairs & (pairs >> (2 * shift)):
+                    return True
+                continue
+            run = bits
+            for step in range(1, streak):
+                run &= bits >> (step * shift)
+            if run:
+                return True
+        return False
+
+    def winner(self, streak: int = 4) -> PlayerState | None:
+        """Returns a PlayerState if the game is over, else returns None."""
+
+        if self.is_win(1, streak):
+            return PlayerState.PLAYER1
+        if self.is_win(2, streak):
+            return PlayerState.PLAYER2
+        if self.move_count == self.rows * self.columns:
+            return PlayerState.EMPTY
+        return None
+
+
+# Masks for evaluations. They only depend on the board size, so they are built once per size.
+
+@lru_cache(maxsize=None)
+def line_masks(rows: int, columns: int, length: int = 4) -> tuple[int, ...]:
+    """Returns the bit mask of every line of `length` cells on the board:
+    vertical, horizontal and both diagonals."""
+
+    height = rows + 1
+    masks = []
+    for col in range(columns):
+        for row in range(rows):                 # counted from the bottom, like the bits
+            for col_step, row_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_col = col + col_step * (length - 1)
+                end_row = row + row_step * (length - 1)
+                if not (0 <= end_col < columns and 0 <= end_row < rows):
+                    continue
+                mask = 0
+                for step in range(length):
+                    mask |= 1 << ((col + col_step * step) * height + row + row_step * step)
+                masks.append(mask)
+    return tuple(masks)
+
+
+@lru_cache(maxsize=None)
+def column_mask(rows: int, columns: int, col: int) -> int:
+    """Returns the mask of every cell of column `col`."""
+    return ((1 << rows) - 1) << (col * (rows + 1))
+
+
+@lru_cache(maxsize=None)
+def row_parity_mask(rows: int, columns: int, odd: bool) -> int:
+    """Returns the mask of every cell on the odd rows (the 1st, 3rd, 5th... from the
+    bottom), or on the even rows if `odd` is False."""
+
+    height = rows + 1
+    mask = 0
+    for col in range(columns):
+        for row in range(0 if odd else 1, rows, 2):
+            mask |= 1 << (col * height + row)
+    return mask
@@ -0,0 +1,21 @@
+"""Location of the files TextualGames caches on disk. \n
+
+Everything goes in one directory: $TEXTUAL_GAMES_CACHE if it is set, else
+textual-games inside $XDG_CACHE_HOME (or ~/.cache)."""
+
+from __future__ import annotations
+from pathlib import Path
+import os
+
+
+def cache_dir() -> Path:
+    """Returns the cache directory, creating it if needed."""
+
+    path = os.environ.get("TEXTUAL_GAMES_CACHE")
+    if path:
+        directory = Path(path)
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+        directory = Path(base) / "textual-games"
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
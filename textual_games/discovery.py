@@ -0,0 +1,240 @@
+"""Game discovery without importing the game modules. \n
+
+The GameLoader used to import every game script at startup, and with it every
+dependency of every game. Instead, each script is parsed with `ast` to read the
+game's metadata: the class its loader() returns, the class's game_name, and
+whether the class implements the members GameBase requires. The script is only
+imported when its game is selected.
+
+The metadata of every script is cached in a manifest file in the cache directory,
+keyed by file path, modification time and size. At startup an unchanged script
+costs one stat call, so discovery stays cheap as games directories grow."""
+
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, TYPE_CHECKING
+import json
+import os
+
+from textual_games.cache import cache_dir
+
+if TYPE_CHECKING:
+    import ast          # slow to import. Only needed when a script has changed.
+
+
+class GameInfo:
+
+    def __init__(
+            self,
+            game_name: str | None,
+            class_name: str | None,
+            module_name: str,
+            path: str,
+            missing_members: list[str] | None = None,
+        ):
+        """ | Arg             | Description
+            |-----------------|-------------
+            | game_name       | - Name shown in the games menu. None if it could not be read without
+            |                 |   importing the script (then the GameLoader imports it at discovery).
+            | class_name      | - The class returned by the script's loader()
+            | module_name     | - Name the script is imported under
+            | path            | - Path of the script
+            | missing_members | - Required GameBase members the class does not implement.
+            |                 |   None if that can't be known without importing the script. """
+
+        self.game_name = game_name
+        self.class_name = class_name
+        self.module_name = module_name
+        self.path = path
+        self.missing_members = missing_members
+
+    def __repr__(self) -> str:
+        return f"GameInfo({self.game_name!r}, {self.class_name!r}, {self.path!r})"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "game_name": self.game_name,
+            "class_name": self.class_name,
+            "module_name": self.module_name,
+            "path": self.path,
+            "missing_members": self.missing_members,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> GameInfo:
+        return cls(
+            data["game_name"],
+            data["class_name"],
+            data["module_name"],
+            data["path"],
+            data["missing_members"],
+        )
+
+
+#* Called by: GameManifest.game_info
+def read_game_info(path: str, module_name: str, required_members: list[str]) -> GameInfo | None:
+    """Reads a game script's metadata from its syntax tree, without running it.
+    Returns None if the script has no loader function (it is not a playable game).
+
+    Raises SyntaxError if the script can't be parsed."""
+
+    import ast
+
+    with open(path, "rb") as file:
+        tree = ast.parse(file.read(), filename=path)
+
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    loader = next(
+        (node for node in tree.body if isinstance(node, ast.FunctionDef) and node.name == "loader"),
+        None,
+    )
+    if loader is None:
+        return None
+
+    # Only `return SomeClass` can be read statically. Anything else is left to the import.
+    returns = [node for node in ast.walk(loader) if isinstance(node, ast.Return)]
+    if len(returns) != 1 or not isinstance(returns[0].value, ast.Name):
+        return GameInfo(None, None, module_name, path)
+    class_name = returns[0].value.id
+    if class_name not in classes:
+        return GameInfo(None, class_name, module_name, path)
+
+    members, complete = class_members(class_name, classes)
+    game_name = members.get("game_name")
+    if not isinstance(game_name, str):
+        game_name = None
+    missing_members = None
+    if complete:
+        missing_members = [member for member in required_members if member not in members]
+    return GameInfo(game_name, class_name, module_name, path, missing_members)
+
+
+#* Called by: read_game_info
+def class_members(class_name: str, classes: dict[str, ast.ClassDef]) -> tuple[dict[str, Any], bool]:
+    """Names defined by a class and by its bases in the same script. Names assigned a
+    string constant map to the string, the others to True.
+
+        Returns:
+            tuple: the members, and False if some base class is imported from another
+            module (other than GameBase, which defines none of the required members)."""
+
+    import ast
+
+    members: dict[str, Any] = {}
+    complete = True
+    node = classes[class_name]
+    for base in node.bases:
+        name = base.id if isinstance(base, ast.Name) else None
+        if name in classes and name != class_name:
+            base_members, base_complete = class_members(name, classes)
+            members.update(base_members)
+            complete = complete and base_complete
+        elif name != "GameBase":
+            complete = False
+
+    for statement in node.body:
+        if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            members[statement.name] = True
+            continue
+        if isinstance(statement, ast.Assign):
+            targets, value = statement.targets, statement.value
+        elif isinstance(statement, ast.AnnAssign) and statement.value is not None:
+            targets, value = [statement.target], statement.value
+        else:
+            continue
+        is_string = isinstance(value, ast.Constant) and isinstance(value.value, str)
+        for target in targets:
+            if isinstance(target, ast.Name):
+                members[target.id] = value.value if is_string else True
+    return members, complete
+
+
+class GameManifest:
+
+    FILE_NAME = "games-manifest.json"
+    VERSION = 1
+
+    def __init__(self, path: str | Path | None = None):
+        """ | Arg  | Description
+            |------|-------------
+            | path | - Manifest file. Defaults to games-manifest.json in the cache directory. """
+
+        self.path = Path(path) if path is not None else None
+        self.entries: dict[str, dict[str, Any]] = {}       # script path -> stat key and metadata
+        self.changed = False
+        self.load()
+
+    def load(self):
+        """Reads the manifest file. A missing, unreadable or outdated one is ignored."""
+
+        try:
+            if self.path is None:
+                self.path = cache_dir() / self.FILE_NAME
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == self.VERSION:
+            self.entries = data.get("files", {})
+
+    #* Called by: GameLoader.discover_games
+    def game_info(self, path: str, module_name: str, required_members: list[str]) -> GameInfo | None:
+        """Returns the script's metadata from the manifest if the script is unchanged,
+        else reads it from the script and updates the manifest.
+
+        Raises OSError or SyntaxError if the script can't be read."""
+
+        stat = os.stat(path)
+        key = [stat.st_mtime_ns, stat.st_size]
+        entry = self.entries.get(path)
+        if (
+            entry is not None
+            and entry.get("stat") == key
+            and entry.get("module_name") == module_name
+            and entry.get("required_members") == required_members
+        ):
+            return GameInfo.from_dict(entry["game"]) if entry["game"] is not None else None
+
+        info = read_game_info(path, module_name, required_members)
+        self.entries[path] = {
+            "stat": key,
+            "module_name": module_name,
+            "required_members": required_members,
+            "game": info.to_dict() if info is not None else None,
+        }
+        self.changed = True
+        return info
+
+    #* Called by: GameLoader.discover_games
+    def update(self, info: GameInfo):
+        """Stores metadata found by importing the script, so the next discovery doesn't have to."""
+
+        entry = self.entries.get(info.path)
+        if entry is not None:
+            entry["game"] = info.to_dict()
+            self.changed = True
+
+    #* Called by: GameLoader.discover_games
+    def forget_missing(self, paths: set[str]):
+        """Drops the entries of scripts that were not seen in this discovery."""
+
+        for path in list(self.entries):
+            if path not in paths:
+                del self.entries[path]
+                self.changed = True
+
+    #* Called by: GameLoader.discover_games
+    def save(self):
+        """Writes the manifest if anything changed. The cache is optional, so a
+        directory that can't be written to is not an error."""
+
+        if not self.changed or self.path is None:
+            return
+        temporary = self.path.with_suffix(self.path.suffix + ".tmp")
+        try:
+            with open(temporary, "w", encoding="utf-8") as file:
+                json.dump({"version": self.VERSION, "files": self.entries}, file, indent=1)
+            temporary.replace(self.path)     # never leave a half-written manifest
+        except OSError:
+            return
+        self.changed = False
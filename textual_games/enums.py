@@ -9,4 +9,38 @@ class PlayerState(Enum):
 
 class GridFocusMode(Enum):
     ALL = 0
-    POSSIBLE_MOVES = 1
\ No newline at end of file
+    POSSIBLE_MOVES = 1
+
+class Bound(Enum):
+    """How a score stored in the transposition table relates to the true score. \n
+    EXACT: the true score. LOWER: the true score is at least this (beta cutoff).
+    UPPER: the true score is at most this (no move raised alpha)."""
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+class Replacement(Enum):
+    """Replacement scheme used by the transposition table when it is full."""
+    DEPTH = 0
+    LRU = 1
+
+class SearchAlgorithm(Enum):
+    """Alpha-beta variant used by the SearchEngine. \n
+    MINIMAX: separate maximizing and minimizing branches, full window.
+    NEGAMAX: negamax with principal-variation search and aspiration windows."""
+    MINIMAX = 0
+    NEGAMAX = 1
+
+class MoveSource(Enum):
+    """Where the AI's last move came from."""
+    SEARCH = 0
+    BOOK = 1
+    PONDER = 2
+
+class SudokuDifficulty(Enum):
+    """How hard a generated Sudoku is. The value is the share of cells given as clues. \n
+    EASY and MEDIUM puzzles can be solved with naked and hidden singles alone.
+    HARD puzzles have fewer clues and may need guessing (only the solution is unique)."""
+    EASY = 0.5
+    MEDIUM = 0.4
+    HARD = 0.3
@@ -2,33 +2,71 @@
 
 # from abc import ABC, abstractmethod
 from __future__ import annotations
+from typing import TYPE_CHECKING
 
 from textual.message import Message
 from textual.widget import Widget
 
+from textual_games.rules import GameRules
+from textual_games.enums import SearchAlgorithm
+
+if TYPE_CHECKING:
+    from textual_games.grid import Grid
+
 # from textual_games.enums import PlayerState
 
 
 class GameBase(Widget):
 
+    rules_class: type[GameRules]
+    """The game's GameRules subclass: board, legal moves, apply/undo and terminal check."""
+
+    rules: GameRules
+    """Instance of rules_class. Games create it in compose, once the board size is known.
+    The GameManager and the AI search only ever talk to this, never to the widget."""
+
+    line_grid: bool = False
+    """Draw the board with a LineGrid (one widget, rendered with the Line API) instead of
+    a Grid of Cell widgets. Games opt in by building their grid with self.grid_class.
+    TextualGames sets it on the game instance when started with --line-grid."""
+
+    @property
+    def grid_class(self) -> type[Grid]:
+        "Grid or LineGrid, the class the game should build its grid with."
+
+        from textual_games.grid import Grid, LineGrid       # grid imports manager, which imports this module
+        return LineGrid if self.line_grid else Grid
+
+    required_members = {
+        "rules_class": "attribute",
+        "game_name": "attribute",
+        "restart": "method",
+        "update_UI_state": "method",
+        "clear_focus": "method",
+    }
+    """The contract every game class must implement. The GameLoader also checks it
+    statically, before the game's script is imported."""
+
     def validate_interface(game: GameBase):
-        """Validates if a game class implements the required contract."""
-
-        required_members = {
-            "calculate_winner": "method",
-            "game_name": "attribute",
-            "restart": "method",
-            "get_possible_moves": "method",
-            "update_UI_state": "method",
-            "clear_focus": "method",
-        }
-            
-        for member, kind in required_members.items():
+        """Validates if a game class implements the required contract. \n
+        evaluate(board, player) on the rules class is optional (GameRules scores every
+        position as a draw), but an override must take those two arguments."""
+
+        for member, kind in GameBase.required_members.items():
             try:
                 getattr(game, member)
             except AttributeError:
                 raise NotImplementedError(f"{game.__name__} must implement {member} ({kind}).")
 
+        from inspect import signature       # only needed once per game, when it is loaded
+        evaluate = getattr(game.rules_class, "evaluate", None)
+        try:
+            signature(evaluate).bind(None, None, None)      # self, board, player
+        except (TypeError, ValueError):
+            raise NotImplementedError(
+                f"{game.__name__}.rules_class.evaluate must be a method taking (board, player)."
+            )
+
     class StartGame(Message):
         """Posted when a game is either mounted or restarted. \n
         Handled by start_game in TextualGames class."""
@@ -39,10 +77,26 @@ class GameBase(Widget):
                 rows: int,
                 columns: int,
                 max_depth: int,
+                time_budget: float | None = None,
+                node_budget: int | None = None,
+                search_algorithm: SearchAlgorithm = SearchAlgorithm.MINIMAX,
             ):
+            """ | Arg         | Description
+                |-------------|-------------
+                | game        | - The game instance
+                | rows        | - The number of rows on the board
+                | columns     | - The number of columns on the board
+                | max_depth   | - The deepest iteration the AI search may reach
+                | time_budget | - Seconds the AI may think per move (None for no limit)
+                | node_budget | - Nodes the AI may search per move (None for no limit)
+                | search_algorithm | - MINIMAX, or NEGAMAX (principal-variation search with aspiration windows) """
+
             super().__init__()
             self.game = game
             self.rows = rows
             self.columns = columns
             self.max_depth = max_depth
+            self.time_budget = time_budget
+            self.node_budget = node_budget
+            self.search_algorithm = search_algorithm
 
@@ -7,9 +7,14 @@ from textual.app import on
 from textual.containers import Container, Horizontal
 from textual.widgets import Button
 
+from functools import cached_property
+
 from textual_games.game import GameBase
-from textual_games.grid import Grid, GridFocusMode
-from textual_games.enums import PlayerState
+from textual_games.rules import GameRules
+from textual_games.kernel import LineKernel, numpy_available
+from textual_games.bitboard import BitBoard, line_masks, column_mask, row_parity_mask
+from textual_games.grid import GridFocusMode
+from textual_games.enums import PlayerState, SearchAlgorithm
 
 
 def loader():
@@ -17,17 +22,160 @@ def loader():
     return ConnectFour
         
 
+class ConnectFourRules(GameRules):
+    """Connect Four is played on a BitBoard. A 2D integer board can be converted
+    with BitBoard.from_list before it is handed to the rules."""
+
+    opening_book = "connectfour.book"
+    streak = 4                          # pieces in a row to win. Variants can change it.
+
+    LINE_WEIGHTS = (0, 1, 4, 32, 0)     # by the number of one player's pieces in a line of four
+                                        # (evaluate and evaluate_moves assume a streak of 4)
+    CENTER_WEIGHT = 6                   # per piece in the center column
+    THREAT_WEIGHT = 48                  # per threat on the rows that favor its owner
+
+    def new_board(self) -> BitBoard:
+        return BitBoard(self.rows, self.columns)
+
+    def copy_board(self, board: BitBoard) -> BitBoard:
+        return board.copy()
+
+    def is_empty(self, board: BitBoard, row: int, col: int) -> bool:
+        landing_row = board.landing_row(col)
+        return landing_row is not None and row == landing_row      # only the cell a piece would land on
+
+    def apply_move(self, board: BitBoard, move: tuple[int, int], player: int):
+        board.play(move[1], player)         # gravity decides the row
+
+    def undo_move(self, board: BitBoard, move: tuple[int, int], player: int):
+        board.undo(move[1], player)
+
+    # NOTE: This will run in a thread (or worker process) when called by the search
+    #* Called by: SearchEngine.minimax, GameManager.get_possible_moves
+    def get_possible_moves(self, board: BitBoard) -> list[tuple[int, int]]:
+        """Returns the landing cell of every column that is not full."""
+        return board.possible_moves()       # O(1) per column, no board scan
+
+    #* Called by: GameManager.place_piece
+    def landing_row(self, board: BitBoard, col: int) -> int | None:
+        return board.landing_row(col)
+
+    #* Called by: MoveOrderer.order
+    def move_priority(self, move: tuple[int, int]) -> int:
+        """Center columns first. They take part in the most four-in-a-rows."""
+        return -abs(2 * move[1] - (self.columns - 1))
+
+    # NOTE: This will run in a thread (or worker process) when called by the search
+    #* Called by: SearchEngine.evaluate
+    def evaluate(self, board: BitBoard, player: int) -> int:
+        """Scores the position for `player` from three things:
+        - lines of four that only one player has pieces in, more pieces being worth more
+        - pieces in the center column, which is part of the most lines
+        - threats (empty cells that would complete a four) on the rows that favor their
+          owner: odd rows counted from the bottom for the first player, even rows for
+          the second. Those are the threats the end of the game usually lets them fill."""
+
+        mine, theirs = board.boards[player], board.boards[3 - player]
+        weights = self.LINE_WEIGHTS
+
+        score = 0
+        my_threats = their_threats = 0
+        for mask in line_masks(board.rows, board.columns):
+            my_bits = mine & mask
+            their_bits = theirs & mask
+            if not their_bits:
+                if my_bits:
+                    count = my_bits.bit_count()
+                    score += weights[count]
+                    if count == 3:
+                        my_threats |= mask ^ my_bits
+            elif not my_bits:
+                count = their_bits.bit_count()
+                score -= weights[count]
+                if count == 3:
+                    their_threats |= mask ^ their_bits
+
+        center = column_mask(board.rows, board.columns, board.columns // 2)
+        score += self.CENTER_WEIGHT * ((mine & center).bit_count() - (theirs & center).bit_count())
+
+        odd_rows = row_parity_mask(board.rows, board.columns, True)
+        my_rows = odd_rows if player == 1 else ~odd_rows        # player 1 moves first
+        score += self.THREAT_WEIGHT * (
+            (my_threats & my_rows).bit_count() - (their_threats & ~my_rows).bit_count()
+        )
+        return score
+
+    @cached_property
+    def kernel(self) -> LineKernel | None:
+        "Vectorized line kernel with the weights of evaluate, or None without NumPy."
+
+        if not numpy_available():
+            return None
+        return LineKernel(self.rows, self.columns, len(self.LINE_WEIGHTS) - 1, self.LINE_WEIGHTS)
+
+    @cached_property
+    def odd_row_cells(self):
+        "Flat cell mask of the 1st, 3rd, 5th... rows from the bottom, for the kernel."
+
+        import numpy as np
+
+        from_bottom = self.rows - 1 - np.arange(self.rows * self.columns) // self.columns
+        return from_bottom % 2 == 0
+
+    # NOTE: This will run in a thread (or worker process) when called by the search
+    #* Called by: SearchEngine.order_root_moves
+    def evaluate_moves(self, board: BitBoard, moves: list[tuple[int, int]], player: int) -> list[int]:
+        """Scores all the moves in one batch with the kernel, if NumPy is installed.
+        Gives the same scores as evaluate() after each move."""
+
+        kernel = self.kernel
+        if kernel is None or not moves:
+            return super().evaluate_moves(board, moves, player)
+
+        children = kernel.children(board, moves, player)
+        codes = kernel.line_codes(children, player)
+        score = kernel.evaluate_batch(children, player, codes)
+
+        center = children.reshape(len(moves), self.rows, self.columns)[:, :, self.columns // 2]
+        score += self.CENTER_WEIGHT * ((center == player).sum(axis=1) - (center == 3 - player).sum(axis=1))
+
+        odd_rows = self.odd_row_cells
+        my_rows = odd_rows if player == 1 else ~odd_rows        # player 1 moves first
+        score += self.THREAT_WEIGHT * (
+            (kernel.threats(children, player, codes) & my_rows).sum(axis=1)
+            - (kernel.threats(children, 3 - player, kernel.opponent_codes(codes)) & ~my_rows).sum(axis=1)
+        )
+        return score.tolist()
+
+    # NOTE: This will run in a thread (or worker process) when called by the search
+    #* Called by: GameRules.check_result
+    def check_move(self, board: BitBoard, row: int, col: int, player: int) -> PlayerState | None:
+        """Returns the PlayerState of `player` if the piece just placed at (row, col) wins.
+        Draws are detected by the caller from the move counter."""
+
+        if board.is_win(player, self.streak):      # a handful of shifts, no need to look at the last move
+            return PlayerState.PLAYER1 if player == 1 else PlayerState.PLAYER2
+        return None
+
+    # NOTE: Scans the whole board. The AI search uses check_move instead.
+    def calculate_winner(self, board: BitBoard) -> PlayerState | None:
+        """Returns a PlayerState if the game is over, else returns None."""
+        return board.winner(self.streak)
+
+
 class ConnectFour(GameBase):
 
     game_name = "Connect Four"
+    rules_class = ConnectFourRules
 
     def compose(self):
 
         self.rows = 6
         self.columns = 7
+        self.rules = self.rules_class(self.rows, self.columns)
         focus_mode = GridFocusMode.POSSIBLE_MOVES   # intellisense wont work if inserting it down there directly.
 
-        self.grid = Grid(
+        self.grid = self.grid_class(
             rows=self.rows,
             columns=self.columns,
             grid_width=50,
@@ -48,7 +196,9 @@ class ConnectFour(GameBase):
             game = self,
             rows = self.rows,
             columns = self.columns,
-            max_depth = 7,
+            max_depth = self.rows * self.columns,   # iterative deepening stops at the time budget
+            time_budget = 1.0,
+            search_algorithm = SearchAlgorithm.NEGAMAX,
         ))
 
     #* Called by TextualGames.start_game, TextualGames.restart
@@ -62,68 +212,3 @@ class ConnectFour(GameBase):
     #* Called by: game_over in TextualGames class.
     def clear_focus(self):
         self.grid.clear_focus()
-
-
-    # NOTE: This will run in a thread when called by minimax
-    #* Called by GameManager.minimax, Grid.focus_cell
-    def get_possible_moves(self, board) -> list[tuple[int, int]]:
-        """Returns a list of tuples representing coordinates of empty cells."""
-
-        possible_moves = []
-
-        # This system here basically represents gravity.
-        for col in range(self.columns):
-            for row in range(self.rows):
-                if row != self.rows-1:                      # if not last row:
-                    if board[row+1][col] == 0:         # is row below empty?
-                        continue
-                    else:
-                        if board[row][col] == 0:
-                            possible_moves.append((row, col))
-                        break
-                else:                                    
-                    possible_moves.append((row, col))       # it should only get here if column is empty
-
-        return possible_moves
-
-    #* Called by: calculate_winner in TextualGames class.
-    def calculate_winner(self, board: list[list[int]]) -> PlayerState | None:
-        """Returns a PlayerState if the game is over, else returns None."""
-
-        rows = len(board)
-        cols = len(board[0])
-        streak_to_win = 4
-
-        lines = []                           # Pre-calculate all possible lines
-        lines.extend(board)                                                                 # Add all rows
-        lines.extend([[board[row][col] for row in range(rows)] for col in range(cols)])     # Add all columns
-
-        for row in range(rows):              # Add all diagonals (main and anti)
-            for col in range(cols):
-
-                # Main diagonal (top-left to bottom-right)
-                if row <= rows - streak_to_win and col <= cols - streak_to_win:
-                    lines.append([board[row + i][col + i] for i in range(streak_to_win)])
-                
-                # Anti-diagonal (top-right to bottom-left)
-                if row <= rows - streak_to_win and col >= streak_to_win - 1:
-                    lines.append([board[row + i][col - i] for i in range(streak_to_win)])
-
-        def check_line(line: list[int], player: int) -> bool:
-            """Checks if a line contains 4 consecutive pieces of the same player."""
-            count = 0
-            for cell in line:
-                count = count + 1 if cell == player else 0
-                if count == streak_to_win:
-                    return True
-            return False
-    
-        for player in (1, 2):
-            if any(check_line(line, player) for line in lines):     # Check for winner
-                return PlayerState.PLAYER1 if player == 1 else PlayerState.PLAYER2
-
-        if all(cell != 0 for row in board for cell in row):         # Check for draw
-            return PlayerState.EMPTY
-
-        return None         # game not over yet
-
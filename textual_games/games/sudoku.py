@@ -4,8 +4,6 @@ UNFINISHED"""
 
 from __future__ import annotations
 import random
-import sys
-from sudoku import Sudoku               # default 3 x 3 sub-grid, half of the cells empty
 
 # Textual imports
 from textual.app import on
@@ -14,36 +12,274 @@ from textual.widgets import Button
 
 from textual_games.game import GameBase
 from textual_games.grid import Grid
-from textual_games.enums import PlayerState
+from textual_games.enums import PlayerState, SudokuDifficulty
 
 
 # def loader():
 #     """Required function that returns the game's main widget"""
-#     return Sudoku
-        
+#     return SudokuTextual
 
-class SudokuTextual(GameBase):     #* Due to name conflict with Sudoku library, naming is necessary.
+
+class SudokuSolver:
+    """Constraint propagation solver with bitmask candidate sets. \n
+
+    Every cell keeps its candidates as a bitmask (bit d - 1 for digit d). Placing a
+    digit removes it from the cell's peers, and a peer left with one candidate is
+    placed in turn (naked singles). A digit that fits in only one cell of a row,
+    column or box is placed there (hidden singles). When propagation gets stuck,
+    the cell with the fewest candidates is guessed and the search backtracks (MRV).
+
+    Boards are 2D integer boards, 0 for an empty cell."""
+
+    def __init__(self, box: int = 3):
+        """ | Arg | Description
+            |-----|-------------
+            | box | - Side of a box. 3 for the usual 9x9 Sudoku. """
+
+        self.box = box
+        self.size = box * box
+        self.cells = self.size * self.size
+        self.all_digits = (1 << self.size) - 1
+        self.guesses = 0            # of the last solve, a measure of how hard the puzzle is
+
+        size = self.size
+        rows = [[row * size + col for col in range(size)] for row in range(size)]
+        columns = [[row * size + col for row in range(size)] for col in range(size)]
+        boxes = [
+            [(box_row * box + row) * size + box_col * box + col for row in range(box) for col in range(box)]
+            for box_row in range(box)
+            for box_col in range(box)
+        ]
+        self.units = rows + columns + boxes
+        peers: list[set[int]] = [set() for _ in range(self.cells)]
+        for unit in self.units:
+            for cell in unit:
+                peers[cell].update(unit)
+        self.peers = [sorted(cell_peers - {cell}) for cell, cell_peers in enumerate(peers)]
+
+    #* Called by: self.initial_candidates, self.hidden_singles, self.search
+    def assign(self, candidates: list[int], cell: int, bit: int) -> bool:
+        """Places the digit `bit` in `cell` and propagates naked singles.
+        Returns False if that contradicts the board."""
+
+        stack = [(cell, bit)]
+        while stack:
+            cell, bit = stack.pop()
+            if not candidates[cell] & bit:
+                return False
+            candidates[cell] = bit
+            for peer in self.peers[cell]:
+                peer_candidates = candidates[peer]
+                if peer_candidates & bit:
+                    peer_candidates &= ~bit
+                    if not peer_candidates:
+                        return False
+                    candidates[peer] = peer_candidates
+                    if not peer_candidates & (peer_candidates - 1):     # one candidate left
+                        stack.append((peer, peer_candidates))
+        return True
+
+    #* Called by: self.propagate
+    def hidden_singles(self, candidates: list[int]) -> bool | None:
+        """Places every digit that fits in only one cell of a unit.
+
+            Returns:
+                True if anything was placed, False if nothing was, None on a contradiction"""
+
+        placed = False
+        for unit in self.units:
+            once = twice = 0
+            for cell in unit:
+                cell_candidates = candidates[cell]
+                twice |= once & cell_candidates
+                once |= cell_candidates
+            if once != self.all_digits:
+                return None         # some digit fits nowhere in this unit
+            singles = once & ~twice
+            while singles:
+                bit = singles & -singles
+                singles ^= bit
+                for cell in unit:
+                    if candidates[cell] & bit:
+                        if candidates[cell] != bit:
+                            if not self.assign(candidates, cell, bit):
+                                return None
+                            placed = True
+                        break
+        return placed
+
+    #* Called by: self.initial_candidates, self.search
+    def propagate(self, candidates: list[int]) -> bool:
+        "Applies hidden singles until nothing changes. Returns False on a contradiction."
+
+        while True:
+            placed = self.hidden_singles(candidates)
+            if placed is None:
+                return False
+            if not placed:
+                return True
+
+    #* Called by: self.solve, self.solve_by_singles
+    def initial_candidates(self, board: list[list[int]]) -> list[int] | None:
+        "Candidates of every cell after placing the clues and propagating, or None if the board is invalid."
+
+        candidates = [self.all_digits] * self.cells
+        for row in range(self.size):
+            for col in range(self.size):
+                digit = board[row][col]
+                if digit and not self.assign(candidates, row * self.size + col, 1 << (digit - 1)):
+                    return None
+        return candidates if self.propagate(candidates) else None
+
+    #* Called by: self.solve
+    def search(self, candidates: list[int], solutions: list[list[int]], limit: int, rng: random.Random | None):
+
+        best_cell, best_count = None, self.size + 1
+        for cell, cell_candidates in enumerate(candidates):
+            if cell_candidates & (cell_candidates - 1):
+                count = cell_candidates.bit_count()
+                if count < best_count:
+                    best_cell, best_count = cell, count
+                    if count == 2:
+                        break
+        if best_cell is None:
+            solutions.append(candidates)        # every cell has one candidate
+            return
+
+        bits = []
+        cell_candidates = candidates[best_cell]
+        while cell_candidates:
+            bit = cell_candidates & -cell_candidates
+            cell_candidates ^= bit
+            bits.append(bit)
+        if rng is not None:
+            rng.shuffle(bits)
+
+        for bit in bits:
+            self.guesses += 1
+            child = candidates.copy()
+            if self.assign(child, best_cell, bit) and self.propagate(child):
+                self.search(child, solutions, limit, rng)
+                if len(solutions) >= limit:
+                    return
+
+    def solve(self, board: list[list[int]], limit: int = 1, rng: random.Random | None = None) -> list[list[list[int]]]:
+        """Returns up to `limit` solutions of the board (none if it has no solution).
+        `rng` shuffles the order guesses are tried in, to get a random solution."""
+
+        self.guesses = 0
+        candidates = self.initial_candidates(board)
+        if candidates is None:
+            return []
+        solutions: list[list[int]] = []
+        self.search(candidates, solutions, limit, rng)
+        return [self.to_board(solution) for solution in solutions]
+
+    def count_solutions(self, board: list[list[int]], limit: int = 2) -> int:
+        """Counts the solutions of the board, stopping at `limit`."""
+        return len(self.solve(board, limit))
+
+    def is_unique(self, board: list[list[int]]) -> bool:
+        return self.count_solutions(board, 2) == 1
+
+    def solve_by_singles(self, board: list[list[int]]) -> list[list[int]] | None:
+        """Returns the solution if naked and hidden singles alone reach it, else None.
+        A board solved this way has exactly one solution."""
+
+        candidates = self.initial_candidates(board)
+        if candidates is None or any(bits & (bits - 1) for bits in candidates):
+            return None
+        return self.to_board(candidates)
+
+    def to_board(self, candidates: list[int]) -> list[list[int]]:
+        "Converts solved candidates (one bit per cell) to a 2D integer board."
+
+        digits = [bits.bit_length() for bits in candidates]
+        return [digits[row * self.size:(row + 1) * self.size] for row in range(self.size)]
+
+
+class SudokuGenerator:
+    """Makes puzzles by solving an empty board in a random order, then removing clues
+    (in pairs, symmetric about the center) as long as the solution stays unique.
+    Every cell is tried once, so generating costs at most one solver call per cell.
+    There is no retry loop."""
+
+    def __init__(self, box: int = 3, seed: int | None = None):
+        """ | Arg  | Description
+            |------|-------------
+            | box  | - Side of a box. 3 for the usual 9x9 Sudoku.
+            | seed | - Seed for the random generator. None for a different puzzle every time. """
+
+        self.solver = SudokuSolver(box)
+        self.random = random.Random(seed)
+
+    def full_board(self) -> list[list[int]]:
+        "Returns a random solved board."
+
+        size = self.solver.size
+        return self.solver.solve([[0] * size for _ in range(size)], 1, self.random)[0]
+
+    def generate(self, difficulty: SudokuDifficulty = SudokuDifficulty.MEDIUM) -> tuple[list[list[int]], list[list[int]]]:
+        """Returns a puzzle with a unique solution, and the solution. \n
+        EASY and MEDIUM puzzles stay solvable by singles alone. HARD ones only have to
+        stay unique, so they can get down to fewer clues. Either way, removal stops
+        at the difficulty's share of clues, or when no more clues can be removed."""
+
+        solver = self.solver
+        size = solver.size
+        solution = self.full_board()
+        puzzle = [row.copy() for row in solution]
+        target = round(solver.cells * difficulty.value)
+        clues = solver.cells
+
+        order = list(range(solver.cells))
+        self.random.shuffle(order)
+        for cell in order:
+            if clues <= target:
+                break
+            mirror = solver.cells - 1 - cell
+            pair = [cell] if mirror == cell else [cell, mirror]
+            pair = [index for index in pair if puzzle[index // size][index % size]]
+            if not pair:
+                continue        # removed already, as the mirror of another cell
+            for index in pair:
+                puzzle[index // size][index % size] = 0
+
+            if difficulty == SudokuDifficulty.HARD:
+                keep = solver.is_unique(puzzle)
+            else:
+                keep = solver.solve_by_singles(puzzle) is not None
+            if keep:
+                clues -= len(pair)
+            else:
+                for index in pair:
+                    puzzle[index // size][index % size] = solution[index // size][index % size]
+
+        return puzzle, solution
+
+
+class SudokuTextual(GameBase):
 
     game_name = "Sudoku"
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, difficulty: SudokuDifficulty = SudokuDifficulty.MEDIUM, **kwargs):
         super().__init__(*args, **kwargs)
         self.grid = None
-
-        seed = random.randrange(sys.maxsize)
-        puzzle = Sudoku(3, seed=seed).difficulty(0.7)
+        self.generator = SudokuGenerator()
+        self.difficulty = difficulty
+        self.puzzle, self.solution = self.generator.generate(difficulty)
 
         self.grid = Grid(
             rows=6,
             columns=7,
             grid_width=50,
             grid_height=19,
-            grid_gutter=0, 
+            grid_gutter=0,
             player1_color="red",
             player2_color="yellow",
             cell_size=3,
             classes="grid onefr"
-        )  
+        )
 
 
     def compose(self):
@@ -67,18 +303,8 @@ class SudokuTextual(GameBase):     #* Due to name conflict with Sudoku library,
         ))
 
     def setup_game(self):
-
-        invalids = 0
-        while True:
-
-            # puzzle.show()
-            # solution = puzzle.solve()
-            puzzle.show_full()
-            if puzzle.get_difficulty() < 0:
-                invalids += 1
-            else:
-                break
-        print(f"Invalids: {invalids}")
+        "Deals a new puzzle. Takes milliseconds, so it is fine on the UI thread."
+        self.puzzle, self.solution = self.generator.generate(self.difficulty)
 
 
     #* Called by: calculate_winner in TextualGames class.
@@ -86,5 +312,3 @@ class SudokuTextual(GameBase):     #* Due to name conflict with Sudoku library,
         """Returns a PlayerState if the game is over, else returns None."""
 
         pass
-    
-
@@ -1,5 +1,10 @@
 """Tic-Tac-Toe game script for TextualGames"""
 
+from __future__ import annotations
+from functools import cached_property
+from pathlib import Path
+import struct
+
 # Textual imports
 # from textual.app import on
 from textual.containers import Container
@@ -7,8 +12,9 @@ from textual.containers import Container
 
 # TextualGames imports
 from textual_games.game import GameBase
-from textual_games.grid import Grid
-from textual_games.enums import PlayerState
+from textual_games.rules import GameRules
+from textual_games.enums import PlayerState, SearchAlgorithm
+from textual_games.cache import cache_dir
 
 # NOTE: whitespace is important here:
 x_token = r"""
@@ -23,16 +29,295 @@ def loader():
     return TicTacToe
 
         
+class TicTacToeRules(GameRules):
+
+    opening_book = "tictactoe.table"
+
+    #* Called by: GameManager.get_opening_book
+    def load_opening_book(self) -> TicTacToeTable | None:
+        """Tic-Tac-Toe is small enough to solve completely, so its book is a table of
+        perfect moves for every position, built once and then loaded from the cache.
+        Building it takes a moment, so GameManager calls this from a thread."""
+
+        if (self.rows, self.columns) != (3, 3):
+            return None
+        try:
+            path = cache_dir() / self.opening_book
+        except OSError:
+            return None         # no cache directory. The AI searches instead.
+        return TicTacToeTable.load(path, self)
+
+    # NOTE: This will run in a thread (or worker process) when called by the search
+    #* Called by: SearchEngine.minimax, GameManager.get_possible_moves
+    def get_possible_moves(self, board) -> list[tuple[int, int]]:
+
+        possible_moves = []
+        
+        for row in range(self.rows):
+            for col in range(self.columns):
+                if board[row][col] == 0:
+                    possible_moves.append((row, col))
+
+        return possible_moves
+
+    #* Called by: MoveOrderer.order
+    def move_priority(self, move: tuple[int, int]) -> int:
+        """Number of winning lines through the cell: center 4, corners 3, edges 2."""
+
+        row, col = move
+        lines = 2                                       # its row and its column
+        if row == col:
+            lines += 1                                  # main diagonal
+        if row + col == self.columns - 1:
+            lines += 1                                  # anti-diagonal
+        return lines
+
+    @cached_property
+    def lines(self) -> list[list[tuple[int, int]]]:
+        "Every row, column and diagonal of the board."
+
+        lines = [[(row, col) for col in range(self.columns)] for row in range(self.rows)]
+        lines += [[(row, col) for row in range(self.rows)] for col in range(self.columns)]
+        lines.append([(i, i) for i in range(self.rows)])
+        lines.append([(i, self.columns - 1 - i) for i in range(self.rows)])
+        return lines
+
+    # NOTE: This will run in a thread (or worker process) when called by the search
+    #* Called by: SearchEngine.evaluate
+    def evaluate(self, board: list[list[int]], player: int) -> int:
+        """Counts the lines that only one player has pieces in, each worth 4 per piece
+        squared. 3x3 is searched to the end (or played from the table), so this only
+        matters on larger boards."""
+
+        score = 0
+        for line in self.lines:
+            mine = theirs = 0
+            for row, col in line:
+                cell = board[row][col]
+                if cell == player:
+                    mine += 1
+                elif cell:
+                    theirs += 1
+            if not theirs:
+                score += 4 * mine * mine
+            elif not mine:
+                score -= 4 * theirs * theirs
+        return score
+
+    # NOTE: This will run in a thread (or worker process) when called by the search
+    #* Called by: GameRules.check_result
+    def check_move(self, board: list[list[int]], row: int, col: int, player: int) -> PlayerState | None:
+        """Returns the PlayerState of `player` if the piece just placed at (row, col) wins.
+        Draws are detected by the caller from the move counter."""
+
+        if self.streak_through(board, row, col, player, self.rows):
+            return PlayerState.PLAYER1 if player == 1 else PlayerState.PLAYER2
+        return None
+
+    # NOTE: Scans the whole board. The AI search uses check_move instead.
+    def calculate_winner(self, board: list[list[int]]) -> PlayerState | None:
+        """Returns a PlayerState if game is over, else returns None."""
+
+        rows      = board
+        columns   = list(zip(*board))
+        main_diag = [[board[i][i] for i in range(self.rows)]]
+        anti_diag = [[board[i][self.columns - i - 1] for i in range(self.rows)]]
+
+        # Combine all possible lines into a single list
+        lines = (rows + columns + main_diag + anti_diag)
+
+        def check_line(line, player):
+            return all(cell == player for cell in line)
+        
+        for player in (1, 2):
+            if any(check_line(line, player) for line in lines):     # Check for winner
+                return PlayerState.PLAYER1 if player == 1 else PlayerState.PLAYER2
+
+        if all(cell != 0 for row in board for cell in row):         # Check for draw
+            return PlayerState.EMPTY
+        
+        return None        # game not over yet
+
+
+class TicTacToeTable:
+    """Perfect move and score of every Tic-Tac-Toe position, by retrograde analysis. \n
+
+    Positions are indexed in base 3 (cell i is digit i, 0 = empty). Only one of each
+    group of up to 8 symmetric positions (rotations and reflections) is stored: the
+    one with the smallest index. Scores are from the point of view of the player to
+    move: 10 - plies for a win, 0 for a draw. (Smaller than the search's scale, to
+    fit a byte.)"""
+
+    MAGIC = b"TTTT"
+    VERSION = 1
+    HEADER = struct.Struct("<4sBxxxI")      # magic, version, (pad), record count
+    RECORD = struct.Struct("<HBb")          # canonical board index, cell, score
+
+    # SYMMETRIES[s][i] is the cell that moves to cell i under symmetry s.
+    SYMMETRIES = [
+        (0, 1, 2, 3, 4, 5, 6, 7, 8),        # identity
+        (6, 3, 0, 7, 4, 1, 8, 5, 2),        # rotate 90
+        (8, 7, 6, 5, 4, 3, 2, 1, 0),        # rotate 180
+        (2, 5, 8, 1, 4, 7, 0, 3, 6),        # rotate 270
+        (2, 1, 0, 5, 4, 3, 8, 7, 6),        # mirror left-right
+        (6, 7, 8, 3, 4, 5, 0, 1, 2),        # mirror top-bottom
+        (0, 3, 6, 1, 4, 7, 2, 5, 8),        # main diagonal
+        (8, 5, 2, 7, 4, 1, 6, 3, 0),        # anti-diagonal
+    ]
+
+    def __init__(self, table: dict[int, tuple[int, int]]):
+        """ | Arg   | Description
+            |-------|-------------
+            | table | - canonical board index -> (cell, score), for every position that is not over """
+
+        self.table = table
+
+    @classmethod
+    def load(cls, path: Path, rules: TicTacToeRules) -> TicTacToeTable:
+        """Reads the table from `path`. If it is missing or unreadable, builds it and saves it there."""
+
+        try:
+            return cls.read(path)
+        except (OSError, ValueError, struct.error):
+            table = cls.build(rules)
+            try:
+                table.save(path)
+            except OSError:
+                pass            # still usable, it will just be built again next time
+            return table
+
+    @classmethod
+    def read(cls, path: Path) -> TicTacToeTable:
+
+        data = path.read_bytes()
+        magic, version, count = cls.HEADER.unpack_from(data, 0)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"{path} is not a version {cls.VERSION} Tic-Tac-Toe table.")
+        if len(data) != cls.HEADER.size + count * cls.RECORD.size:
+            raise ValueError(f"{path} is truncated.")
+        table = {
+            index: (cell, score)
+            for index, cell, score in cls.RECORD.iter_unpack(data[cls.HEADER.size:])
+        }
+        return cls(table)
+
+    def save(self, path: Path):
+
+        records = b"".join(
+            self.RECORD.pack(index, cell, score) for index, (cell, score) in sorted(self.table.items())
+        )
+        temporary = path.with_suffix(path.suffix + ".tmp")
+        temporary.write_bytes(self.HEADER.pack(self.MAGIC, self.VERSION, len(self.table)) + records)
+        temporary.replace(path)
+
+    @classmethod
+    def build(cls, rules: TicTacToeRules) -> TicTacToeTable:
+        """Retrograde analysis: collects every reachable position, then solves them
+        from the full board back to the empty one. Each position's children have one
+        more piece, so they are always solved first."""
+
+        positions: list[set[tuple[int, ...]]] = [set() for _ in range(10)]    # by number of pieces
+        positions[0].add((0,) * 9)
+        for pieces in range(9):
+            player = 1 if pieces % 2 == 0 else 2        # player 1 (X) moves first
+            for cells in positions[pieces]:
+                if cls.is_over(cells, rules) is not None:
+                    continue
+                for cell in range(9):
+                    if cells[cell] == 0:
+                        positions[pieces + 1].add(cells[:cell] + (player,) + cells[cell + 1:])
+
+        scores: dict[tuple[int, ...], int] = {}
+        table: dict[int, tuple[int, int]] = {}
+        priorities = [rules.move_priority(divmod(cell, 3)) for cell in range(9)]
+        cell_order = sorted(range(9), key=lambda cell: -priorities[cell])      # center, corners, edges
+
+        for pieces in range(9, -1, -1):
+            player = 1 if pieces % 2 == 0 else 2
+            for cells in positions[pieces]:
+                result = cls.is_over(cells, rules)
+                if result == PlayerState.EMPTY:
+                    scores[cells] = 0
+                    continue
+                elif result is not None:
+                    scores[cells] = -10             # the last move won, so the player to move lost
+                    continue
+
+                best_cell, best_score = None, -100
+                for cell in cell_order:
+                    if cells[cell] != 0:
+                        continue
+                    score = -scores[cells[:cell] + (player,) + cells[cell + 1:]]
+                    if score > 0:                   # a win one ply later is worth one less
+                        score -= 1
+                    elif score < 0:
+                        score += 1
+                    if score > best_score:
+                        best_cell, best_score = cell, score
+                scores[cells] = best_score
+
+                index, symmetry = cls.canonical(cells)
+                if index not in table:
+                    canonical_cell = cls.SYMMETRIES[symmetry].index(best_cell)
+                    table[index] = (canonical_cell, best_score)
+
+        return cls(table)
+
+    @staticmethod
+    def is_over(cells: tuple[int, ...], rules: TicTacToeRules) -> PlayerState | None:
+        return rules.calculate_winner([list(cells[0:3]), list(cells[3:6]), list(cells[6:9])])
+
+    @classmethod
+    def canonical(cls, cells: tuple[int, ...] | list[int]) -> tuple[int, int]:
+        """Returns the smallest base 3 index among the symmetric images of the board,
+        and the symmetry that produced it."""
+
+        best_index, best_symmetry = None, 0
+        for symmetry, permutation in enumerate(cls.SYMMETRIES):
+            index = 0
+            for cell in reversed(permutation):
+                index = index * 3 + cells[cell]
+            if best_index is None or index < best_index:
+                best_index, best_symmetry = index, symmetry
+        return best_index, best_symmetry
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def probe(self, board: list[list[int]]) -> tuple[tuple[int, int], int] | None:
+        """Returns the perfect move (row, col) and its score for the player to move,
+        or None if the game is over."""
+
+        cells = [cell for row in board for cell in row]
+        index, symmetry = self.canonical(cells)
+        entry = self.table.get(index)
+        if entry is None:
+            return None
+        canonical_cell, score = entry
+        cell = self.SYMMETRIES[symmetry][canonical_cell]
+        return divmod(cell, 3), score
+
+    #* Called by: GameManager.computer_turn_worker
+    def lookup(self, board: list[list[int]]) -> tuple[int, int] | None:
+        entry = self.probe(board)
+        return entry[0] if entry is not None else None
+
+    def close(self):
+        pass
+
+
 class TicTacToe(GameBase):
 
     game_name = "Tic-Tac-Toe"
+    rules_class = TicTacToeRules
 
     def compose(self):
 
         self.rows = 3
         self.columns = 3
+        self.rules = self.rules_class(self.rows, self.columns)
         
-        self.grid = Grid(
+        self.grid = self.grid_class(
             rows=self.rows,
             columns=self.columns,
             grid_width=34,          # NOTE: The sizes and formatting can be tricky to get perfect, so I've
@@ -53,7 +338,9 @@ class TicTacToe(GameBase):
             game = self,
             rows = self.rows,
             columns = self.columns,
-            max_depth = 9
+            max_depth = 9,
+            time_budget = 1.0,
+            search_algorithm = SearchAlgorithm.NEGAMAX,
         ))
 
     #* Called by TextualGames.start_game, TextualGames.restart
@@ -67,40 +354,3 @@ class TicTacToe(GameBase):
     #* Called by: game_over in TextualGames class.
     def clear_focus(self):
         self.grid.clear_focus()
-
-    # NOTE: This will run in a thread when called by minimax
-    #* Called by GameManager.minimax, Grid.focus_cell
-    def get_possible_moves(self, board) -> list[tuple[int, int]]:
-
-        possible_moves = []
-        
-        for row in range(self.rows):
-            for col in range(self.columns):
-                if board[row][col] == 0:
-                    possible_moves.append((row, col))
-
-        return possible_moves
-
-    #* Called by: calculate_winner in TextualGames class.
-    def calculate_winner(self, board: list[list[int]]) -> PlayerState | None:
-        """Returns a PlayerState if game is over, else returns None."""
-
-        rows      = board
-        columns   = list(zip(*board))
-        main_diag = [[board[i][i] for i in range(self.rows)]]
-        anti_diag = [[board[i][self.columns - i - 1] for i in range(self.rows)]]
-
-        # Combine all possible lines into a single list
-        lines = (rows + columns + main_diag + anti_diag)
-
-        def check_line(line, player):
-            return all(cell == player for cell in line)
-        
-        for player in (1, 2):
-            if any(check_line(line, player) for line in lines):     # Check for winner
-                return PlayerState.PLAYER1 if player == 1 else PlayerState.PLAYER2
-
-        if all(cell != 0 for row in board for cell in row):         # Check for draw
-            return PlayerState.EMPTY
-        
-        return None        # game not over yet
\ No newline at end of file
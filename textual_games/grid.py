@@ -1,8 +1,14 @@
 from __future__ import annotations
+from typing import Any
 
 # from rich.text import Text
-from textual import on
+from rich.segment import Segment
+from rich.style import Style
+from textual import on, events
+from textual.color import Color
+from textual.geometry import Region
 from textual.reactive import reactive
+from textual.strip import Strip
 from textual.widget import Widget
 from textual.widgets import Static
 from textual.message import Message
@@ -109,8 +115,10 @@ class Grid(Widget):
         Binding("r", "restart", "Restart"),
     ]
 
-    # focus_grid: reactive[list[list[int]]] = reactive([])        # 2d list
-    focus_string: str = reactive("")
+    NO_FOCUS = -1
+
+    focus_index: int = reactive(NO_FOCUS)
+    """Index of the focused cell in row-major order (row * columns + col), or NO_FOCUS."""
 
     def __init__(
             self,
@@ -162,41 +170,70 @@ class Grid(Widget):
         self.styles.grid_gutter_horizontal = grid_gutter
         self.styles.width = grid_width
         self.styles.height = grid_height
-
-        #! CHANGE FOCUS GRID TO REACTIVE. MODEL/VIEW PATTERN.
+        self.cells: list[Cell] = []     # row-major, so cells[row * columns + col]. Filled in compose.
 
     def compose(self):
 
-        for row in range(self.rows):
-            for col in range(self.columns):
-                yield Cell(
-                    row = row,
-                    column = col,
-                    cell_size = self.cell_size,
-                    id = f"cell_{row}_{col}",
-                    classes = "gridcell bordered centered"
-                )
+        self.cells = [
+            Cell(
+                row = row,
+                column = col,
+                cell_size = self.cell_size,
+                id = f"cell_{row}_{col}",
+                classes = "gridcell bordered centered"
+            )
+            for row in range(self.rows)
+            for col in range(self.columns)
+        ]
+        yield from self.cells
+
+    def cell(self, row: int, col: int) -> Cell:
+        "Returns the cell at (row, col) without a DOM query."
+        return self.cells[row * self.columns + col]
+
+    #* Called by: restart_grid, update_grid, play_computer_move in TextualGames class.
+    def sync(self, board: Any = None) -> int:
+        """Makes the cells show `board`: a 2D integer board, or any board with a
+        to_list() method (e.g. a BitBoard). None clears the grid. \n
+        Only cells whose state differs from the board are changed, all inside one
+        batched update, so a restart or a bulk reveal costs one repaint.
+
+            Returns:
+                int: the number of cells that changed"""
+
+        if board is not None and hasattr(board, "to_list"):
+            board = board.to_list()
+
+        changed = 0
+        with self.app.batch_update():
+            for index, cell in enumerate(self.cells):
+                if board is None:
+                    state = PlayerState.EMPTY
+                else:
+                    state = PlayerState(board[index // self.columns][index % self.columns])
+                if cell.state != state:
+                    cell.state = state
+                    changed += 1
+        return changed
 
     #* Called by: game_over in TextualGames class.
     def clear_focus(self):
         "Disables focus on the grid and removes the focusing class from all cells."
 
         self.can_focus = False
-        for cell in self.query_children(Cell):
-            cell.remove_class("focusing")
-        self.focus_string = "0" * (self.rows * self.columns)
+        self.focus_index = self.NO_FOCUS        # the watcher removes the class from the focused cell
 
     #* Called by: restart in TextualGames class. Used by games to both start and restart.
     def restart_grid(self):
         "Clears the grid, re-enables focus, and focuses cell (0,0)"
         self.log.debug("Restarting grid...")
 
-        for cell in self.query_children(Cell):
-            cell.state = PlayerState.EMPTY
-        self.focus_string = "0" * (self.rows * self.columns)
-        self.can_focus = True
-        self.focus()
-        self.focus_cell(0, 0) 
+        with self.app.batch_update():
+            self.sync(None)
+            self.focus_index = self.NO_FOCUS
+            self.can_focus = True
+            self.focus()
+            self.focus_cell(0, 0)
 
     def check_action(
         self, action: str, parameters: tuple[object, ...]
@@ -210,12 +247,15 @@ class Grid(Widget):
     @on(Cell.Pressed)
     def action_select(self):
         self.log.debug("Action: Select")
-        row_index, col_index = self.string_to_coordinates(self.focus_string)
+        row_index, col_index = self.focused_coordinates()
+        if row_index is None:
+            return
         self.post_message(self.CellChosen(row_index, col_index))
 
     #* Called by: update_UI_state in the current_game
     def update_grid(self, event: GameManager.UpdateGameState):
-        self.query_one(f"#cell_{event.row}_{event.column}").state = PlayerState.PLAYER1
+        "Shows the human's move. The grid is synced with the whole board, in case it missed a change."
+        self.sync(self.app.game_manager.board)
 
 
     def action_app_focus(self):
@@ -242,7 +282,7 @@ class Grid(Widget):
     def action_left(self):
         self.log.debug("Action: Left")
         self.refresh_bindings()
-        row_index, col_index = self.string_to_coordinates(self.focus_string)
+        row_index, col_index = self.focused_coordinates()
         self.focus_cell(
             row_index, (col_index-1 if col_index != 0 else self.columns-1)
         ) # subtract 1 if not first column, else go to last column
@@ -250,7 +290,7 @@ class Grid(Widget):
     def action_right(self):
         self.log.debug("Action: Right")
         self.refresh_bindings()
-        row_index, col_index = self.string_to_coordinates(self.focus_string)
+        row_index, col_index = self.focused_coordinates()
         self.focus_cell(
             row_index, (col_index+1 if col_index != self.columns-1 else 0)
         ) # add 1 if not last column, else go to first column
@@ -258,7 +298,7 @@ class Grid(Widget):
     def action_up(self):
         self.log.debug("Action: Up")
         self.refresh_bindings()
-        row_index, col_index = self.string_to_coordinates(self.focus_string)
+        row_index, col_index = self.focused_coordinates()
         self.focus_cell(
             (row_index-1 if row_index != 0 else self.rows-1), col_index
         ) # subtract 1 if not first row, else go to last row
@@ -266,7 +306,7 @@ class Grid(Widget):
     def action_down(self):
         self.log.debug("Action: Down")
         self.refresh_bindings()
-        row_index, col_index = self.string_to_coordinates(self.focus_string)
+        row_index, col_index = self.focused_coordinates()
         self.focus_cell(
             (row_index+1 if row_index != self.rows-1 else 0), col_index
         ) # add 1 if not last row, else go to first row
@@ -274,23 +314,13 @@ class Grid(Widget):
     #* Logic:
     # --------------
 
-    def watch_focus_string(self, old: str, new: str):
-        """Using the model/view pattern, this method watches the focus_grid and updates the UI accordingly."""
-
-        old_row, old_col = self.string_to_coordinates(old)
-        new_row, new_col = self.string_to_coordinates(new)
+    def watch_focus_index(self, old: int, new: int):
+        """Using the model/view pattern, this method watches the focus_index and updates the UI accordingly."""
 
-        self.log.debug(
-            f"Old string: {old} \n"
-            f"old_row: {old_row}, old_col: {old_col} \n"
-            f"New string: {new} \n"
-            f"new_row: {new_row}, new_col: {new_col}"
-        )
-
-        if old_row is not None and old_col is not None:
-            self.query_one(f"#cell_{old_row}_{old_col}").remove_class("focusing")
-        if new_row is not None and new_col is not None:
-            self.query_one(f"#cell_{new_row}_{new_col}").add_class("focusing")
+        if old != self.NO_FOCUS:
+            self.cells[old].remove_class("focusing")
+        if new != self.NO_FOCUS:
+            self.cells[new].add_class("focusing")
 
 
     @called_by(restart_grid, cell_hovered,
@@ -303,38 +333,250 @@ class Grid(Widget):
         
         elif self.focus_mode == GridFocusMode.POSSIBLE_MOVES:
 
-            #! Big change needed: Grid shouldn't let you focus on cells that are taken
-
-            board = self.app.game_manager.get_current_board()
-            possible_moves = self.app.current_game.get_possible_moves(board)
-            for move in possible_moves:     # each move is tuple of coordinates (0, 0), (2, 3), etc
-                if move[1] == col:          # find move that matches current column
-                    row = move[0]           # set row to that move
+            # The GameManager keeps the row of every column's legal move up to date,
+            # so hovering and moving left/right don't look at the board.
+            drop_row = self.app.game_manager.drop_targets[col]
+            if drop_row is not None:        # a full column keeps the row it was given
+                row = drop_row
 
-        self.focus_string = self.coordinates_to_string(row, col)
+        self.focus_index = row * self.columns + col
 
-    @called_by(action_select, watch_focus_string,
-        action_left, action_right, action_up, action_down)
-    def string_to_coordinates(self, string: str) -> tuple[int, int] | tuple[None, None]:
+    @called_by(action_select, action_left, action_right, action_up, action_down)
+    def focused_coordinates(self) -> tuple[int, int] | tuple[None, None]:
 
-        if '1' in string:
-            index = string.index('1')  # Find the index of the '1' in the string
-            row = index // self.columns    # Convert index to row
-            col = index % self.columns     # Convert index to column
-            return row, col
-        else:
+        if self.focus_index == self.NO_FOCUS:
             return None, None
-        
-    @called_by(focus_cell)
-    def coordinates_to_string(self, row: int, col: int) -> str:
+        return divmod(self.focus_index, self.columns)
 
-        new_focus = [0] * (self.rows * self.columns)
-        new_focus[(row * self.columns) + col] = 1
-        return "".join(map(str, new_focus)) 
 
+class LineCell:
+    """What LineGrid.cell returns in place of a Cell widget: the cell's row, column
+    and state. Setting the state changes the grid, like setting Cell.state does."""
 
+    __slots__ = ("grid", "row", "column")
 
+    def __init__(self, grid: LineGrid, row: int, column: int):
+        self.grid = grid
+        self.row = row
+        self.column = column
 
+    @property
+    def state(self) -> PlayerState:
+        return self.grid.state(self.row, self.column)
+
+    @state.setter
+    def state(self, value: PlayerState):
+        self.grid.set_state(self.row, self.column, value)
+
+
+class LineGrid(Grid):
+    """A Grid drawn by one widget with the Line API, instead of one Cell widget per square. \n
+    Grid mounts rows * columns Cell widgets, each with its own styles and reactive state,
+    which is fine for 3x3 but slow to mount for 9x9 or 19x19 boards. LineGrid mounts
+    nothing: it keeps the cell states in a list, renders them line by line and caches
+    the Strips of every board row until a cell in that row changes. Mouse positions are
+    hit-tested here instead of by the cells. \n
+    It has the same bindings, focus model, messages (CellChosen, RestartGame), sync()
+    and cell() as Grid, so a game can use either one. cell() returns a LineCell, which
+    has the row, column and state of a Cell but is not a widget. The widget is sized
+    to fit the board exactly, so grid_width and grid_height are ignored."""
+
+    COMPONENT_CLASSES = {"linegrid--cell", "linegrid--border", "linegrid--focus"}
+
+    DEFAULT_CSS = """
+    LineGrid > .linegrid--cell {
+        background: $surface-lighten-1;
+        color: $foreground;
+    }
+    LineGrid > .linegrid--border {color: $primary-background;}
+    LineGrid > .linegrid--focus {color: $accent;}
+    """
+
+    def __init__(self, *args, **kwargs):
+        "Takes the same arguments as Grid."
+
+        super().__init__(*args, **kwargs)
+        self.cell_gutter: int = self.styles.grid_gutter_vertical
+        self.cell_width: int = (self.cell_size * 2) + 1     # same shape as a Cell
+        self.pitch_x: int = self.cell_width + self.cell_gutter
+        self.pitch_y: int = self.cell_size + self.cell_gutter
+        self.styles.width = self.columns * self.pitch_x - self.cell_gutter
+        self.styles.height = self.rows * self.pitch_y - self.cell_gutter
+
+        self.states: list[PlayerState] = [PlayerState.EMPTY] * (self.rows * self.columns)
+        self.row_strips: dict[int, list[Strip]] = {}    # board row -> its rendered lines
+        self.hover_index: int = self.NO_FOCUS           # cell under the mouse
+        self.tokens = {
+            PlayerState.PLAYER1: self.player1_token.splitlines(),
+            PlayerState.PLAYER2: self.player2_token.splitlines(),
+        }
 
+    def compose(self):
+        yield from ()
+
+    def cell(self, row: int, col: int) -> LineCell:
+        "Returns a view of the cell at (row, col). There are no Cell widgets to return."
+        return LineCell(self, row, col)
+
+    def state(self, row: int, col: int) -> PlayerState:
+        "Returns the state shown in the cell at (row, col)."
+        return self.states[row * self.columns + col]
+
+    #* Called by: LineCell.state
+    def set_state(self, row: int, col: int, state: PlayerState):
+        "Changes the state shown in the cell at (row, col)."
+
+        index = row * self.columns + col
+        if self.states[index] != state:
+            self.states[index] = state
+            self.refresh_row(row)
+
+    #* Called by: restart_grid, update_grid, play_computer_move in TextualGames class.
+    def sync(self, board: Any = None) -> int:
+        """Makes the grid show `board`, like Grid.sync. Only the board rows that
+        changed are rendered again.
+
+            Returns:
+                int: the number of cells that changed"""
+
+        if board is not None and hasattr(board, "to_list"):
+            board = board.to_list()
+
+        changed = 0
+        changed_rows: set[int] = set()
+        for index, old_state in enumerate(self.states):
+            row, col = divmod(index, self.columns)
+            state = PlayerState.EMPTY if board is None else PlayerState(board[row][col])
+            if old_state != state:
+                self.states[index] = state
+                changed_rows.add(row)
+                changed += 1
+        for row in changed_rows:
+            self.refresh_row(row)
+        return changed
+
+    def watch_focus_index(self, old: int, new: int):
+        "Renders the rows of the previously and newly focused cells again."
+
+        for index in (old, new):
+            if index != self.NO_FOCUS:
+                self.refresh_row(index // self.columns)
+
+    #* Called by: sync, watch_focus_index
+    def refresh_row(self, row: int):
+        "Drops the cached lines of a board row and repaints it."
+
+        self.row_strips.pop(row, None)
+        self.refresh(Region(0, row * self.pitch_y, self.size.width, self.cell_size))
+
+    def notify_style_update(self):
+        super().notify_style_update()
+        self.row_strips.clear()         # the theme or the CSS changed
+
+    def on_resize(self):
+        self.row_strips.clear()
+
+
+    ###~ Rendering ~###
+
+    def render_line(self, y: int) -> Strip:
+
+        row, line = divmod(y, self.pitch_y)
+        if row >= self.rows or line >= self.cell_size:      # gutter, or below the board
+            return Strip.blank(self.size.width, self.rich_style)
+
+        strips = self.row_strips.get(row)
+        if strips is None:
+            strips = self.row_strips[row] = self.render_row(row)
+        return strips[line]
+
+    #* Called by: render_line
+    def render_row(self, row: int) -> list[Strip]:
+        """Renders the lines of one board row. A cell looks like a Cell: a tall
+        border (accent colored when focused) around the centered token."""
+
+        outer = self.rich_style
+        cell_style = self.get_component_rich_style("linegrid--cell")
+        border_color = self.get_component_rich_style("linegrid--border").color
+        focus_color = self.get_component_rich_style("linegrid--focus").color
+        gutter = Segment(" " * self.cell_gutter, outer) if self.cell_gutter else None
+        inner_width = self.cell_width - 2
+        token_height = self.cell_size - 2
+
+        lines: list[list[Segment]] = [[] for _ in range(self.cell_size)]
+        for col in range(self.columns):
+            index = row * self.columns + col
+            state = self.states[index]
+            inner = cell_style
+            if state != PlayerState.EMPTY and self.player1_color and self.player2_color:
+                color = self.player1_color if state == PlayerState.PLAYER1 else self.player2_color
+                inner = inner + Style(bgcolor=Color.parse(color).rich_color)
+            color = focus_color if index == self.focus_index else border_color
+
+            edge = inner + Style(color=color)
+            left = Style(color=outer.bgcolor, bgcolor=color)        # Textual draws ▊ reversed
+            right = outer + Style(color=color)
+            token = self.tokens.get(state, [])
+            top = (token_height - len(token)) // 2
+
+            for line, segments in enumerate(lines):
+                if col and gutter:
+                    segments.append(gutter)
+                if self.cell_size < 3:          # too small for a border. Focus is shown reversed.
+                    text = (token[line] if line < len(token) else "").center(self.cell_width)
+                    style = inner + Style(reverse=True) if index == self.focus_index else inner
+                    segments.append(Segment(text[:self.cell_width], style))
+                    continue
+                segments.append(Segment("▊", left))
+                if line == 0:
+                    segments.append(Segment("▔" * inner_width, edge))
+                elif line == self.cell_size - 1:
+                    segments.append(Segment("▁" * inner_width, edge))
+                else:
+                    token_line = line - 1 - top
+                    text = token[token_line] if 0 <= token_line < len(token) else ""
+                    segments.append(Segment(text.center(inner_width)[:inner_width], inner))
+                segments.append(Segment("▎", right))
+
+        width = self.size.width
+        return [Strip(segments).extend_cell_length(width, outer).crop(0, width) for segments in lines]
+
+
+    ###~ Mouse ~###
+
+    #* Called by: on_mouse_move, on_click
+    def hit_test(self, event: events.MouseEvent) -> tuple[int, int] | None:
+        "Returns the (row, col) of the cell under the mouse, or None for gutters and outside the board."
+
+        offset = event.get_content_offset(self)
+        if offset is None:
+            return None
+        row, y = divmod(offset.y, self.pitch_y)
+        col, x = divmod(offset.x, self.pitch_x)
+        if row >= self.rows or col >= self.columns or y >= self.cell_size or x >= self.cell_width:
+            return None
+        return row, col
+
+    def on_mouse_move(self, event: events.MouseMove):
+        "Focuses the cell under the mouse when the mouse enters it, like Cell.HoverEnter."
+
+        cell = self.hit_test(event)
+        index = self.NO_FOCUS if cell is None else cell[0] * self.columns + cell[1]
+        if index == self.hover_index:
+            return
+        self.hover_index = index
+        if cell is not None and self.can_focus:
+            self.focus_cell(*cell)
+
+    def on_leave(self):
+        self.hover_index = self.NO_FOCUS
 
+    def on_click(self, event: events.Click):
+        "Chooses the clicked cell, like Cell.Pressed."
 
+        cell = self.hit_test(event)
+        if cell is None:
+            return
+        if self.can_focus:
+            self.focus_cell(*cell)
+        self.action_select()
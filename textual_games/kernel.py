@@ -0,0 +1,181 @@
+"""Vectorized k-in-a-row kernel for any board size. \n
+
+Win detection and line evaluation of k-in-a-row games (Connect Four variants,
+Tic-Tac-Toe on big boards, Gomoku) all come down to the same thing: counting each
+player's pieces in every line of k cells. The kernel keeps the cell indices of
+every line in all four directions as one NumPy index array, so a single gather
+and sum counts the pieces of every line of a board at once. It works the same
+on a stack of boards, which is how Connect Four scores all the root moves of a
+search in one call (ConnectFourRules.evaluate_moves).
+
+NumPy is optional (`pip install textual-games[numpy]`). Rules check
+`numpy_available()` and fall back to their pure Python paths without it."""
+
+from __future__ import annotations
+from typing import Any, Sequence, TYPE_CHECKING
+
+from textual_games.enums import PlayerState
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def numpy_available() -> bool:
+    try:
+        import numpy        # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class LineKernel:
+
+    def __init__(self, rows: int, columns: int, streak: int, weights: Sequence[int] | None = None):
+        """ | Arg     | Description
+            |---------|-------------
+            | rows    | - The number of rows on the board
+            | columns | - The number of columns on the board
+            | streak  | - Pieces in a row needed to win (k)
+            | weights | - Score of a line by the number of one player's pieces in it, when the
+            |         |   other player has none (streak + 1 values). Defaults to 4 ** (pieces - 1).
+
+        Raises ImportError if NumPy is not installed."""
+
+        import numpy as np
+
+        self.rows = rows
+        self.columns = columns
+        self.streak = streak
+        if weights is None:
+            weights = [0] + [4 ** (pieces - 1) for pieces in range(1, streak + 1)]
+        if len(weights) != streak + 1:
+            raise ValueError(f"weights needs {streak + 1} values, one per piece count from 0 to {streak}.")
+        self.weights = np.asarray(weights, dtype=np.int64)
+
+        # A line's piece counts are packed into one code, mine + theirs * base (see line_codes),
+        # so the score of every line is a single lookup in this table.
+        self.base = streak + 1
+        theirs, mine = np.divmod(np.arange(self.base * self.base), self.base)
+        self.code_scores = np.where(theirs == 0, self.weights[mine], 0) - np.where(mine == 0, self.weights[theirs], 0)
+        self.flipped_codes = theirs + mine * self.base          # the same line from the opponent's side
+
+        lines = []
+        for row in range(rows):
+            for col in range(columns):
+                for row_step, col_step in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_row = row + row_step * (streak - 1)
+                    end_col = col + col_step * (streak - 1)
+                    if 0 <= end_row < rows and 0 <= end_col < columns:
+                        lines.append([
+                            (row + row_step * step) * columns + col + col_step * step
+                            for step in range(streak)
+                        ])
+        self.lines = np.asarray(lines, dtype=np.intp).reshape(-1, streak)   # (lines, streak) flat cell indices
+
+        # incidence[cell, line] is 1 if the cell is in the line. Multiplying boards by it sums
+        # every line in one matrix product (float32 is exact for counts this small, and fast).
+        self.incidence = np.zeros((rows * columns, len(self.lines)), dtype=np.float32)
+        self.incidence[self.lines, np.arange(len(self.lines))[:, np.newaxis]] = 1
+
+    def to_array(self, boards: Any) -> np.ndarray:
+        """Returns boards as an int8 array of shape (boards, rows * columns). Takes one
+        board or a list of boards: 2D integer boards, boards with a to_list() method
+        (e.g. BitBoard), or arrays."""
+
+        import numpy as np
+
+        if hasattr(boards, "to_list"):
+            boards = boards.to_list()
+        elif isinstance(boards, (list, tuple)) and boards and hasattr(boards[0], "to_list"):
+            boards = [board.to_list() for board in boards]
+        return np.asarray(boards, dtype=np.int8).reshape(-1, self.rows * self.columns)
+
+    def line_codes(self, boards: Any, player: int) -> np.ndarray:
+        """Packs the piece counts of every line into one number: the pieces of `player`
+        plus the opponent's pieces times `streak` + 1. One matrix product for both players.
+
+            Returns:
+                an int array of shape (boards, lines)"""
+
+        import numpy as np
+
+        encode = np.asarray([0, 1, self.base] if player == 1 else [0, self.base, 1], dtype=np.float32)
+        return (encode[self.to_array(boards)] @ self.incidence).astype(np.intp)
+
+    def opponent_codes(self, codes: np.ndarray) -> np.ndarray:
+        "Returns the line_codes of the opponent, from those of the player."
+        return self.flipped_codes[codes]
+
+    def line_counts(self, boards: Any, player: int) -> tuple[np.ndarray, np.ndarray]:
+        """Counts the pieces of `player` and of the opponent in every line.
+
+            Returns:
+                tuple: two int arrays of shape (boards, lines)"""
+
+        theirs, mine = divmod(self.line_codes(boards, player), self.base)
+        return mine, theirs
+
+    def has_streak(self, board: Any, player: int) -> bool:
+        """Returns True if `player` has `streak` pieces in a row anywhere on the board."""
+
+        mine, _ = self.line_counts(board, player)
+        return bool((mine == self.streak).any())
+
+    def winner(self, board: Any) -> PlayerState | None:
+        """Returns a PlayerState if the game is over, else returns None."""
+
+        player1, player2 = self.line_counts(board, 1)
+        if (player1 == self.streak).any():
+            return PlayerState.PLAYER1
+        if (player2 == self.streak).any():
+            return PlayerState.PLAYER2
+        if (self.to_array(board) != 0).all():
+            return PlayerState.EMPTY
+        return None
+
+    def evaluate_batch(self, boards: Any, player: int, codes: np.ndarray | None = None) -> np.ndarray:
+        """Scores every board for `player`: the weights of the lines only `player` has
+        pieces in, minus those of the lines only the opponent has pieces in. `codes` are
+        the boards' line_codes for `player`, if the caller has them already.
+
+            Returns:
+                an int array with one score per board"""
+
+        if codes is None:
+            codes = self.line_codes(boards, player)
+        return self.code_scores[codes].sum(axis=1)
+
+    def evaluate(self, board: Any, player: int) -> int:
+        return int(self.evaluate_batch(board, player)[0])
+
+    def threats(self, boards: Any, player: int, codes: np.ndarray | None = None) -> np.ndarray:
+        """Marks the empty cells that would complete a line for `player`: the last cell
+        of every line with `streak` - 1 of their pieces and none of the opponent's.
+        `codes` are the boards' line_codes for `player`, if the caller has them already.
+
+            Returns:
+                a bool array of shape (boards, rows * columns)"""
+
+        import numpy as np
+
+        cells = self.to_array(boards)
+        if codes is None:
+            codes = self.line_codes(cells, player)
+        open_lines = (codes == self.streak - 1).astype(np.float32)         # streak - 1 mine, none theirs
+        return (open_lines @ self.incidence.T > 0) & (cells == 0)         # the empty cell of an open line
+
+    def children(self, board: Any, moves: list[tuple[int, int]], player: int) -> np.ndarray:
+        """Returns the boards after each of `moves` is played by `player`, as an array
+        of shape (moves, rows * columns)."""
+
+        import numpy as np
+
+        base = self.to_array(board)[0]
+        children = np.repeat(base[np.newaxis, :], len(moves), axis=0)
+        cells = np.asarray([row * self.columns + col for row, col in moves], dtype=np.intp)
+        children[np.arange(len(moves)), cells] = player
+        return children
+
+    def evaluate_moves(self, board: Any, moves: list[tuple[int, int]], player: int) -> list[int]:
+        """Scores the board after each of `moves` is played by `player`, all in one batch."""
+        return self.evaluate_batch(self.children(board, moves, player), player).tolist()
@@ -1,20 +1,34 @@
 from __future__ import annotations
-from copy import deepcopy
+from typing import Any, TYPE_CHECKING
 from asyncio import sleep
+from datetime import datetime
+from threading import Event
+import json
 
 # Textual imports
 from rich.text import Text
 from textual import work, on
-from textual.worker import Worker, WorkerState
+from textual.worker import Worker, WorkerState, WorkerCancelled, WorkerFailed
 from textual.message import Message
 from textual.widget import Widget
 
 # TextualGames imports
-from textual_games.enums import PlayerState
+from textual_games.enums import PlayerState, Replacement, MoveSource
 from textual_games.game import GameBase
+from textual_games.rules import GameRules
+from textual_games.transposition import ZobristKeys, TranspositionTable
+from textual_games.move_ordering import MoveOrderer
+from textual_games.search import SearchEngine
+from textual_games.stats import SearchStats
+
+if TYPE_CHECKING:
+    from textual_games.parallel import ParallelSearch     # imports multiprocessing. Only loaded if used.
 
 class GameManager(Widget):
 
+    PONDER_MOVES = 3
+    """How many of the human's most likely replies are searched while pondering."""
+
     class ChangeTurn(Message):
         """Posted by:
         - self.start_game
@@ -53,28 +67,99 @@ class GameManager(Widget):
             self.row = row
             self.column = column
 
-    def __init__(self, *args, **kwargs):
+    def __init__(
+            self,
+            *args,
+            tt_megabytes: float = 16,
+            tt_replacement: Replacement = Replacement.DEPTH,
+            move_ordering: bool = True,
+            parallel_workers: int = 0,
+            use_opening_book: bool = True,
+            think_delay: float = 0.5,
+            ponder: bool = False,
+            show_stats: bool = False,
+            stats_file: str | None = None,
+            **kwargs
+        ):
+        """ | Arg            | Description
+            |----------------|-------------
+            | tt_megabytes   | - Memory cap of the transposition table
+            | tt_replacement | - Replacement scheme of the transposition table (DEPTH or LRU)
+            | move_ordering  | - Sort moves (TT move, killers, history, center-first) before searching.
+            |                |   Turn off to compare pruning against plain move generation order.
+            | parallel_workers | - Split the root moves across this many worker processes.
+            |                |   0 (default) searches in a single worker thread.
+            | use_opening_book | - Play from the game's opening book (if it has one) before searching.
+            | think_delay    | - Seconds the AI pretends to think before each move. 0 for none.
+            | ponder         | - Search replies to the human's most likely moves during the human's turn.
+            |                |   If the human plays one of them, the AI answers at once.
+            | show_stats     | - Show a summary of the last AI move's search in the turn header.
+            | stats_file     | - Append the statistics of every AI move to this JSON-lines file. """
+
         super().__init__(*args, **kwargs)
         self.display = False
         self.game_running = False
+        self.tt_megabytes = tt_megabytes
+        self.tt_replacement = tt_replacement
+        self.move_ordering = move_ordering
+        self.parallel_workers = parallel_workers
+        self.parallel_search: ParallelSearch | None = None     # created once, on the first game
+        self.use_opening_book = use_opening_book
+        self.opening_books: dict[str, Any] = {}                 # book name -> book, opened once
+        self.loading_books: set[str] = set()                    # book names being opened by opening_book_worker
+        self.think_delay = think_delay
+        self.ponder = ponder
+        self.ponder_worker_handle: Worker | None = None
+        self.ponder_stop = Event()
+        self.ponder_results: dict[int, tuple[tuple[int, int], SearchStats]] = {}   # Zobrist key after the human's move -> AI reply
+        self.show_stats = show_stats
+        self.stats_file = stats_file
+        self.last_stats: SearchStats | None = None
+        self.search_worker_handle: Worker | None = None
+        self.search_cancel = Event()
+        self.game_generation = 0        # bumped on every cancel. Results from older generations are stale.
+        self.drop_targets: list[int | None] = []    # column -> row of its legal move. Read by Grid.focus_cell.
     
     #* Called by: TextualGames.start_game
     def start_game(self, event: GameBase.StartGame):
 
+        self.cancel_search()
         self.game_running = True
         self.game = event.game       #! This is not currently used, but could be useful for future features.
         self.game_type = 'board'     #! this obviously needs updating.
         self.rows = event.rows          # right now things are mostly decoupled.
         self.columns = event.columns
         self.max_depth = event.max_depth
-        self.int_board = [[0 for _ in range(self.columns)] for _ in range(self.rows)]
-        self.move_counter = 0
+        self.time_budget = event.time_budget
+        self.node_budget = event.node_budget
+        self.search_algorithm = event.search_algorithm
+        self.rules: GameRules = event.game.rules
+        self.zobrist = ZobristKeys(self.rows, self.columns)
+        self.transposition_table = TranspositionTable(self.tt_megabytes, self.tt_replacement)
+        self.move_orderer = MoveOrderer(self.rules.move_priority) if self.move_ordering else None
+        self.engine = SearchEngine(
+            self.rules,
+            self.zobrist,
+            self.transposition_table,
+            self.move_orderer,
+            self.search_algorithm,
+        )
+        if self.parallel_workers and self.parallel_search is None:
+            from textual_games.parallel import ParallelSearch
+            self.parallel_search = ParallelSearch(self.parallel_workers)
+        self.opening_book = self.get_opening_book()
+        self.new_parallel_game()
+        self.reset_board()
 
         self.log(
             "Starting game with settings:\n"
             f"Rows: {self.rows}\n"
             f"Columns: {self.columns}\n"
             f"Max depth: {self.max_depth}\n"
+            f"Time budget: {self.time_budget}\n"
+            f"Node budget: {self.node_budget}\n"
+            f"Search algorithm: {self.search_algorithm.name}\n"
+            f"Opening book: {len(self.opening_book) if self.opening_book else 'none'} positions\n"
         )
 
         self.post_message(self.ChangeTurn(PlayerState.PLAYER1))
@@ -82,9 +167,11 @@ class GameManager(Widget):
 
     def restart_game(self):
 
+        self.cancel_search()
         self.game_running = True
-        self.int_board = [[0 for _ in range(self.columns)] for _ in range(self.rows)]
-        self.move_counter = 0
+        self.transposition_table.clear()
+        self.new_parallel_game()
+        self.reset_board()
 
         self.log(
             "Restarting game with settings:\n"
@@ -96,12 +183,109 @@ class GameManager(Widget):
         self.post_message(self.ChangeTurn(PlayerState.PLAYER1))
         self.notify("Game started", timeout=1.5)
 
+    #* Called by: TextualGames.mount_games_menu
+    def stop_game(self):
+        """Leaves the current game, stopping any search still running for it."""
+
+        self.game_running = False
+        self.cancel_search()
+
+    #* Called by: self.start_game, self.restart_game, self.stop_game, self.on_unmount
+    def cancel_search(self):
+        """Stops the AI search and pondering within a few milliseconds. The search's
+        result is discarded, because the game generation it started in is over."""
+
+        self.game_generation += 1
+        self.search_cancel.set()
+        self.stop_pondering()
+        if self.parallel_search is not None:
+            self.parallel_search.cancel()
+
+    #* Called by: self.computer_turn_orch, self.start_pondering
+    async def wait_for_search(self):
+        """Waits until a cancelled search thread has returned. It shares the engine."""
+
+        worker = self.search_worker_handle
+        if worker is None:
+            return
+        try:
+            await worker.wait()
+        except (WorkerCancelled, WorkerFailed):
+            pass
+        self.search_worker_handle = None
+
+    #* Called by: self.start_game, self.restart_game
+    def new_parallel_game(self):
+        "Gives the worker processes the new game's rules. They start with an empty TT."
+
+        if self.parallel_search is not None:
+            self.parallel_search.new_game(
+                self.rules,
+                self.zobrist,
+                self.tt_megabytes,
+                self.tt_replacement,
+                self.move_ordering,
+                self.search_algorithm,
+            )
+
+    #* Called by: self.start_game
+    def get_opening_book(self) -> Any | None:
+        """Returns the game's opening book if it is open. Otherwise starts opening it in
+        a thread and returns None, so the AI searches until the book is ready."""
+
+        name = self.rules.opening_book
+        if not self.use_opening_book or name is None:
+            return None
+        if name not in self.opening_books and name not in self.loading_books:
+            self.loading_books.add(name)
+            self.opening_book_worker(name, self.rules)
+        return self.opening_books.get(name)
+
+    @work(thread=True, group="opening_book", exit_on_error=False)
+    def opening_book_worker(self, name: str, rules: GameRules):
+        """Opens a book off the UI thread (Tic-Tac-Toe builds its table on a cold cache).
+        If the game that asked for it is still running, it plays from the book from its
+        next AI move. If opening fails, the next game tries again."""
+
+        try:
+            book = rules.load_opening_book()
+            self.opening_books[name] = book
+            if self.game_running and self.rules.opening_book == name:
+                self.opening_book = book
+        finally:
+            self.loading_books.discard(name)
+
+    #* Called by: self.start_game, self.restart_game
+    def reset_board(self):
+
+        self.board = self.rules.new_board()
+        self.board_key = 0          # Zobrist key of the empty board
+        self.move_counter = 0
+        self.drop_targets = [None] * self.columns
+        for row, col in self.rules.get_possible_moves(self.board):
+            self.drop_targets[col] = row
+        self.last_stats = None
+        self.ponder_results = {}    # a new dict, so a ponder thread still stopping can't write into it
+
     def end_game(self, game_result: PlayerState):
         self.game_running = False
+        self.stop_pondering()
         self.post_message(self.GameOver(game_result))
 
-    def get_current_board(self) -> list[tuple[int, int]]:
-        return self.int_board
+    def get_possible_moves(self) -> list[tuple[int, int]]:
+        """Returns the legal moves on the current board."""
+        return self.rules.get_possible_moves(self.board)
+
+    #* Called by: self.cell_pressed, self.computer_turn_orch
+    def place_piece(self, row: int, col: int, player: int):
+        """Applies a move to the board and updates its Zobrist key and drop target."""
+
+        self.rules.apply_move(self.board, (row, col), player)
+        self.board_key ^= self.zobrist.pieces[player][row][col]
+        self.move_counter += 1
+        # Only this column's drop target can change. Updated before UpdateGameState or
+        # ComputerMove is posted, so the Grid never reads a stale one.
+        self.drop_targets[col] = self.rules.landing_row(self.board, col)
 
     #* Called by: TextualGames.cell_chosen
     async def cell_pressed(self, event):
@@ -118,14 +302,15 @@ class GameManager(Widget):
             f"self.game_running: {self.game_running}"
         )
 
-        if self.int_board[row][column] != 0:
+        if not self.rules.is_empty(self.board, row, column):
             self.notify("Cell already taken", timeout=1)
             return
 
-        self.int_board[row][column] = 1
+        self.stop_pondering()       # frees the CPU now. computer_turn_orch waits for it to finish.
+
+        self.place_piece(row, column, 1)
         self.post_message(self.UpdateGameState(row, column))
-        self.move_counter += 1
-        game_result = self.app.calculate_winner(self.int_board)
+        game_result = self.rules.check_result(self.board, row, column, 1, self.move_counter)
         if game_result is not None:
             self.end_game(game_result)
             return
@@ -137,27 +322,36 @@ class GameManager(Widget):
     #* Called by: TextualGames.change_turn
     async def computer_turn_orch(self):
 
-        self.minimax_counter = 0
-        self.pruning_counter = 0
-        self.depth_limit_counter = 0
+        generation = self.game_generation
+        await self.wait_for_pondering()     # the ponder thread shares the engine
+        await self.wait_for_search()        # so does a cancelled search that is still returning
+        if generation != self.game_generation:
+            return
 
-        board_copy = deepcopy(self.int_board)
-        worker = self.computer_turn_worker(board_copy)
-        ai_row, ai_col = await worker.wait()
-        if ai_row is None:
+        self.search_cancel = Event()        # a new token per search. A cancelled one stays set.
+        board_copy = self.rules.copy_board(self.board)
+        worker = self.search_worker_handle = self.computer_turn_worker(board_copy, self.search_cancel)
+        try:
+            result = await worker.wait()
+        except WorkerCancelled:
+            return                          # the app is closing
+        if generation != self.game_generation:
+            self.log("Discarded the move of a cancelled search\n")
+            return
+
+        move, self.last_stats = result
+        if move is None:
             raise ValueError("AI made an invalid move.")
+        ai_row, ai_col = move
 
-        self.log(
-            f"Minimax counter: {self.minimax_counter}\n"
-            f"Branches pruned: {self.pruning_counter}\n"
-            f"Times depth limit reached: {self.depth_limit_counter}\n"
-        )        
+        self.log_search_stats(self.last_stats)
+        if self.stats_file is not None:
+            self.record_stats(self.last_stats)
 
-        self.int_board[ai_row][ai_col] = 2              # Apply AI move to integer board
-        self.move_counter += 1
+        self.place_piece(ai_row, ai_col, 2)                     # Apply AI move to the board
         self.post_message(self.ComputerMove(ai_row, ai_col))  # Updates the cell state in the Grid
 
-        game_result = self.app.calculate_winner(self.int_board)
+        game_result = self.rules.check_result(self.board, ai_row, ai_col, 2, self.move_counter)
         if game_result is not None:
             self.end_game(game_result)
             return
@@ -165,80 +359,194 @@ class GameManager(Widget):
         self.post_message(self.ChangeTurn(PlayerState.PLAYER1))     # Change turn back to human
 
 
-    @work(thread=True, exit_on_error=False)
-    async def computer_turn_worker(self, board: list[list[int]]) -> tuple[int, int]:
-
-        await sleep(0.5)            # Artificial delay to simulate thinking time
-        _, best_move = self.minimax(
-            board,
-            depth=0,                 # always start at depth 0
-            is_maximizing=True,      # AI is maximizer
-            alpha=float('-inf'),
-            beta=float('inf'),
-        )   
-        return best_move
-
-    #* Called by: self.computer_turn_worker, self.minimax
-    def minimax(
-        self,
-        board: list[list[int]],
-        depth: int,
-        is_maximizing: bool,
-        alpha: float,
-        beta: float,
-    ) -> tuple[int, tuple[int, int]]:
-        """ | Arg           | Description 
-            |---------------|---------------------
-            | board         | - The current game board state
-            | depth         | - Current depth in the game tree
-            | is_maximizing | - True if AI's turn (maximizing), False if human's turn (minimizing)
-
-            Returns:
-                tuple[int, tuple[int, int]]: best_score, best_move (as tuple of coordinates)"""
-
-        self.minimax_counter += 1
-
-        result = self.app.calculate_winner(board)
-
-        # Base cases: game over scenarios
-        if result == PlayerState.PLAYER1:     # Human is minimizer
-            return -10 + depth, None
-        elif result == PlayerState.PLAYER2:   # AI is maximizer
-            return 10 - depth, None
-        elif result == PlayerState.EMPTY:     # Draw
-            return 0, None
-
-        if depth >= self.max_depth:
-            self.depth_limit_counter += 1
-            return 0, None
-    
-        best_move  = (None, None)
-        best_score = float('-inf') if is_maximizing else float('inf')
-        player     =             2 if is_maximizing else 1
+    #* Called by: self.computer_turn_orch
+    def log_search_stats(self, stats: SearchStats):
 
-        possible_moves = self.app.current_game.get_possible_moves(board)
+        if stats.source == MoveSource.BOOK:
+            self.log("Played a move from the opening book\n")
+            return
+        if stats.source == MoveSource.PONDER:
+            self.log("Answered with the reply found while pondering")
 
-        for move in possible_moves:
-            row, col = move
+        for depth, score, move, nodes, elapsed in stats.iterations:
+            self.log(f"Depth {depth} complete: score {score}, move {move}, {nodes} nodes, {elapsed:.3f}s")
 
-            board[row][col] = player
-            score, _, = self.minimax(board, depth + 1, not is_maximizing, alpha, beta)
-            board[row][col] = 0         # Undo move
+        if stats.worker_nodes is not None:
+            for pid, nodes in stats.worker_nodes.items():
+                self.log(f"Worker process {pid}: {nodes} nodes")
+            self.log(f"Parallel search: {stats.nodes} nodes on {len(stats.worker_nodes)} workers\n")
+            return
 
-            if is_maximizing and score > best_score:
-                    best_score = score
-                    alpha = max(score, alpha)
-                    best_move = (row, col)
-            elif not is_maximizing and score < best_score:
-                    best_score = score
-                    beta = min(score, beta)
-                    best_move = (row, col)
+        first_move_rate = stats.first_move_cutoffs / stats.cutoffs if stats.cutoffs else 0
+        self.log(
+            f"Search algorithm: {stats.algorithm.name}\n"
+            f"Move ordering: {'on' if self.move_ordering else 'off'}\n"
+            f"Nodes: {stats.nodes} ({stats.nodes_per_second or 0} per second)\n"
+            f"Nodes per depth: {stats.nodes_per_depth}\n"
+            f"Cutoffs per depth: {stats.cutoffs_per_depth}\n"
+            f"Cutoffs on first move: {first_move_rate:.1%}\n"
+            f"PVS re-searches: {stats.pvs_researches}\n"
+            f"Aspiration window failures: {stats.aspiration_failures}\n"
+            f"Times depth limit reached: {stats.depth_limit}\n"
+            f"Transposition table hits: {stats.tt_hits} ({stats.tt_entries} entries)\n"
+            f"Principal variation: {stats.principal_variation}\n"
+        )
+
+    #* Called by: self.computer_turn_orch
+    def record_stats(self, stats: SearchStats):
+        """Appends the statistics of one AI move to the stats file, as one JSON object per line."""
+
+        record = {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "game": self.game.game_name,
+            "move_number": self.move_counter + 1,
+            **stats.to_dict(),
+        }
+        try:
+            with open(self.stats_file, "a", encoding="utf-8") as file:
+                file.write(json.dumps(record) + "\n")
+        except OSError as error:
+            self.log.error(f"Could not write search statistics to {self.stats_file}: {error}")
+
+    @work(thread=True, exclusive=True, group="search", exit_on_error=False)
+    async def computer_turn_worker(
+            self,
+            board: Any,
+            cancel: Event,
+        ) -> tuple[tuple[int, int] | None, SearchStats | None]:
+        """Finds the AI's move and the statistics of how it was found. Setting `cancel`
+        stops the search within 1024 nodes, and the move is then None or the move of
+        the deepest completed iteration."""
+
+        pondered = self.ponder_results.get(self.board_key)
+        if pondered is not None:
+            return pondered         # the human played a predicted move. Answer at once.
+
+        if self.think_delay:
+            await sleep(self.think_delay)       # Artificial delay to simulate thinking time
+        if cancel.is_set():
+            return None, None
+
+        if self.opening_book is not None:
+            move = self.opening_book.lookup(board)
+            if move is not None:
+                return move, SearchStats(MoveSource.BOOK, move)
+
+        engine = self.engine
+        if self.parallel_search is not None:
+            move = self.parallel_search.search(
+                board,
+                self.board_key,
+                self.move_counter,
+                self.max_depth,
+                engine.order_root_moves(board, self.board_key),
+                self.time_budget,
+                self.node_budget,
+                should_stop=cancel.is_set,
+            )
+            return move, self.parallel_search.stats
+        engine.should_stop = cancel.is_set
+        try:
+            move = engine.search(
+                board,
+                self.board_key,
+                self.move_counter,
+                self.max_depth,
+                self.time_budget,
+                self.node_budget,
+            )
+            return move, engine.stats
+        finally:
+            if engine.should_stop == cancel.is_set:
+                engine.should_stop = None
 
-            if beta <= alpha:
-                self.pruning_counter += 1
-                break
+    #* Called by: TextualGames.change_turn
+    async def start_pondering(self):
+        """Starts pondering on the human's turn, if it is turned on."""
 
-        return best_score, best_move
+        if not self.ponder or not self.game_running:
+            return
+        await self.wait_for_pondering()     # one thread at a time on the engine
+        await self.wait_for_search()
+        self.ponder_stop = Event()      # a new event per turn. The old thread keeps its own.
+        self.ponder_worker_handle = self.ponder_worker(
+            self.rules.copy_board(self.board),
+            self.board_key,
+            self.move_counter,
+            self.ponder_stop,
+            self.ponder_results,
+        )
+
+    #* Called by: self.cell_pressed, self.cancel_search, self.end_game
+    def stop_pondering(self):
+        """Tells the ponder thread to stop. It notices within 1024 nodes."""
+        self.ponder_stop.set()
+
+    #* Called by: self.computer_turn_orch, self.start_pondering
+    async def wait_for_pondering(self):
+
+        worker = self.ponder_worker_handle
+        if worker is None:
+            return
+        self.stop_pondering()
+        try:
+            await worker.wait()
+        except (WorkerCancelled, WorkerFailed):
+            pass
+        self.ponder_worker_handle = None
+
+    @work(thread=True, exclusive=True, group="ponder", exit_on_error=False)
+    def ponder_worker(
+            self,
+            board: Any,
+            key: int,
+            move_count: int,
+            stop: Event,
+            results: dict[int, tuple[tuple[int, int], SearchStats]],
+        ):
+        """Searches the AI's reply to each of the human's most likely moves, best first,
+        until `stop` is set. Finished searches go in `results`. Every search also fills
+        the transposition table, which speeds up the real search if the guess was wrong."""
+
+        engine = self.engine
+        rules = self.rules
+        engine.should_stop = stop.is_set
+        try:
+            # ply 1: the human's replies are one ply below the AI's previous root
+            predicted = engine.order_moves(board, key, 1, 1)[:self.PONDER_MOVES]
+            for move in predicted:
+                if stop.is_set():
+                    return
+                row, col = move
+                rules.apply_move(board, move, 1)
+                child_key = key ^ self.zobrist.pieces[1][row][col]
+                over = rules.check_result(board, row, col, 1, move_count + 1) is not None
+                in_book = self.opening_book is not None and self.opening_book.lookup(board) is not None
+                if not over and not in_book:
+                    reply = engine.search(
+                        rules.copy_board(board),
+                        child_key,
+                        move_count + 1,
+                        self.max_depth,
+                        self.time_budget,
+                        self.node_budget,
+                    )
+                    if reply is not None and not stop.is_set():     # interrupted searches are discarded
+                        stats = engine.stats
+                        stats.source = MoveSource.PONDER
+                        results[child_key] = (reply, stats)
+                rules.undo_move(board, move, 1)
+        finally:
+            if engine.should_stop == stop.is_set:
+                engine.should_stop = None
+
+    def on_unmount(self):
+        self.cancel_search()
+        if self.parallel_search is not None:
+            self.parallel_search.shutdown()
+        for book in self.opening_books.values():
+            if book is not None:
+                book.close()
 
     @on(Worker.StateChanged)
     def worker_state_changed(self, event: Worker.StateChanged) -> None:
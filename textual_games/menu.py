@@ -1,10 +1,9 @@
 from __future__ import annotations
+import hashlib
 import importlib.util
 import os
-from typing import Dict, Any, Type, List
-
-# 3rd party imports
-from textual_pyfiglet import FigletWidget
+import sys
+from typing import Any, Dict, List
 
 # Textual imports
 from textual import on, work
@@ -20,12 +19,14 @@ from textual.widget import Widget
 # TextualGames imports
 import textual_games.games as games
 from textual_games.source_decorator import called_by
+from textual_games.banner import Banner
 from textual_games.spinner import SpinnerWidget, ScrollingLine
 from textual_games.simplebutton import SimpleButton
 from textual_games.manager import GameManager
 from textual_games.enums import PlayerState
 from textual_games.grid import Grid
 from textual_games.game import GameBase
+from textual_games.discovery import GameInfo, GameManifest
 
 
 class GameEntry(Widget):
@@ -33,14 +34,14 @@ class GameEntry(Widget):
     class GameSelected(Message):
         """Posted by: entry_pressed in GameEntry. \n
         Handled by: game_selected in TextualGames."""
-        def __init__(self, game_class: Type[Any]):
+        def __init__(self, game_info: GameInfo):
             super().__init__()
-            self.game_class = game_class
+            self.game_info = game_info
 
-    def __init__(self, game_name: str, game_class: Type[Any], *args, **kwargs):
+    def __init__(self, game_name: str, game_info: GameInfo, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.game_name = game_name
-        self.game_class = game_class
+        self.game_info = game_info      # the game's script is only imported when it is selected
 
     def compose(self):
         yield SimpleButton(self.game_name, classes="wide centered")
@@ -48,7 +49,7 @@ class GameEntry(Widget):
     @on(SimpleButton.Pressed)
     def entry_pressed(self, event: SimpleButton.Pressed):
         self.log.info(f"Pressed: {self.game_name}")
-        self.post_message(self.GameSelected(self.game_class))
+        self.post_message(self.GameSelected(self.game_info))
 
     def focus(self):
         self.query_one(SimpleButton).focus()
@@ -66,21 +67,36 @@ class TextualGames(App):
 
     # COMMAND_PALETTE_BINDING = "escape"
 
-    def __init__(self, *args, **kwargs):
+    def __init__(
+            self,
+            *args,
+            engine_options: Dict[str, Any] | None = None,
+            line_grid: bool = False,
+            **kwargs
+        ):
+        """ | Arg            | Description
+            |----------------|-------------
+            | engine_options | - Keyword arguments for the GameManager (show_stats, ponder, think_delay,
+            |                |   parallel_workers...). main() builds them from the command line.
+            | line_grid      | - Draw the boards of the games that support it with a LineGrid. """
+
         super().__init__(*args, **kwargs)
+        self.engine_options = engine_options or {}
+        self.line_grid = line_grid
 
     def compose(self):
 
-        self.game_manager = GameManager()
+        self.game_manager = GameManager(**self.engine_options)
         yield self.game_manager
 
         with Horizontal(id="header", classes="wide header tall"):
-            yield FigletWidget("Textual Games", font="small_slant")
+            yield Banner("Textual Games", font="small_slant")
         with Horizontal(id="animation_header", classes="h1 wide"):
             yield ScrollingLine(classes="wide")
         with Horizontal(id="turn_header", classes="wide header turnlabel"):
             yield Label(id="turn_label", classes="auto centered")
             yield SpinnerWidget("line", id="spinner", classes="auto centered")
+            yield Label(id="stats_label", classes="auto centered")
         with Container(id="content", classes="onefr centered"):
             yield Static()
         with Horizontal(classes="centered wide footer"):
@@ -93,6 +109,7 @@ class TextualGames(App):
 
     def on_mount(self):
         self.query_one("#restart").display = False
+        self.query_one("#stats_label").display = self.game_manager.show_stats
         self.call_after_refresh(self.load_games)
 
     #* Called by: on_mount, directly above.
@@ -114,10 +131,11 @@ class TextualGames(App):
 
     async def mount_games_menu(self):
 
-        self.game_manager.game_running = False
+        self.game_manager.stop_game()       # also stops a search that is still running
         await self.content_window.remove_children()
         await self.content_window.mount_all(self.games)
         self.query_one("#turn_label").update("")
+        self.query_one("#stats_label").update("")
 
         self.query_one("#turn_header").display = False      # disable the turn display
         self.query_one("#restart").visible = False          # disable restart button
@@ -148,10 +166,17 @@ class TextualGames(App):
     @on(GameEntry.GameSelected)
     def game_selected(self, event: GameEntry.GameSelected):
 
-        self.log.info(f"game_selected in main app received: {event.game_class}")
+        self.log.info(f"game_selected in main app received: {event.game_info}")
+
+        game_class = self.loader.load_game(event.game_info)     # imports the game's script
+        if game_class is None:
+            self.notify(f"Could not load {event.game_info.game_name}", severity="error")
+            return
 
         self.content_window.remove_children()
-        self.current_game = event.game_class()          # here the game instance is created.
+        self.current_game = game_class()                # here the game instance is created.
+        if self.line_grid:
+            self.current_game.line_grid = True          # read in the game's compose, when it is mounted
         self.content_window.mount(self.current_game)    # Game instances are only created when selected.
 
     #* Called by on_mount or restart in a game widget.
@@ -172,23 +197,6 @@ class TextualGames(App):
         self.game_manager.restart_game()
         self.current_game.restart()
 
-    @called_by(GameManager.minimax)
-    def get_possible_moves(self, state: Any):
-        return self.current_game.get_possible_moves(state)
-
-    @called_by(
-        GameManager.cell_pressed,
-        GameManager.computer_turn_orch,
-        GameManager.minimax
-    )
-    def calculate_winner(self, board: List[List[int]]) -> PlayerState | None:
-        """Returns a PlayerState if game is over, else returns None. \n
-        Playerstate can be PLAYER1, PLAYER2, or EMPTY. (Empty here means draw/tie game)"""
-        # NOTE: This does not use an event because we need it to wait for the result,
-        # and turning the whole thing async from top to bottom would be a pain in the ass.
-
-        return self.current_game.calculate_winner(board)
-
     @on(GameManager.ChangeTurn)         
     @work(exit_on_error=False)
     async def change_turn(self, event: GameManager.ChangeTurn):
@@ -202,6 +210,8 @@ class TextualGames(App):
         if event.value == PlayerState.PLAYER1:
             self.query_one("#spinner").visible = False
             self.query_one("#turn_label").update("Your turn")
+            self.update_stats_label()
+            await self.game_manager.start_pondering()
         else:
             self.query_one("#spinner").visible = True
             self.query_one("#turn_label").update("Computer is thinking... ")
@@ -216,18 +226,27 @@ class TextualGames(App):
             self.query_one("#turn_label").update("It's a tie!")
         else:
             self.query_one("#turn_label").update(f"{event.result.name} wins!")
+        self.update_stats_label()
 
         self.current_game.clear_focus()
         self.query_one("#restart").focus()  
 
+    #* Called by: self.change_turn, self.game_over
+    def update_stats_label(self):
+        """Shows how the AI found its last move, if GameManager.show_stats is on."""
+
+        if not self.game_manager.show_stats:
+            return
+        stats = self.game_manager.last_stats
+        self.query_one("#stats_label").update(stats.summary() if stats is not None else "")
+
     @on(GameManager.ComputerMove)
     def play_computer_move(self, event: GameManager.ComputerMove):
 
         # The AI does not send a cell_pressed event because it doesn't click on the cell,
-        # So we need to update the cell state manually.
+        # So the grid is synced with the board here.
 
-        cell = self.current_game.grid.query_one(f"#cell_{event.row}_{event.col}")
-        cell.state = PlayerState.PLAYER2
+        self.current_game.grid.sync(self.game_manager.board)
 
     @on(Grid.CellChosen)
     async def cell_chosen(self, event: Grid.CellChosen):
@@ -247,7 +266,8 @@ class GameLoader(DOMNode):
             *directories: Variable number of paths to directories containing games
         """
         self.game_directories = list(directories)
-        self.loaded_games: Dict[str, Type[Any]] = {}
+        self.discovered_games: Dict[str, GameInfo] = {}
+        self.loaded_games: Dict[str, type[GameBase]] = {}      # script path -> game class, once imported
 
     @called_by(TextualGames.load_games)
     @classmethod
@@ -267,17 +287,20 @@ class GameLoader(DOMNode):
         return cls(*directories)
 
     @called_by(TextualGames.load_games)
-    def discover_games(self) -> Dict[str, Type[Any]]:
+    def discover_games(self) -> Dict[str, GameInfo]:
         """
-        Scan all game directories for .py files and attempt to load them.
-        Later directories can override games from earlier directories.
+        Scan all game directories for .py files and read each game's metadata, without
+        importing the scripts. Later directories can override games from earlier directories.
         
         Returns:
-            Dict[str, Type[Any]]: Dictionary mapping game names to their game classes
+            Dict[str, GameInfo]: Dictionary mapping game names to their metadata
         """
         self.log.debug("Discovering games")
 
-        self.loaded_games.clear()
+        self.discovered_games.clear()
+        manifest = GameManifest()
+        required_members = list(GameBase.required_members)
+        seen_paths = set()
         
         for directory in self.game_directories:
             if not os.path.exists(directory):
@@ -287,39 +310,100 @@ class GameLoader(DOMNode):
             for filename in os.listdir(directory):
                 if filename.endswith('.py') and not filename.startswith('__'):
                     scriptname = filename[:-3]
+                    module_name = self.module_name(directory, scriptname)
+                    module_path = os.path.abspath(os.path.join(directory, filename))
+                    seen_paths.add(module_path)
                     try:
-                        module_path = os.path.join(directory, filename)
-                        spec = importlib.util.spec_from_file_location(scriptname, module_path)
-                    except Exception as e:
-                        self.log.error(f"Error loading spec for game {scriptname}: {str(e)}")
-                        continue
-                    else:
-                        if spec is None or spec.loader is None:
-                            self.log.error(f"Failed to load spec for game: {scriptname}")
-                            continue    
-                    try:
-                        module = importlib.util.module_from_spec(spec)
-                        spec.loader.exec_module(module)
-                    except Exception as e:
-                        self.log.error(f"Error loading game {scriptname}: {str(e)}")
+                        game_info = manifest.game_info(module_path, module_name, required_members)
+                    except (OSError, SyntaxError, ValueError) as e:
+                        self.log.error(f"Error reading game {scriptname}: {str(e)}")
                         continue
-                    try:
-                        game_class = module.loader()
-                    except AttributeError:
+                    if game_info is None:
                         self.log.warning(f"Game {scriptname} does not have a loader function")
                         continue
-                    try:
-                        game_class.validate_interface(game_class)   # the instance is not created yet, so pass the class.
-                    except Exception as e:
-                        self.log.error(f"Error validating game {scriptname}: {str(e)}")
+                    if game_info.missing_members:
+                        self.log.error(
+                            f"Error validating game {scriptname}: {game_info.class_name} must implement "
+                            f"{', '.join(game_info.missing_members)}."
+                        )
                         continue
 
-                    game_name = game_class.game_name
-                    try:
-                        self.loaded_games[game_name] = game_class
-                    except KeyError:
-                        self.log.warning(f"Game {game_name} already loaded, skipping")
-                        continue
-
-        return self.loaded_games
-
+                    if game_info.game_name is None:
+                        # The metadata can't be read statically. Import the script to find out.
+                        game_class = self.load_game(game_info)
+                        if game_class is None:
+                            continue
+                        game_info.game_name = game_class.game_name
+                        game_info.class_name = game_class.__name__
+                        manifest.update(game_info)
+                    self.discovered_games[game_info.game_name] = game_info
+
+        manifest.forget_missing(seen_paths)
+        manifest.save()
+        return self.discovered_games
+
+    @staticmethod
+    def module_name(directory: str, scriptname: str) -> str:
+        """
+        The name a game script is imported under (its key in sys.modules). The package's
+        games keep their real names. Each other directory gets its own namespace, so a user
+        script can't replace a package game, or a script with the same name in another directory.
+        """
+        directory = os.path.abspath(directory)
+        if directory == os.path.abspath(games.__path__[0]):
+            return f"textual_games.games.{scriptname}"
+        digest = hashlib.sha1(directory.encode()).hexdigest()[:12]
+        return f"textual_games.user_games.{digest}.{scriptname}"
+
+    @called_by(TextualGames.game_selected, discover_games)
+    def load_game(self, game_info: GameInfo) -> type[GameBase] | None:
+        """
+        Import a game's script and return its game class. Scripts are imported once.
+        
+        Returns:
+            type[GameBase] | None: The game class, or None if the script failed to load
+        """
+        path = game_info.path
+        if path in self.loaded_games:
+            return self.loaded_games[path]
+
+        scriptname = os.path.basename(path)[:-3]
+        module_name = game_info.module_name
+        module = sys.modules.get(module_name)
+        if module is not None:
+            # Imported already (a package game imported by name, for one). Don't run it twice.
+            module_path = getattr(module, "__file__", None)
+            if module_path is None or os.path.abspath(module_path) != os.path.abspath(path):
+                self.log.error(f"Error loading game {scriptname}: {module_name} is already imported from {module_path}")
+                return None
+        else:
+            try:
+                spec = importlib.util.spec_from_file_location(module_name, path)
+            except Exception as e:
+                self.log.error(f"Error loading spec for game {scriptname}: {str(e)}")
+                return None
+            else:
+                if spec is None or spec.loader is None:
+                    self.log.error(f"Failed to load spec for game: {scriptname}")
+                    return None
+            try:
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module    # lets the parallel search pickle the game's rules
+                spec.loader.exec_module(module)
+            except Exception as e:
+                sys.modules.pop(module_name, None)
+                self.log.error(f"Error loading game {scriptname}: {str(e)}")
+                return None
+        try:
+            game_class = module.loader()
+        except AttributeError:
+            self.log.warning(f"Game {scriptname} does not have a loader function")
+            return None
+        try:
+            game_class.validate_interface(game_class)   # the instance is not created yet, so pass the class.
+        except Exception as e:
+            self.log.error(f"Error validating game {scriptname}: {str(e)}")
+            return None
+
+        self.loaded_games[path] = game_class
+        return game_class
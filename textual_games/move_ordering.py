@@ -0,0 +1,74 @@
+"""Move ordering for the alpha-beta search in SearchEngine (search.py). \n
+
+Alpha-beta prunes the most when the best move is searched first. The
+MoveOrderer sorts the moves of every node before they are searched, in this order:
+1) the best move stored in the transposition table for this position
+2) killer moves: moves that caused a cutoff at the same ply in a sibling position
+3) everything else, by history score (cutoffs caused anywhere in the tree),
+   then by the game's static `move_priority` (center-first)."""
+
+from __future__ import annotations
+from typing import Callable
+
+
+class MoveOrderer:
+
+    KILLER_SLOTS = 2
+
+    def __init__(self, move_priority: Callable[[tuple[int, int]], int] | None = None):
+        """ | Arg           | Description
+            |---------------|-------------
+            | move_priority | - Static score of a move for the current game. Higher is searched first. """
+
+        self.move_priority = move_priority
+        self.killers: list[list[tuple[int, int]]] = []
+        self.history: list[dict[tuple[int, int], int]] = [{}, {}, {}]     # indexed by player number
+
+    def new_search(self):
+        """Clears the killer moves and ages the history table. Called once per AI turn
+        by SearchEngine.new_turn."""
+
+        self.killers = []
+        for table in self.history:
+            for move in table:
+                table[move] //= 2
+
+    #* Called by: SearchEngine.minimax, SearchEngine.negamax, SearchEngine.order_moves
+    def order(
+            self,
+            moves: list[tuple[int, int]],
+            ply: int,
+            player: int,
+            tt_move: tuple[int, int] | None = None,
+        ) -> list[tuple[int, int]]:
+
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        history = self.history[player]
+        move_priority = self.move_priority
+
+        def sort_key(move: tuple[int, int]) -> tuple[int, int, int]:
+            if move == tt_move:
+                tier = 2
+            elif move in killers:
+                tier = 1
+            else:
+                tier = 0
+            static = move_priority(move) if move_priority else 0
+            return tier, history.get(move, 0), static
+
+        return sorted(moves, key=sort_key, reverse=True)
+
+    #* Called by: SearchEngine.minimax, SearchEngine.negamax
+    def record_cutoff(self, move: tuple[int, int], ply: int, player: int, depth: int):
+        """Records a move that caused a beta cutoff. `depth` is the remaining search depth,
+        so cutoffs close to the root count for more."""
+
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[self.KILLER_SLOTS:]
+
+        history = self.history[player]
+        history[move] = history.get(move, 0) + depth * depth
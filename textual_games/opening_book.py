@@ -0,0 +1,235 @@
+"""Precomputed opening book for BitBoard games (Connect Four). \n
+
+Early in the game the board is nearly empty, so the AI search is at its most
+expensive and reaches the least depth. The book stores the move of a much deeper
+search for every early position, so the GameManager can play it instantly.
+
+The book is a small binary file: a header, then fixed-size records sorted by
+position key. It is opened with mmap and binary searched in place, so loading it
+costs nothing. Positions and their mirror images share one record.
+
+The book is built offline by the generator command `textual-games-build-book`.
+It writes to the cache directory, which is searched before the book bundled
+with the package."""
+
+from __future__ import annotations
+from pathlib import Path
+from time import perf_counter
+import argparse
+import mmap
+import struct
+import sys
+
+from textual_games.bitboard import BitBoard
+from textual_games.cache import cache_dir
+from textual_games.enums import SearchAlgorithm
+from textual_games.rules import GameRules
+from textual_games.search import SearchEngine
+from textual_games.transposition import ZobristKeys, TranspositionTable
+from textual_games.move_ordering import MoveOrderer
+
+
+BUNDLED_DIR = Path(__file__).parent / "data"
+
+
+class OpeningBook:
+
+    MAGIC = b"TGOB"
+    VERSION = 2
+    HEADER = struct.Struct("<4sBBBxI")      # magic, version, rows, columns, (pad), record count
+    RECORD = struct.Struct("<QBi")          # position key, column, score
+
+    def __init__(self, path: str | Path):
+        """ | Arg  | Description
+            |------|-------------
+            | path | - Path of a book file written by write_book """
+
+        self.path = Path(path)
+        with open(self.path, "rb") as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self.mmap) < self.HEADER.size:
+            self.mmap.close()
+            raise ValueError(f"{self.path} is not an opening book.")
+        magic, version, self.rows, self.columns, self.count = self.HEADER.unpack_from(self.mmap, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            self.mmap.close()
+            raise ValueError(f"{self.path} is not a version {self.VERSION} opening book.")
+        if len(self.mmap) != self.HEADER.size + self.count * self.RECORD.size:
+            self.mmap.close()
+            raise ValueError(f"{self.path} is truncated.")
+
+    @classmethod
+    def find(cls, name: str) -> OpeningBook | None:
+        """Opens the book called `name` from the cache directory, else the bundled one.
+        Returns None if there is no usable book."""
+
+        for directory in (cache_dir(), BUNDLED_DIR):
+            path = directory / name
+            if path.is_file():
+                try:
+                    return cls(path)
+                except (OSError, ValueError):
+                    continue
+        return None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def probe(self, key: int) -> tuple[int, int] | None:
+        """Binary searches the records for a position key.
+
+            Returns:
+                tuple[int, int]: column, score. None if the position is not in the book."""
+
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            record_key, column, score = self.RECORD.unpack_from(
+                self.mmap, self.HEADER.size + middle * self.RECORD.size
+            )
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                return column, score
+        return None
+
+    #* Called by: GameManager.computer_turn_worker
+    def lookup(self, board: BitBoard) -> tuple[int, int] | None:
+        """Returns the book move (row, col) for the board, or None if it is not in the book."""
+
+        if not isinstance(board, BitBoard) or (board.rows, board.columns) != (self.rows, self.columns):
+            return None
+
+        key, mirrored = canonical_key(board)
+        entry = self.probe(key)
+        if entry is None:
+            return None
+        column = entry[0]
+        if mirrored:
+            column = self.columns - 1 - column
+        row = board.landing_row(column)
+        if row is None:
+            return None         # can only happen with a corrupt book
+        return row, column
+
+    def close(self):
+        self.mmap.close()
+
+
+def canonical_key(board: BitBoard) -> tuple[int, bool]:
+    """Returns the smaller of the position keys of the board and its mirror image,
+    and True if that was the mirror image's."""
+
+    key = board.position_key()
+    mirror_key = board.mirrored().position_key()
+    if mirror_key < key:
+        return mirror_key, True
+    return key, False
+
+
+#* Called by: main
+def write_book(path: str | Path, rows: int, columns: int, entries: dict[int, tuple[int, int]]):
+    """Writes a book file. `entries` maps canonical position keys to (column, score)."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_suffix(path.suffix + ".tmp")
+    with open(temporary, "wb") as file:
+        file.write(OpeningBook.HEADER.pack(OpeningBook.MAGIC, OpeningBook.VERSION, rows, columns, len(entries)))
+        for key in sorted(entries):
+            column, score = entries[key]
+            file.write(OpeningBook.RECORD.pack(key, column, score))
+    temporary.replace(path)     # never leave a half-written book where the app can find it
+
+
+#* Called by: main
+def build_book(
+        rules: GameRules,
+        plies: int,
+        depth: int,
+        tt_megabytes: float = 64,
+        progress: bool = False,
+    ) -> dict[int, tuple[int, int]]:
+    """Searches every position the AI can face in the first `plies` moves, if it
+    plays book moves itself. The human (player 1) moves first, so the AI is to
+    move after 1, 3, 5... pieces.
+
+        | Arg          | Description
+        |--------------|-------------
+        | rules        | - The game's rules. Its boards must be BitBoards.
+        | plies        | - The book covers positions with up to this many pieces on the board
+        | depth        | - Search depth of every book position
+        | tt_megabytes | - Memory cap of the transposition table shared by all the searches
+        | progress     | - Print a line to stderr for every searched position """
+
+    zobrist = ZobristKeys(rules.rows, rules.columns, seed=0)
+    engine = SearchEngine(
+        rules,
+        zobrist,
+        TranspositionTable(tt_megabytes),
+        MoveOrderer(rules.move_priority),
+        SearchAlgorithm.NEGAMAX,
+    )
+    entries: dict[int, tuple[int, int]] = {}
+    start_time = perf_counter()
+
+    def walk(board: BitBoard, player: int):
+
+        if board.move_count > plies:
+            return
+
+        if player == 1:
+            for move in rules.get_possible_moves(board):
+                rules.apply_move(board, move, 1)
+                if rules.check_result(board, *move, 1, board.move_count) is None:
+                    walk(board, 2)
+                rules.undo_move(board, move, 1)
+            return
+
+        key, mirrored = canonical_key(board)
+        if key in entries:
+            column = entries[key][0]
+            if mirrored:
+                column = rules.columns - 1 - column
+        else:
+            board_key = zobrist.hash_board(board.to_list())
+            row, column = engine.search(board.copy(), board_key, board.move_count, depth)
+            score = engine.iterations[-1][1]
+            entries[key] = (rules.columns - 1 - column if mirrored else column, score)
+            if progress:
+                print(
+                    f"{len(entries):>5} positions  {board.move_count} pieces  "
+                    f"column {column}  score {score}  {perf_counter() - start_time:.1f}s",
+                    file=sys.stderr,
+                )
+
+        move = (board.landing_row(column), column)
+        rules.apply_move(board, move, 2)
+        if rules.check_result(board, *move, 2, board.move_count) is None:
+            walk(board, 1)
+        rules.undo_move(board, move, 2)
+
+    walk(rules.new_board(), 1)
+    return entries
+
+
+def main(argv: list[str] | None = None):
+
+    from textual_games.games.connectfour import ConnectFourRules       # imports Textual
+
+    parser = argparse.ArgumentParser(description="Build the Connect Four opening book.")
+    parser.add_argument("--plies", type=int, default=5, help="cover positions with up to this many pieces")
+    parser.add_argument("--depth", type=int, default=12, help="search depth of every book position")
+    parser.add_argument("--tt-megabytes", type=float, default=64)
+    parser.add_argument("--output", help=f"book file (default: {ConnectFourRules.opening_book} in the cache directory)")
+    args = parser.parse_args(argv)
+
+    rules = ConnectFourRules(6, 7)
+    output = Path(args.output) if args.output else cache_dir() / rules.opening_book
+    entries = build_book(rules, args.plies, args.depth, args.tt_megabytes, progress=True)
+    write_book(output, rules.rows, rules.columns, entries)
+    print(f"Wrote {len(entries)} positions to {output}", file=sys.stderr)
+
@@ -0,0 +1,335 @@
+"""Root-parallel search over a pool of worker processes. \n
+
+A thread can't use more than one core because of the GIL, so this splits the
+root moves of every iterative deepening iteration across a ProcessPoolExecutor.
+It uses the "young brothers wait" idea at the root: the first (best ordered)
+move is searched alone to get a good alpha, then all the other moves are searched
+in parallel with that alpha. Whenever a worker finds a better score it raises the
+shared alpha, so siblings that start later search with a tighter window.
+
+The pool is created once and kept warm for the lifetime of the app. Every worker
+process keeps its own SearchEngine (and transposition table) for the current game."""
+
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from time import monotonic
+from typing import Any, Callable
+from multiprocessing import resource_tracker
+import importlib.util
+import multiprocessing
+import os
+import pickle
+import sys
+
+from textual_games.enums import Replacement, SearchAlgorithm, MoveSource
+from textual_games.rules import GameRules
+from textual_games.search import SearchEngine, SearchTimeout, is_win_score
+from textual_games.transposition import ZobristKeys, TranspositionTable
+from textual_games.move_ordering import MoveOrderer
+from textual_games.stats import SearchStats
+
+
+###~ Worker process side ~###
+
+_shared_alpha = None                        # multiprocessing.Value, set by _init_worker
+_stop = None                                # multiprocessing.Value, nonzero to cancel the search
+_engines: dict[int, SearchEngine] = {}      # game_id -> engine. Only the current game is kept.
+_turns: dict[int, int] = {}                 # game_id -> last turn seen, to age the TT once per turn
+
+
+def _init_worker(shared_alpha, stop):
+    global _shared_alpha, _stop
+    _shared_alpha = shared_alpha
+    _stop = stop
+
+
+def _stopped() -> bool:
+    return bool(_stop.value)
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def _load_module(name: str, path: str | None):
+    """Game modules are loaded from a file path by the GameLoader, so a fresh worker
+    process can't import them by name. Load the module by path before unpickling."""
+
+    if name in sys.modules or path is None:
+        return
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+
+def _engine_for(game_id: int, setup: tuple) -> SearchEngine:
+
+    engine = _engines.get(game_id)
+    if engine is None:
+        module_name, module_path, rules_bytes, zobrist, tt_megabytes, tt_replacement, move_ordering, algorithm = setup
+        _load_module(module_name, module_path)
+        rules: GameRules = pickle.loads(rules_bytes)
+        engine = SearchEngine(
+            rules,
+            zobrist,
+            TranspositionTable(tt_megabytes, tt_replacement),
+            MoveOrderer(rules.move_priority) if move_ordering else None,
+            algorithm,
+        )
+        _engines.clear()
+        _engines[game_id] = engine
+    return engine
+
+
+#* Called by: ParallelSearch.submit (in a worker process)
+def _search_root_move(
+        game_id: int,
+        setup: tuple,
+        turn: int,
+        board: Any,
+        key: int,
+        move_count: int,
+        move: tuple[int, int],
+        search_depth: int,
+        alpha: float,
+        deadline: float | None,
+        node_budget: int | None,
+    ) -> tuple[tuple[int, int], float | None, float, int, int, list[int], list[int]]:
+    """Searches the subtree below one root move.
+
+        Returns:
+            tuple: move, score (None if the budget ran out), the alpha it was searched with
+            (the score is exact only if it is above it), nodes searched, worker pid,
+            nodes per depth, cutoffs per depth"""
+
+    engine = _engine_for(game_id, setup)
+    if _turns.get(game_id) != turn:
+        _turns.clear()
+        _turns[game_id] = turn
+        engine.new_turn()
+    engine.reset_counters()
+    engine.deadline = deadline
+    engine.node_budget = node_budget
+    engine.budget_active = search_depth > 1     # the first iteration always completes
+    engine.should_stop = _stopped
+    engine.move_count = move_count
+    engine.search_depth = search_depth
+
+    alpha = max(alpha, _shared_alpha.value)
+    try:
+        score = engine.score_root_move(board, move, key, alpha)
+    except SearchTimeout:
+        return move, None, alpha, engine.minimax_counter, os.getpid(), engine.nodes_per_depth, engine.cutoffs_per_depth
+
+    with _shared_alpha.get_lock():
+        if score > _shared_alpha.value:
+            _shared_alpha.value = score
+    return move, score, alpha, engine.minimax_counter, os.getpid(), engine.nodes_per_depth, engine.cutoffs_per_depth
+
+
+###~ App side ~###
+
+class ParallelSearch:
+
+    def __init__(self, workers: int):
+        """ | Arg     | Description
+            |---------|-------------
+            | workers | - Number of worker processes """
+
+        # Textual captures sys.stderr while the app is running, and the resource tracker
+        # process (needed for the shared alpha) must be handed a real file descriptor.
+        stderr, sys.stderr = sys.stderr, sys.__stderr__
+        try:
+            resource_tracker.ensure_running()
+        finally:
+            sys.stderr = stderr
+
+        context = multiprocessing.get_context("spawn")      # fork is unsafe with the app's threads
+        self.workers = workers
+        self.shared_alpha = context.Value("d", float('-inf'))
+        self.stop = context.Value("b", 0)
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.shared_alpha, self.stop),
+        )
+        self.game_id = 0
+        self.turn = 0
+        self.setup: tuple | None = None
+        self.stats: SearchStats | None = None          # of the last finished search
+
+        # Start every process now, so the first move doesn't pay for spawning them.
+        for _ in range(workers):
+            self.executor.submit(_warm_up)
+
+    #* Called by: GameManager.start_game, GameManager.restart_game
+    def new_game(
+        self,
+        rules: GameRules,
+        zobrist: ZobristKeys,
+        tt_megabytes: float,
+        tt_replacement: Replacement,
+        move_ordering: bool,
+        algorithm: SearchAlgorithm,
+    ):
+        """Starts a new game. Workers build a fresh engine (and an empty TT) on their next task."""
+
+        module = sys.modules[type(rules).__module__]
+        self.game_id += 1
+        self.cells = rules.rows * rules.columns
+        self.algorithm = algorithm
+        self.setup = (
+            module.__name__,
+            getattr(module, "__file__", None),
+            pickle.dumps(rules),
+            zobrist,
+            tt_megabytes,
+            tt_replacement,
+            move_ordering,
+            algorithm,
+        )
+
+    #* Called by: GameManager.computer_turn_worker
+    def search(
+        self,
+        board: Any,
+        key: int,
+        move_count: int,
+        max_depth: int,
+        root_moves: list[tuple[int, int]],
+        time_budget: float | None = None,
+        node_budget: int | None = None,
+        should_stop: Callable[[], bool] | None = None,
+    ) -> tuple[int, int] | None:
+        """Iterative deepening with every iteration split across the workers.
+        Takes the same arguments as SearchEngine.search, plus the ordered root moves
+        and an optional should_stop that is checked between tasks. \n
+        The node budget applies to each root move separately."""
+
+        self.stop.value = 0
+        self.turn += 1
+        start_time = monotonic()
+        deadline = start_time + time_budget if time_budget else None
+        root_moves = list(root_moves)
+        self.worker_nodes: dict[int, int] = {}
+        self.iterations: list[tuple[int, int, tuple[int, int], int, float]] = []
+        self.nodes = 0
+        nodes_per_depth = [0] * (self.cells + 1)
+        cutoffs_per_depth = [0] * (self.cells + 1)
+        best_move = None
+
+        for search_depth in range(1, min(max_depth, self.cells - move_count) + 1):
+            if should_stop is not None and should_stop():
+                break
+            args = (board, key, move_count)
+
+            # Eldest brother first, alone, to get an alpha for its siblings.
+            self.shared_alpha.value = float('-inf')
+            first = self.submit(*args, root_moves[0], search_depth, float('-inf'), deadline, node_budget)
+            results = [first.result()]
+            if results[0][1] is not None:
+                alpha = results[0][1]
+                siblings = [
+                    self.submit(*args, move, search_depth, alpha, deadline, node_budget)
+                    for move in root_moves[1:]
+                ]
+                results.extend(future.result() for future in siblings)
+            researches = self.resolve_ties(results, args, search_depth, deadline, node_budget)
+
+            for _, _, _, nodes, pid, depth_nodes, depth_cutoffs in results + list(researches.values()):
+                self.worker_nodes[pid] = self.worker_nodes.get(pid, 0) + nodes
+                self.nodes += nodes
+                for depth, count in enumerate(depth_nodes):
+                    nodes_per_depth[depth] += count
+                for depth, count in enumerate(depth_cutoffs):
+                    cutoffs_per_depth[depth] += count
+            for index, result in researches.items():
+                results[index] = result
+            if any(result[1] is None for result in results):
+                break       # budget ran out, keep the move from the deepest completed iteration
+
+            best_move, best_score = self.best_result(results)
+            self.iterations.append(
+                (search_depth, best_score, best_move, self.nodes, monotonic() - start_time)
+            )
+
+            # Seed the next iteration with this iteration's best move.
+            root_moves.remove(best_move)
+            root_moves.insert(0, best_move)
+
+            if is_win_score(best_score):
+                break       # forced win or loss found, deeper search won't change it
+
+        self.stats = SearchStats(
+            MoveSource.SEARCH,
+            best_move,
+            self.algorithm,
+            seconds=monotonic() - start_time,
+            nodes=self.nodes,
+            nodes_per_depth=nodes_per_depth,
+            cutoffs_per_depth=cutoffs_per_depth,
+            iterations=self.iterations,
+            worker_nodes=self.worker_nodes,
+        )
+        return best_move
+
+    #* Called by: self.search
+    @staticmethod
+    def best_result(results: list[tuple]) -> tuple[tuple[int, int], float]:
+        """Returns the move and score of the first result with the best exact score. 
+
+        Only scores above the alpha a task searched with are exact. The others are upper
+        bounds, at most that alpha, which came from an exact score, so they can't be
+        better. Ties with them are searched again by resolve_ties first. This picks the
+        move the serial search would (it keeps the first of equal moves)."""
+
+        best_move, best_score = results[0][0], results[0][1]       # searched with no alpha, always exact
+        for move, score, alpha, *_ in results[1:]:
+            if score > alpha and score > best_score:
+                best_move, best_score = move, score
+        return best_move, best_score
+
+    #* Called by: self.search
+    def resolve_ties(
+            self,
+            results: list[tuple],
+            args: tuple,
+            search_depth: int,
+            deadline: float | None,
+            node_budget: int | None,
+        ) -> dict[int, tuple]:
+        """A sibling whose upper bound equals the best exact score may tie with the best move.
+        Searches those again with a full window, so their scores are exact too. Only ties
+        with a move later in the root order change the choice, but they are rare enough
+        that every one is searched again.
+
+            Returns:
+                dict: index in `results` -> the result of searching that move again"""
+
+        if any(score is None for _, score, *_ in results):
+            return {}       # the budget ran out, this iteration is thrown away
+        best_exact = max(score for _, score, alpha, *_ in results if score > alpha)
+        researches = {}
+        for index, (move, score, alpha, *_) in enumerate(results):
+            if score is not None and score <= alpha and score == best_exact:
+                self.shared_alpha.value = float('-inf')     # a task searches with the higher of the two
+                researches[index] = self.submit(*args, move, search_depth, float('-inf'), deadline, node_budget).result()
+        return researches
+
+    #* Called by: GameManager.cancel_search
+    def cancel(self):
+        """Makes every running task return within 1024 nodes, and every queued task at once."""
+        self.stop.value = 1
+
+    def submit(self, board, key, move_count, move, search_depth, alpha, deadline, node_budget):
+        return self.executor.submit(
+            _search_root_move,
+            self.game_id, self.setup, self.turn,
+            board, key, move_count, move, search_depth, alpha, deadline, node_budget,
+        )
+
+    #* Called by: GameManager.on_unmount
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
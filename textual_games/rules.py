@@ -0,0 +1,168 @@
+"""Base class for the rules of a game. \n
+
+Rules objects hold the pure game logic: the board, legal moves, apply/undo and
+the terminal check. They have no Textual state, so the GameManager and the search
+call them directly (also from a worker thread), and the parallel search can pickle
+them into worker processes. Each game module provides a subclass, and the game
+widget creates an instance as `self.rules`. The widget itself is only a view.
+
+The default board is a 2D integer board (0 = empty, 1 = player 1, 2 = player 2).
+Games can use any other board type by overriding the board methods.
+
+Games can also give the search a heuristic with `evaluate`. Without one, every
+position at the search's depth limit scores as a draw, so the AI only sees wins
+and losses inside its horizon."""
+
+from __future__ import annotations
+from copy import deepcopy
+from typing import Any
+
+from textual_games.enums import PlayerState
+
+
+WIN = 100_000
+"""Score of a win at the root of the search. A win found `depth` plies down scores
+WIN - depth (and a loss -WIN + depth), so the search prefers the quickest win."""
+
+EVAL_LIMIT = WIN // 2
+"""evaluate() scores are clamped to this, so they can never be mistaken for a win."""
+
+
+class GameRules:
+
+    opening_book: str | None = None
+    """File name of the game's opening book (see opening_book.py), or None for no book."""
+
+    def __init__(self, rows: int, columns: int):
+        """ | Arg     | Description
+            |---------|-------------
+            | rows    | - The number of rows on the board
+            | columns | - The number of columns on the board """
+
+        self.rows = rows
+        self.columns = columns
+
+    #* Called by: GameManager.get_opening_book
+    def load_opening_book(self) -> Any | None:
+        """Opens the game's opening book, or returns None if it has none. \n
+        A book is any object with `lookup(board)`, returning a move or None, and `close()`.
+        The default opens the OpeningBook file named by `opening_book`."""
+
+        if self.opening_book is None:
+            return None
+        from textual_games.opening_book import OpeningBook      # opening_book imports this module
+        return OpeningBook.find(self.opening_book)
+
+    #* Called by: GameManager.reset_board
+    def new_board(self) -> Any:
+        """Returns an empty board."""
+        return [[0 for _ in range(self.columns)] for _ in range(self.rows)]
+
+    #* Called by: GameManager.computer_turn_orch
+    def copy_board(self, board: Any) -> Any:
+        """Returns a copy of the board that the search can modify."""
+        return deepcopy(board)
+
+    #* Called by: GameManager.cell_pressed
+    def is_empty(self, board: Any, row: int, col: int) -> bool:
+        return board[row][col] == 0
+
+    # NOTE: apply_move and undo_move run on every node of the search, keep them cheap.
+    #* Called by: GameManager.place_piece, SearchEngine.minimax, parallel._search_root_move
+    def apply_move(self, board: Any, move: tuple[int, int], player: int):
+        row, col = move
+        board[row][col] = player
+
+    #* Called by: SearchEngine.minimax
+    def undo_move(self, board: Any, move: tuple[int, int], player: int):
+        """Takes back `move`, which must be the last move played."""
+        row, col = move
+        board[row][col] = 0
+
+    def get_possible_moves(self, board: Any) -> list[tuple[int, int]]:
+        """Returns a list of tuples representing coordinates of legal moves."""
+        raise NotImplementedError
+
+    #* Called by: GameManager.place_piece
+    def landing_row(self, board: Any, col: int) -> int | None:
+        """Returns the row of the legal move in column `col` (the lowest one, if there are
+        several), or None if the column has none. Gravity games can override this with
+        an O(1) lookup. The default scans the legal moves."""
+
+        row = None
+        for move_row, move_col in self.get_possible_moves(board):
+            if move_col == col:
+                row = move_row
+        return row
+
+    def check_move(self, board: Any, row: int, col: int, player: int) -> PlayerState | None:
+        """Returns the PlayerState of `player` if the piece just placed at (row, col) wins.
+        Draws are detected by the caller from the move counter."""
+        raise NotImplementedError
+
+    def calculate_winner(self, board: Any) -> PlayerState | None:
+        """Returns a PlayerState if the game is over, else returns None. Scans the whole board."""
+        raise NotImplementedError
+
+    #* Called by: GameManager.cell_pressed, GameManager.computer_turn_orch, SearchEngine.minimax
+    def check_result(self, board: Any, row: int, col: int, player: int, move_count: int) -> PlayerState | None:
+        """Returns a PlayerState if the move just played at (row, col) ended the game, else None.
+
+            | Arg        | Description
+            |------------|-------------
+            | move_count | - Number of pieces on the board, including this move """
+
+        result = self.check_move(board, row, col, player)
+        if result is None and move_count == self.rows * self.columns:
+            return PlayerState.EMPTY
+        return result
+
+    # NOTE: This runs on every leaf of the search, keep it cheap.
+    #* Called by: SearchEngine.minimax, SearchEngine.negamax
+    def evaluate(self, board: Any, player: int) -> int:
+        """Heuristic score of an unfinished position from the point of view of `player`:
+        positive if `player` stands better. The search calls it at its depth limit. \n
+        Scores should stay well inside ±EVAL_LIMIT. The search's aspiration window
+        (SearchEngine.ASPIRATION_WINDOW) is tuned on Connect Four's evaluate, where a
+        single threat is worth about 50 points and scores move by up to a hundred or
+        so between iterations. The default scores every position as a draw."""
+        return 0
+
+    #* Called by: SearchEngine.order_root_moves
+    def evaluate_moves(self, board: Any, moves: list[tuple[int, int]], player: int) -> list[int]:
+        """Returns evaluate() of the board after each of `moves` is played by `player`.
+        Games with a batched evaluator (see kernel.py) can score all the moves at once."""
+
+        scores = []
+        for move in moves:
+            self.apply_move(board, move, player)
+            scores.append(self.evaluate(board, player))
+            self.undo_move(board, move, player)
+        return scores
+
+    def move_priority(self, move: tuple[int, int]) -> int:
+        """Static ordering score of a move for the AI search. Higher is searched first. \n
+        The default is center-first. Games can override it with something smarter."""
+
+        row, col = move
+        return -(abs(2 * row - (self.rows - 1)) + abs(2 * col - (self.columns - 1)))
+
+    @staticmethod
+    def streak_through(board: list[list[int]], row: int, col: int, player: int, streak: int) -> bool:
+        """Returns True if the piece at (row, col) is part of `streak` pieces in a row
+        for `player`. Only the four lines through that cell are examined."""
+
+        rows = len(board)
+        columns = len(board[0])
+        for row_step, col_step in ((0, 1), (1, 0), (1, 1), (1, -1)):   # horizontal, vertical, both diagonals
+            count = 1
+            for direction in (1, -1):
+                r = row + row_step * direction
+                c = col + col_step * direction
+                while 0 <= r < rows and 0 <= c < columns and board[r][c] == player:
+                    count += 1
+                    r += row_step * direction
+                    c += col_step * direction
+            if count >= streak:
+                return True
+        return False
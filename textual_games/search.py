@@ -0,0 +1,527 @@
+"""Alpha-beta search engine for the computer player. \n
+
+The engine only talks to a GameRules object, never to the Textual app, so the
+GameManager can run it in a worker thread and the parallel search (parallel.py)
+can run it inside worker processes."""
+
+from __future__ import annotations
+from time import monotonic
+from typing import Any, Callable
+
+from textual_games.enums import PlayerState, Bound, SearchAlgorithm, MoveSource
+from textual_games.rules import GameRules, WIN, EVAL_LIMIT
+from textual_games.transposition import ZobristKeys, TranspositionTable
+from textual_games.move_ordering import MoveOrderer
+from textual_games.stats import SearchStats
+
+
+class SearchTimeout(Exception):
+    """Raised inside minimax when the time or node budget of the current move runs out."""
+
+
+class SearchEngine:
+
+    ASPIRATION_WINDOW = 100
+    """Half-width of the root window around the previous iteration's score (NEGAMAX only).
+    Connect Four's evaluate() scores move by up to a hundred or so between iterations
+    (a threat alone is 48 + 32), so a narrower window fails on most of them."""
+
+    def __init__(
+            self,
+            rules: GameRules,
+            zobrist: ZobristKeys,
+            transposition_table: TranspositionTable,
+            move_orderer: MoveOrderer | None,
+            algorithm: SearchAlgorithm = SearchAlgorithm.MINIMAX,
+        ):
+        """ | Arg                 | Description
+            |---------------------|-------------
+            | rules               | - The game's rules
+            | zobrist             | - Zobrist keys for the board size
+            | transposition_table | - Kept for the whole game, cleared on restart
+            | move_orderer        | - None searches moves in generation order
+            | algorithm           | - MINIMAX, or NEGAMAX (principal-variation search with aspiration windows) """
+
+        self.rules = rules
+        self.zobrist = zobrist
+        self.transposition_table = transposition_table
+        self.move_orderer = move_orderer
+        self.algorithm = algorithm
+        self.cells = rules.rows * rules.columns
+        self.deadline: float | None = None
+        self.node_budget: int | None = None
+        self.budget_active = False
+        self.should_stop: Callable[[], bool] | None = None    # polled with the budget. True stops the search.
+        self.stats: SearchStats | None = None                  # of the last finished search
+        self.reset_counters()
+
+    #* Called by: self.search, parallel._search_root_move
+    def new_turn(self):
+        "Ages the transposition table and the move orderer's history at the start of an AI turn."
+
+        self.transposition_table.new_search()
+        if self.move_orderer is not None:
+            self.move_orderer.new_search()
+
+    #* Called by: self.search, parallel._search_root_move
+    def reset_counters(self):
+        "Resets the per-move statistics."
+
+        self.minimax_counter = 0
+        self.pruning_counter = 0
+        self.depth_limit_counter = 0
+        self.first_move_cutoffs = 0
+        self.research_counter = 0           # PVS null-window searches that had to be searched again
+        self.aspiration_failures = 0        # root searches that fell outside the aspiration window
+        self.nodes_per_depth = [0] * (self.cells + 1)
+        self.cutoffs_per_depth = [0] * (self.cells + 1)
+        self.iterations: list[tuple[int, int, tuple[int, int], int, float]] = []
+        self.transposition_table.hits = 0
+
+    #* Called by: GameManager.computer_turn_worker
+    def search(
+        self,
+        board: Any,
+        key: int,
+        move_count: int,
+        max_depth: int,
+        time_budget: float | None = None,
+        node_budget: int | None = None,
+    ) -> tuple[int, int]:
+        """Finds the AI's move by iterative deepening: depth 1, 2, 3... until the budget runs out.
+        The first iteration always completes, so there is always a move to play.
+
+            | Arg         | Description
+            |-------------|-------------
+            | board       | - A copy of the board (made by rules.copy_board). The AI (player 2) is to move.
+            | key         | - Zobrist key of the board
+            | move_count  | - Number of pieces on the board
+            | max_depth   | - The deepest iteration allowed
+            | time_budget | - Seconds allowed for this move (None for no limit)
+            | node_budget | - Nodes allowed for this move (None for no limit)
+
+            Returns:
+                tuple[int, int]: the best move of the deepest completed iteration.
+                Statistics of the search are left in self.stats."""
+
+        self.new_turn()
+        self.reset_counters()
+        root_board = self.rules.copy_board(board)       # the PV is read from here, whatever happens to `board`
+        start_time = monotonic()
+        self.deadline = start_time + time_budget if time_budget else None
+        self.node_budget = node_budget
+        self.budget_active = False
+        self.move_count = move_count
+        self.root_moves = self.order_root_moves(board, key)
+        best_move = None
+        score = None
+        self.search_depth = 0
+
+        for search_depth in range(1, min(max_depth, self.cells - move_count) + 1):
+            self.search_depth = search_depth
+            try:
+                if self.algorithm == SearchAlgorithm.NEGAMAX:
+                    score, move = self.aspiration_search(board, key, score)
+                else:
+                    score, move = self.minimax(
+                        board,
+                        depth=0,                 # always start at depth 0
+                        is_maximizing=True,      # AI is maximizer
+                        alpha=float('-inf'),
+                        beta=float('inf'),
+                        key=key,
+                    )
+            except SearchTimeout:
+                break       # keep the move from the deepest completed iteration
+
+            best_move = move
+            self.budget_active = True
+            self.iterations.append(
+                (search_depth, score, move, self.minimax_counter, monotonic() - start_time)
+            )
+
+            # Seed the next iteration with this iteration's best move.
+            self.root_moves.remove(move)
+            self.root_moves.insert(0, move)
+
+            if is_win_score(score):
+                break       # forced win or loss found, deeper search won't change it
+
+        self.stats = self.collect_stats(root_board, key, best_move, monotonic() - start_time)
+        return best_move
+
+    #* Called by: self.search
+    def collect_stats(self, board: Any, key: int, move: tuple[int, int] | None, seconds: float) -> SearchStats:
+
+        return SearchStats(
+            MoveSource.SEARCH,
+            move,
+            self.algorithm,
+            seconds,
+            self.minimax_counter,
+            self.nodes_per_depth,
+            self.cutoffs_per_depth,
+            self.first_move_cutoffs,
+            self.depth_limit_counter,
+            self.transposition_table.hits,
+            len(self.transposition_table),
+            self.research_counter,
+            self.aspiration_failures,
+            list(self.iterations),
+            self.principal_variation(board, key, move),
+        )
+
+    #* Called by: self.collect_stats
+    def principal_variation(self, board: Any, key: int, move: tuple[int, int] | None) -> list[tuple[int, int]]:
+        """Follows the best moves stored in the transposition table from the root,
+        starting with `move`. Stops at the search depth, a missing entry or the end of the game."""
+
+        line: list[tuple[int, int]] = []
+        player = 2
+        while move is not None and len(line) < max(self.search_depth, 1):
+            if move not in self.rules.get_possible_moves(board):
+                break       # an entry for another position with the same key
+            line.append(move)
+            self.rules.apply_move(board, move, player)
+            key ^= self.zobrist.pieces[player][move[0]][move[1]]
+            if self.rules.check_result(board, *move, player, self.move_count + len(line)) is not None:
+                break
+            player = 3 - player
+            entry = self.transposition_table.probe(key)
+            move = entry.best_move if entry is not None else None
+            if move == (None, None):
+                move = None
+
+        for index in range(len(line) - 1, -1, -1):
+            self.rules.undo_move(board, line[index], 2 if index % 2 == 0 else 1)
+        return line
+
+    #* Called by: self.search
+    def aspiration_search(self, board: Any, key: int, previous_score: int | None) -> tuple[int, tuple[int, int]]:
+        """Searches the root with a narrow window around the previous iteration's score.
+        If the score falls outside the window, only the side that failed is widened,
+        twice as far each time, and the root is searched again. A win or loss score
+        opens that side fully, since no heuristic window would reach it."""
+
+        window = self.ASPIRATION_WINDOW
+        if previous_score is None:
+            alpha, beta = float('-inf'), float('inf')       # first iteration: nothing to aim at
+        else:
+            alpha = previous_score - window
+            beta  = previous_score + window
+
+        while True:
+            score, move = self.negamax(board, 0, alpha, beta, key)
+            if score <= alpha:                  # fail low: the true score is at most this
+                window *= 2
+                alpha = float('-inf') if is_win_score(score) else previous_score - window
+            elif score >= beta:                 # fail high: the true score is at least this
+                window *= 2
+                beta = float('inf') if is_win_score(score) else previous_score + window
+            else:
+                return score, move
+            self.aspiration_failures += 1
+
+    #* Called by: parallel._search_root_move
+    def score_root_move(self, board: Any, move: tuple[int, int], key: int, alpha: float) -> int:
+        """Plays one root move for the AI and returns its score, searched with the window (alpha, inf).
+        Scores at or below alpha are upper bounds, scores above it are exact."""
+
+        row, col = move
+        self.rules.apply_move(board, move, 2)
+        child_key = key ^ self.zobrist.pieces[2][row][col]
+        try:
+            if self.algorithm == SearchAlgorithm.NEGAMAX:
+                return -self.negamax(board, 1, float('-inf'), -alpha, child_key, move)[0]
+            return self.minimax(board, 1, False, alpha, float('inf'), child_key, move)[0]
+        finally:
+            self.rules.undo_move(board, move, 2)
+
+    #* Called by: self.search, ParallelSearch.search
+    def order_root_moves(self, board: Any, key: int) -> list[tuple[int, int]]:
+        """Orders the root moves for the first iteration: the TT move first, then by the
+        game's evaluation of the position after each move (scored in one batch), with
+        ties in the move orderer's order. Later iterations put the best move first."""
+
+        moves = self.order_moves(board, key, 2, 0)
+        entry = self.transposition_table.probe(key)
+        tt_move = entry.best_move if entry is not None else None
+        scores = self.rules.evaluate_moves(board, moves, 2)
+        ranked = sorted(range(len(moves)), key=lambda index: (moves[index] != tt_move, -scores[index]))
+        return [moves[index] for index in ranked]
+
+    #* Called by: self.order_root_moves, GameManager.ponder_worker
+    def order_moves(self, board: Any, key: int, player: int, ply: int) -> list[tuple[int, int]]:
+        """Returns the legal moves of `player`, most promising first. `ply` is the depth
+        below the AI's root the moves are played at, for the killer moves."""
+
+        moves = self.rules.get_possible_moves(board)
+        if self.move_orderer is not None:
+            entry = self.transposition_table.probe(key)
+            tt_move = entry.best_move if entry is not None else None
+            moves = self.move_orderer.order(moves, ply, player, tt_move)
+        return moves
+
+    #* Called by: self.minimax, self.negamax
+    def check_budget(self):
+        """Raises SearchTimeout if the time or node budget of this move is used up,
+        or if should_stop says so (even during the first iteration)."""
+
+        if self.should_stop is not None and self.should_stop():
+            raise SearchTimeout
+        if not self.budget_active:
+            return
+        if self.deadline is not None and monotonic() >= self.deadline:
+            raise SearchTimeout
+        if self.node_budget is not None and self.minimax_counter >= self.node_budget:
+            raise SearchTimeout
+
+    #* Called by: self.search, self.minimax, self.score_root_move
+    def minimax(
+        self,
+        board: Any,
+        depth: int,
+        is_maximizing: bool,
+        alpha: float,
+        beta: float,
+        key: int,
+        last_move: tuple[int, int] | None = None,
+    ) -> tuple[int, tuple[int, int]]:
+        """ | Arg           | Description
+            |---------------|---------------------
+            | board         | - The current game board state
+            | depth         | - Current depth in the game tree
+            | is_maximizing | - True if AI's turn (maximizing), False if human's turn (minimizing)
+            | key           | - Zobrist key of the board
+            | last_move     | - The move that led to this board (None at the root)
+
+            Returns:
+                tuple[int, tuple[int, int]]: best_score, best_move (as tuple of coordinates)"""
+
+        self.minimax_counter += 1
+        self.nodes_per_depth[depth] += 1
+        if self.minimax_counter & 1023 == 0:
+            self.check_budget()
+
+        if last_move is not None:
+            last_player = 1 if is_maximizing else 2     # the other side made the last move
+            result = self.rules.check_result(board, *last_move, last_player, self.move_count + depth)
+        else:
+            result = None       # the root is never a finished game
+
+        # Base cases: game over scenarios
+        if result == PlayerState.PLAYER1:     # Human is minimizer
+            return -WIN + depth, None
+        elif result == PlayerState.PLAYER2:   # AI is maximizer
+            return WIN - depth, None
+        elif result == PlayerState.EMPTY:     # Draw
+            return 0, None
+
+        if depth >= self.search_depth:
+            self.depth_limit_counter += 1
+            return self.evaluate(board, 2), None        # scores are from the AI's point of view
+
+        remaining = self.search_depth - depth
+        entry = self.transposition_table.probe(key)
+        tt_move = entry.best_move if entry is not None else None
+        if entry is not None and entry.depth >= remaining:
+            score = self.score_from_tt(entry.score, depth)
+
+            if entry.bound == Bound.EXACT:
+                return score, entry.best_move
+            elif entry.bound == Bound.LOWER:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if beta <= alpha:
+                return score, entry.best_move
+
+        best_move  = (None, None)
+        best_score = float('-inf') if is_maximizing else float('inf')
+        player     =             2 if is_maximizing else 1
+
+        alpha_window, beta_window = alpha, beta
+        if depth == 0:
+            possible_moves = self.root_moves       # ordered by the previous iteration
+        else:
+            possible_moves = self.rules.get_possible_moves(board)
+            if self.move_orderer is not None:
+                possible_moves = self.move_orderer.order(possible_moves, depth, player, tt_move)
+
+        for index, move in enumerate(possible_moves):
+            row, col = move
+
+            child_key = key ^ self.zobrist.pieces[player][row][col]
+            self.rules.apply_move(board, move, player)
+            try:
+                score, _, = self.minimax(board, depth + 1, not is_maximizing, alpha, beta, child_key, move)
+            finally:
+                self.rules.undo_move(board, move, player)       # also when SearchTimeout unwinds the search
+
+            if is_maximizing and score > best_score:
+                    best_score = score
+                    alpha = max(score, alpha)
+                    best_move = (row, col)
+            elif not is_maximizing and score < best_score:
+                    best_score = score
+                    beta = min(score, beta)
+                    best_move = (row, col)
+
+            if beta <= alpha:
+                self.pruning_counter += 1
+                self.cutoffs_per_depth[depth] += 1
+                if index == 0:
+                    self.first_move_cutoffs += 1
+                if self.move_orderer is not None:
+                    self.move_orderer.record_cutoff(move, depth, player, remaining)
+                break
+
+        if best_score <= alpha_window:
+            bound = Bound.UPPER
+        elif best_score >= beta_window:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+
+        self.transposition_table.store(key, remaining, self.score_to_tt(best_score, depth), bound, best_move)
+
+        return best_score, best_move
+
+    #* Called by: self.aspiration_search, self.negamax, self.score_root_move
+    def negamax(
+        self,
+        board: Any,
+        depth: int,
+        alpha: float,
+        beta: float,
+        key: int,
+        last_move: tuple[int, int] | None = None,
+    ) -> tuple[int, tuple[int, int]]:
+        """Negamax with principal-variation search. Scores are from the point of view of the
+        player to move, so one code path serves both players. The first (best ordered) move
+        is searched with the full window. Every other move is first searched with a null
+        window that only proves it is no better, and searched again only if it is.
+
+            | Arg       | Description
+            |-----------|---------------------
+            | board     | - The current game board state
+            | depth     | - Current depth in the game tree. The AI moves at even depths.
+            | key       | - Zobrist key of the board
+            | last_move | - The move that led to this board (None at the root)
+
+            Returns:
+                tuple[int, tuple[int, int]]: best_score, best_move (as tuple of coordinates)"""
+
+        self.minimax_counter += 1
+        self.nodes_per_depth[depth] += 1
+        if self.minimax_counter & 1023 == 0:
+            self.check_budget()
+
+        player = 2 if depth % 2 == 0 else 1
+        if last_move is not None:
+            result = self.rules.check_result(board, *last_move, 3 - player, self.move_count + depth)
+            if result == PlayerState.EMPTY:     # Draw
+                return 0, None
+            elif result is not None:            # The last move won, so the player to move lost.
+                return -WIN + depth, None
+
+        if depth >= self.search_depth:
+            self.depth_limit_counter += 1
+            return self.evaluate(board, player), None
+
+        remaining = self.search_depth - depth
+        entry = self.transposition_table.probe(key)
+        tt_move = entry.best_move if entry is not None else None
+        if entry is not None and entry.depth >= remaining:
+            score = self.score_from_tt(entry.score, depth)
+            if entry.bound == Bound.EXACT:
+                return score, entry.best_move
+            elif entry.bound == Bound.LOWER:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if beta <= alpha:
+                return score, entry.best_move
+
+        alpha_window = alpha
+        best_move  = (None, None)
+        best_score = float('-inf')
+
+        if depth == 0:
+            possible_moves = self.root_moves       # ordered by the previous iteration
+        else:
+            possible_moves = self.rules.get_possible_moves(board)
+            if self.move_orderer is not None:
+                possible_moves = self.move_orderer.order(possible_moves, depth, player, tt_move)
+
+        for index, move in enumerate(possible_moves):
+            row, col = move
+
+            child_key = key ^ self.zobrist.pieces[player][row][col]
+            self.rules.apply_move(board, move, player)
+            try:
+                if index == 0:
+                    score = -self.negamax(board, depth + 1, -beta, -alpha, child_key, move)[0]
+                else:
+                    score = -self.negamax(board, depth + 1, -alpha - 1, -alpha, child_key, move)[0]
+                    if alpha < score < beta:        # better than the first move after all
+                        self.research_counter += 1
+                        score = -self.negamax(board, depth + 1, -beta, -alpha, child_key, move)[0]
+            finally:
+                self.rules.undo_move(board, move, player)       # also when SearchTimeout unwinds the search
+
+            if score > best_score:
+                best_score = score
+                best_move = move
+                alpha = max(alpha, score)
+
+            if alpha >= beta:
+                self.pruning_counter += 1
+                self.cutoffs_per_depth[depth] += 1
+                if index == 0:
+                    self.first_move_cutoffs += 1
+                if self.move_orderer is not None:
+                    self.move_orderer.record_cutoff(move, depth, player, remaining)
+                break
+
+        if best_score <= alpha_window:
+            bound = Bound.UPPER
+        elif best_score >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        self.transposition_table.store(key, remaining, self.score_to_tt(best_score, depth), bound, best_move)
+
+        return best_score, best_move
+
+    #* Called by: self.minimax, self.negamax
+    def evaluate(self, board: Any, player: int) -> int:
+        "The game's heuristic score of a position at the depth limit, clamped below any win score."
+        return max(-EVAL_LIMIT, min(EVAL_LIMIT, self.rules.evaluate(board, player)))
+
+    @staticmethod
+    def score_to_tt(score: int, depth: int) -> int:
+        """Win scores are relative to the root. Store them relative to the node instead,
+        so the same position reached at another depth gets the right score.
+        Heuristic scores don't depend on the depth and are stored as they are."""
+
+        if score > EVAL_LIMIT:
+            return score + depth
+        elif score < -EVAL_LIMIT:
+            return score - depth
+        return score
+
+    @staticmethod
+    def score_from_tt(score: int, depth: int) -> int:
+        """Converts a stored score back to relative to the root."""
+
+        if score > EVAL_LIMIT:
+            return score - depth
+        elif score < -EVAL_LIMIT:
+            return score + depth
+        return score
+
+
+def is_win_score(score: float) -> bool:
+    """True for the score of a forced win or loss, False for draws and heuristic scores."""
+    return abs(score) > EVAL_LIMIT
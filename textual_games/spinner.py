@@ -1,34 +1,82 @@
 # Textual imports
 from rich.spinner import Spinner
+from textual.timer import Timer
 from textual.widgets import Static
 
 
-class SpinnerWidget(Static):
+class AnimatedStatic(Static):
+    """A Static that draws a new frame on a timer, only while it is on screen. \n
+    The timer is paused on Hide (the widget, or a container it is in, was hidden)
+    and resumed on Show, so a session sitting on a game screen does no animation work."""
+
+    def __init__(self, *args, fps: float = 15, **kwargs):
+        """ | Arg | Description
+            |-----|-------------
+            | fps | - Target frame rate. Can be changed later with set_fps """
+
+        super().__init__(*args, **kwargs)
+        self.fps = fps
+        self.timer: Timer | None = None
+        self.shown = False
+
+    def on_mount(self):
+        self.timer = self.set_interval(1 / self.fps, self.next_frame, pause=True)   # resumed by on_show
+
+    def on_show(self):
+        self.shown = True
+        self.next_frame()           # don't show a stale frame until the first tick
+        if self.timer is not None:
+            self.timer.resume()
+
+    def on_hide(self):
+        self.shown = False
+        if self.timer is not None:
+            self.timer.pause()
+
+    def set_fps(self, fps: float):
+        "Changes the frame rate. A paused animation stays paused."
+
+        self.fps = fps
+        if self.timer is None:
+            return
+        self.timer.stop()
+        self.timer = self.set_interval(1 / fps, self.next_frame, pause=not self.shown)
+
+    def next_frame(self):
+        raise NotImplementedError
+
+
+class SpinnerWidget(AnimatedStatic):
     def __init__(
-            self, 
-            spinner: str, 
-            text: str | None = None, 
-            *args, 
+            self,
+            spinner: str,
+            text: str | None = None,
+            *args,
+            fps: float | None = None,
             **kwargs
         ):
-        super().__init__(*args, **kwargs)
-        self._spinner = Spinner(spinner, text)  
+        """ | Arg     | Description
+            |---------|-------------
+            | spinner | - Name of a Rich spinner
+            | text    | - Text shown next to the spinner
+            | fps     | - Target frame rate. Defaults to the spinner's own frame rate:
+            |         |   drawing more often than the frames change only repeats frames. """
 
-    def on_mount(self) -> None:
-        self.set_interval(1 / 60, self.update_spinner)
+        self._spinner = Spinner(spinner, text)
+        super().__init__(*args, fps=fps or 1000 / self._spinner.interval, **kwargs)
 
-    def update_spinner(self) -> None:
+    def next_frame(self) -> None:
         self.update(self._spinner)
 
 
-class ScrollingLine(Static):
+class ScrollingLine(AnimatedStatic):
 
-    def on_mount(self):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
         self.counter = 0
         self.max = 3
-        self.set_interval(1 / 15, self.asciiscroll)
 
-    def asciiscroll(self):
+    def next_frame(self):
         asciifoo = (" " * self.counter) + "+" + (" " * ((self.counter - self.max)*-1))
         self.update(asciifoo * (self.screen.size.width//4))
         self.counter += 1
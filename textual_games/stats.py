@@ -0,0 +1,141 @@
+"""Statistics of one AI move. \n
+
+The SearchEngine and the ParallelSearch build a SearchStats at the end of every
+search. It is a snapshot that is never changed afterwards, so the app can read it
+on the main thread while the next search is already running in a worker thread.
+The GameManager can show its summary in the turn header and append it to a
+JSON-lines file (one object per AI move)."""
+
+from __future__ import annotations
+from typing import Any
+
+from textual_games.enums import MoveSource, SearchAlgorithm
+
+
+class SearchStats:
+
+    def __init__(
+            self,
+            source: MoveSource,
+            move: tuple[int, int] | None,
+            algorithm: SearchAlgorithm | None = None,
+            seconds: float = 0.0,
+            nodes: int = 0,
+            nodes_per_depth: list[int] | None = None,
+            cutoffs_per_depth: list[int] | None = None,
+            first_move_cutoffs: int = 0,
+            depth_limit: int = 0,
+            tt_hits: int = 0,
+            tt_entries: int = 0,
+            pvs_researches: int = 0,
+            aspiration_failures: int = 0,
+            iterations: list[tuple[int, int, tuple[int, int], int, float]] | None = None,
+            principal_variation: list[tuple[int, int]] | None = None,
+            worker_nodes: dict[int, int] | None = None,
+        ):
+        """ | Arg                 | Description
+            |---------------------|-------------
+            | source              | - Where the move came from (search, opening book or pondering)
+            | move                | - The move that was played
+            | algorithm           | - The search algorithm (None if nothing was searched)
+            | seconds             | - Wall time of the whole search
+            | nodes               | - Nodes searched, over all iterations
+            | nodes_per_depth     | - Nodes searched at each depth below the root (index 0 is the root)
+            | cutoffs_per_depth   | - Beta cutoffs at each depth
+            | first_move_cutoffs  | - Cutoffs caused by the first move searched
+            | depth_limit         | - Nodes cut off by the depth limit
+            | tt_hits             | - Transposition table hits
+            | tt_entries          | - Entries in the transposition table after the search
+            | pvs_researches      | - PVS null-window searches that had to be searched again
+            | aspiration_failures | - Root searches that fell outside the aspiration window
+            | iterations          | - (depth, score, move, nodes so far, seconds so far) per completed iteration
+            | principal_variation | - The expected line of play, starting with `move`
+            | worker_nodes        | - Nodes per worker process (parallel search only) """
+
+        self.source = source
+        self.move = move
+        self.algorithm = algorithm
+        self.seconds = seconds
+        self.nodes = nodes
+        self.nodes_per_depth = trim(nodes_per_depth or [])
+        self.cutoffs_per_depth = trim(cutoffs_per_depth or [])[:len(self.nodes_per_depth)]
+        self.first_move_cutoffs = first_move_cutoffs
+        self.depth_limit = depth_limit
+        self.tt_hits = tt_hits
+        self.tt_entries = tt_entries
+        self.pvs_researches = pvs_researches
+        self.aspiration_failures = aspiration_failures
+        self.iterations = iterations or []
+        self.principal_variation = principal_variation or ([move] if move is not None else [])
+        self.worker_nodes = worker_nodes
+
+    @property
+    def depth(self) -> int:
+        """Depth of the deepest completed iteration."""
+        return self.iterations[-1][0] if self.iterations else 0
+
+    @property
+    def score(self) -> int | None:
+        return self.iterations[-1][1] if self.iterations else None
+
+    @property
+    def cutoffs(self) -> int:
+        return sum(self.cutoffs_per_depth)
+
+    @property
+    def nodes_per_second(self) -> int | None:
+        return round(self.nodes / self.seconds) if self.seconds else None
+
+    #* Called by: TextualGames.change_turn
+    def summary(self) -> str:
+        """One line for the turn header."""
+
+        if self.source == MoveSource.BOOK:
+            return "Opening book move"
+        line = (
+            f"depth {self.depth}  {self.nodes:,} nodes  "
+            f"{self.nodes_per_second or 0:,} n/s  {self.seconds:.2f}s  "
+            f"PV {' '.join(f'{row},{col}' for row, col in self.principal_variation)}"
+        )
+        if self.source == MoveSource.PONDER:
+            line = "Pondered: " + line
+        return line
+
+    #* Called by: GameManager.record_stats, benchmarks.search.run_benchmark
+    def to_dict(self) -> dict[str, Any]:
+        """Returns the statistics as JSON-serializable types."""
+
+        return {
+            "source": self.source.name.lower(),
+            "move": list(self.move) if self.move is not None else None,
+            "algorithm": self.algorithm.name.lower() if self.algorithm is not None else None,
+            "depth": self.depth,
+            "score": self.score,
+            "seconds": round(self.seconds, 6),
+            "nodes": self.nodes,
+            "nodes_per_second": self.nodes_per_second,
+            "nodes_per_depth": self.nodes_per_depth,
+            "cutoffs": self.cutoffs,
+            "cutoffs_per_depth": self.cutoffs_per_depth,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "depth_limit": self.depth_limit,
+            "tt_hits": self.tt_hits,
+            "tt_entries": self.tt_entries,
+            "pvs_researches": self.pvs_researches,
+            "aspiration_failures": self.aspiration_failures,
+            "iterations": [
+                {"depth": depth, "score": score, "move": list(move), "nodes": nodes, "seconds": round(seconds, 6)}
+                for depth, score, move, nodes, seconds in self.iterations
+            ],
+            "principal_variation": [list(move) for move in self.principal_variation],
+            "worker_nodes": self.worker_nodes,
+        }
+
+
+def trim(counts: list[int]) -> list[int]:
+    """Drops the trailing zeros of a per-depth list."""
+
+    end = len(counts)
+    while end and counts[end - 1] == 0:
+        end -= 1
+    return list(counts[:end])
@@ -0,0 +1,146 @@
+"""Zobrist hashing and a bounded transposition table for the AI search. \n
+
+A Zobrist key is the XOR of one random 64-bit number per (player, row, column)
+piece on the board. Placing or removing a piece XORs that piece's number in or
+out, so the GameManager can update the key incrementally with every move."""
+
+from __future__ import annotations
+from collections import OrderedDict
+import random
+
+from textual_games.enums import Bound, Replacement
+
+
+class ZobristKeys:
+
+    def __init__(self, rows: int, columns: int, seed: int | None = None):
+        """ | Arg     | Description
+            |---------|-------------
+            | rows    | - The number of rows on the board
+            | columns | - The number of columns on the board
+            | seed    | - Optional seed for reproducible keys """
+
+        rng = random.Random(seed)
+        self.pieces: list[list[list[int]]] = [
+            [[rng.getrandbits(64) for _ in range(columns)] for _ in range(rows)]
+            for _ in range(3)       # indexed by player number. Index 0 (empty) is never used.
+        ]
+
+    def hash_board(self, board: list[list[int]]) -> int:
+        """Computes the key of a whole board from scratch."""
+
+        key = 0
+        for row, cells in enumerate(board):
+            for col, player in enumerate(cells):
+                if player:
+                    key ^= self.pieces[player][row][col]
+        return key
+
+
+class TTEntry:
+
+    __slots__ = ("key", "depth", "score", "bound", "best_move", "generation")
+
+    def __init__(
+            self,
+            key: int,
+            depth: int,
+            score: int,
+            bound: Bound,
+            best_move: tuple[int, int] | None,
+            generation: int,
+        ):
+        self.key = key
+        self.depth = depth              # remaining search depth below the stored node
+        self.score = score
+        self.bound = bound
+        self.best_move = best_move
+        self.generation = generation    # which search stored it. Used to age out old entries.
+
+
+class TranspositionTable:
+
+    ENTRY_BYTES = 200
+    """Rough size of one stored entry (entry object, key, move tuple and table overhead).
+    Used to turn the memory cap into a number of entries."""
+
+    def __init__(
+            self,
+            max_megabytes: float = 16,
+            replacement: Replacement = Replacement.DEPTH,
+        ):
+        """ | Arg           | Description
+            |---------------|-------------
+            | max_megabytes | - Memory cap for the table
+            | replacement   | - DEPTH: one slot per key index, deeper or newer entries win.
+            |               |   LRU: least recently used entry is evicted when full """
+
+        self.capacity = max(1, int(max_megabytes * 1024 * 1024) // self.ENTRY_BYTES)
+        self.replacement = replacement
+        self.generation = 0
+        self.hits = 0
+        self.clear()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def clear(self):
+        "Removes every entry. Called when a game is restarted."
+
+        if self.replacement == Replacement.DEPTH:
+            self.slots: list[TTEntry | None] = [None] * self.capacity
+        else:
+            self.entries: OrderedDict[int, TTEntry] = OrderedDict()
+        self.size = 0
+
+    def new_search(self):
+        """Marks the start of a new AI turn. Entries from earlier turns are kept,
+        but become the first choice for replacement."""
+        self.generation += 1
+
+    def probe(self, key: int) -> TTEntry | None:
+
+        if self.replacement == Replacement.DEPTH:
+            entry = self.slots[key % self.capacity]
+            if entry is None or entry.key != key:
+                return None
+        else:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def store(
+            self,
+            key: int,
+            depth: int,
+            score: int,
+            bound: Bound,
+            best_move: tuple[int, int] | None,
+        ):
+
+        entry = TTEntry(key, depth, score, bound, best_move, self.generation)
+
+        if self.replacement == Replacement.DEPTH:
+            index = key % self.capacity
+            current = self.slots[index]
+            if current is None:
+                self.size += 1
+            elif (
+                current.key != key
+                and current.generation == self.generation
+                and current.depth > depth
+            ):
+                return      # keep the deeper entry from this search
+            self.slots[index] = entry
+        else:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+            else:
+                self.size += 1
+                if self.size > self.capacity:
+                    self.entries.popitem(last=False)
+                    self.size -= 1
+            self.entries[key] = entry